@@ -0,0 +1,99 @@
+"""
+Comparison of benchmark results with a stored baseline, shared by the benchmarks
+
+Results and baselines map a configuration name to its metrics; a configuration that could
+not run has an "error" entry instead. A configuration listed in the baseline has to run:
+failing it counts like a regression, so a missing model cannot make the gate pass.
+Metrics without a baseline value are listed as not gated on every check, and fail the check
+with strict, so an empty baseline cannot pass unnoticed.
+"""
+import json
+from pathlib import Path
+
+
+def compare(results: dict, baseline: dict, metrics: dict, tolerance: float) -> list[str]:
+    """
+    List of human-readable regressions against the baseline
+
+    :param metrics: compared metric names and whether a higher value is better
+    :param tolerance: allowed relative change in the bad direction
+    """
+    regressions = []
+    for name, row in results.items():
+        reference = baseline.get(name)
+        if reference is None or "error" in row:
+            continue
+        for metric, higher_is_better in metrics.items():
+            old, new = reference.get(metric), row[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{name}: {metric} {old:.1f} → {new:.1f} ({change:+.0%})")
+    return regressions
+
+
+def ungated(results: dict, baseline: dict, metrics: dict) -> list[str]:
+    """Measured configurations with metrics the baseline has no value for"""
+    lines = []
+    for name, row in results.items():
+        if "error" in row:
+            continue
+        reference = baseline.get(name) or {}
+        missing = [metric for metric in metrics if not reference.get(metric)]
+        if missing:
+            lines.append(f"{name}: {', '.join(missing)}")
+    return lines
+
+
+def failures(results: dict, baseline: dict) -> list[str]:
+    """Configurations of the baseline that were run but failed"""
+    return [f"{name}: {row['error']}" for name, row in results.items() if name in baseline and "error" in row]
+
+
+def save_baseline(results: dict, path: Path) -> int:
+    """
+    Store the results as the new baseline, refusing if any configuration failed
+
+    :return: exit code
+    """
+    failed = {name: row["error"] for name, row in results.items() if "error" in row}
+    if failed or not results:
+        for name, error in failed.items():
+            print(f"FAILED {name}: {error}")
+        print("Baseline not saved, every configuration must run (pick them with --configs)")
+        return 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Baseline saved to {path}")
+    return 0
+
+
+def check_baseline(results: dict, path: Path, metrics: dict, tolerance: float, strict: bool = False) -> int:
+    """
+    Print failures, regressions and metrics that are not gated against the stored baseline
+
+    :param strict: also fail if a measured metric has no baseline value
+    :return: exit code, 1 if the baseline is missing, nothing was measured, a baseline
+        configuration failed, a metric regressed or, with strict, a metric is not gated
+    """
+    if not path.exists():
+        print(f"No baseline at {path}, run with --save-baseline to create one")
+        return 1
+    if not any("error" not in row for row in results.values()):
+        print("Nothing was measured")
+        return 1
+
+    baseline = json.loads(path.read_text(encoding="utf-8"))
+    problems = ([f"FAILED {line}" for line in failures(results, baseline)]
+                + [f"REGRESSION {line}" for line in compare(results, baseline, metrics, tolerance)])
+    not_gated = [f"NOT GATED {line} (no baseline value, run with --save-baseline)"
+                 for line in ungated(results, baseline, metrics)]
+    if strict:
+        problems += not_gated
+    else:
+        for line in not_gated:
+            print(line)
+    for line in problems:
+        print(line)
+    return 1 if problems else 0
@@ -0,0 +1,193 @@
+"""
+Latency benchmark of the chatbot's generation path, without the UI
+
+Every configuration replays the same scripted conversations through ChatEngine the way
+ChatBotTab does: the last messages are kept as context and each reply is generated from
+their token ids. A fresh process per configuration keeps load time and peak memory
+isolated. Results are compared with a stored baseline and the exit code is non-zero if any
+configuration of the baseline regressed or failed to run. Metrics without a baseline value
+are printed as not gated; --strict fails on them.
+
+The model must be in the Hugging Face cache already, or be given as a local folder.
+
+Usage (from the repository root):
+    python -m Benchmarks.ChatbotBenchmark
+    python -m Benchmarks.ChatbotBenchmark --model /models/DialoGPT-small --save-baseline
+"""
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+import psutil
+from .Baseline import check_baseline, save_baseline
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "chatbot.json"
+
+# User turns of the scripted conversations; replies are generated, so context grows every turn
+SCRIPTS = [
+    [
+        "Hi! How are you today?",
+        "I am planning a trip to the mountains this weekend.",
+        "Do you think I should go hiking or skiing in the mountains?",
+        "What should I pack for a weekend trip to the mountains?",
+        "Is it better to go hiking on Saturday or on Sunday?",
+        "Thanks! Any last advice for my trip to the mountains?",
+    ],
+    [
+        "Can you recommend a good book?",
+        "I liked the last science fiction book I read.",
+        "Which science fiction book would you read next?",
+        "Is that book long? I only read a little every evening.",
+        "What do you like most about science fiction?",
+        "Great, I will try that book this evening.",
+    ],
+    [
+        "Hello there!",
+        "What is your favourite food?",
+        "I cooked pasta with tomato sauce yesterday.",
+        "Do you prefer pasta with tomato sauce or with cream sauce?",
+        "What would you cook for dinner tonight?",
+        "That sounds good, I will cook that for dinner tonight.",
+    ],
+]
+
+CONFIGURATIONS = {
+    "greedy": {"do_sample": False},
+    "greedy-lookup": {"do_sample": False, "prompt_lookup": True},
+    "sampled": {"do_sample": True},
+    "sampled-lookup": {"do_sample": True, "prompt_lookup": True},
+}
+
+# Compared metrics and whether a higher value is better
+COMPARED_METRICS = {
+    "load_s": False,
+    "peak_rss_mb": False,
+    "ttft_ms": False,
+    "tokens_per_s": True,
+    "latency_ms_mean": False,
+    "latency_ms_last_turn": False,
+}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the calling process so far"""
+    info = psutil.Process().memory_info()
+    # Windows reports the peak directly, elsewhere the kernel keeps it for getrusage
+    peak = getattr(info, "peak_wset", 0)
+    if not peak:
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+        except ImportError:
+            peak = info.rss
+    return peak / 2 ** 20
+
+
+def run_configuration(options: dict, model_name: str, context_messages: int, seed: int) -> dict:
+    """Load the model and replay every script once; runs inside a worker process"""
+    import torch
+    from Modules.ChatBotTab.ChatEngine import ChatEngine
+
+    engine = ChatEngine(model_name, **options)
+    start = time.perf_counter()
+    engine.load()
+    engine.warm_up()
+    load_s = time.perf_counter() - start
+
+    turns = []
+    for script in SCRIPTS:
+        history = []
+        for turn, message in enumerate(script):
+            history = (history + [engine.encode(message)])[-context_messages:]
+            input_ids = [token_id for ids in history for token_id in ids]
+
+            torch.manual_seed(seed + turn)
+            start = time.perf_counter()
+            reply = engine.generate(input_ids)
+            latency = time.perf_counter() - start
+
+            history = (history + [engine.encode(reply.text)])[-context_messages:]
+            turns.append({
+                "turn": turn + 1,
+                "context_tokens": len(input_ids),
+                "new_tokens": reply.stats.new_tokens,
+                "latency_ms": latency * 1000,
+                "ttft_ms": (reply.stats.first_token_time or latency) * 1000,
+            })
+
+    per_turn = []
+    for turn in range(1, max(len(script) for script in SCRIPTS) + 1):
+        rows = [row for row in turns if row["turn"] == turn]
+        per_turn.append({
+            "turn": turn,
+            "context_tokens": statistics.mean(row["context_tokens"] for row in rows),
+            "latency_ms": statistics.mean(row["latency_ms"] for row in rows),
+        })
+
+    new_tokens = sum(row["new_tokens"] for row in turns)
+    total_s = sum(row["latency_ms"] for row in turns) / 1000
+    return {
+        "device": engine.device,
+        "load_s": load_s,
+        "peak_rss_mb": peak_rss_mb(),
+        "ttft_ms": statistics.median(row["ttft_ms"] for row in turns),
+        "tokens_per_s": new_tokens / total_s if total_s > 0 else 0.0,
+        "latency_ms_mean": statistics.mean(row["latency_ms"] for row in turns),
+        "latency_ms_last_turn": per_turn[-1]["latency_ms"],
+        "per_turn": per_turn,
+    }
+
+
+def main():
+    from Modules.ChatBotTab.ChatEngine import DEFAULT_CHAT_MODEL
+    from Modules.Core.AppConfig import ChatSettings
+
+    parser = argparse.ArgumentParser(description="Benchmark chatbot latency on scripted conversations")
+    parser.add_argument("--model", default=DEFAULT_CHAT_MODEL, help="model name or local folder")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGURATIONS), default=list(CONFIGURATIONS))
+    parser.add_argument("--context-messages", type=int, default=ChatSettings.context_messages,
+                        help="messages given to the model, as in the chat tab")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    parser.add_argument("--strict", action="store_true", help="fail if a metric has no baseline value")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.configs:
+        # Fresh process per configuration keeps model memory and thread pools isolated
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            try:
+                results[name] = pool.submit(
+                    run_configuration, CONFIGURATIONS[name], args.model, args.context_messages, args.seed
+                ).result()
+            except Exception as e:
+                results[name] = {"error": str(e)}
+
+    print(f"{'configuration':<16}{'load s':>8}{'peak MB':>9}{'TTFT ms':>9}{'tok/s':>8}{'mean ms':>9}")
+    for name, row in results.items():
+        if "error" in row:
+            print(f"{name:<16}  failed: {row['error']}")
+        else:
+            print(f"{name:<16}{row['load_s']:>8.1f}{row['peak_rss_mb']:>9.0f}{row['ttft_ms']:>9.1f}"
+                  f"{row['tokens_per_s']:>8.1f}{row['latency_ms_mean']:>9.0f}")
+
+    # Latency as the conversation history grows
+    measured = {name: row for name, row in results.items() if "error" not in row}
+    if measured:
+        print(f"\n{'turn':<6}{'context':>9}" + "".join(f"{name:>16}" for name in measured))
+        first = next(iter(measured.values()))
+        for index, turn in enumerate(first["per_turn"]):
+            print(f"{turn['turn']:<6}{turn['context_tokens']:>9.0f}"
+                  + "".join(f"{row['per_turn'][index]['latency_ms']:>14.0f}ms" for row in measured.values()))
+
+    if args.save_baseline:
+        sys.exit(save_baseline(results, args.baseline))
+    sys.exit(check_baseline(results, args.baseline, COMPARED_METRICS, args.tolerance, args.strict))
+
+if __name__ == "__main__":
+    main()
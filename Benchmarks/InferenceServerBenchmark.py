@@ -0,0 +1,124 @@
+"""
+Throughput and memory of N app instances with in-process models versus one shared inference server
+
+Every client is a separate process, like a separate app window. In "in-process" mode each
+client loads its own model; in "shared" mode the clients send their requests to one
+inference server. Memory is the summed resident size of all involved processes.
+
+Usage (from the repository root):
+    python -m Benchmarks.InferenceServerBenchmark --workload chat --clients 1 4
+    python -m Benchmarks.InferenceServerBenchmark --workload detect --weights /models/yolov8n.pt
+"""
+import argparse
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+import psutil
+from Modules.InferenceServer.InferenceClient import InferenceClient, RemoteChatEngine, RemoteYoloBackend, REPO_ROOT
+
+PROMPT = "Hello! What can you do for me today?"
+BENCHMARK_PORT = 8799
+
+
+def make_model(workload: str, mode: str, weights: str, port: int):
+    """Loaded chat engine or YOLO backend for one client"""
+    client = InferenceClient(port=port)
+    if workload == "chat":
+        from Modules.ChatBotTab.ChatEngine import ChatEngine
+
+        # Greedy decoding keeps the reply length identical across runs
+        engine = ChatEngine(do_sample=False)
+        model = RemoteChatEngine(client, engine) if mode == "shared" else engine
+    else:
+        from Modules.SortPituresTab.YoloBackend import YoloBackend
+
+        model = RemoteYoloBackend(client, weights) if mode == "shared" else YoloBackend(weights)
+    model.load()
+    return model
+
+
+def run_client(workload: str, mode: str, requests: int, weights: str, port: int) -> dict:
+    """Load the model, then time a fixed number of requests; runs inside a worker process"""
+    start = time.perf_counter()
+    model = make_model(workload, mode, weights, port)
+    load_s = time.perf_counter() - start
+
+    if workload == "chat":
+        input_ids = model.encode(PROMPT)
+        call = lambda: model.generate(input_ids)
+    else:
+        frame = np.random.default_rng(0).integers(0, 255, (640, 640, 3), dtype=np.uint8)
+        call = lambda: model.detect([frame])
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        call()
+    return {
+        "load_s": load_s,
+        "elapsed_s": time.perf_counter() - start,
+        "rss_mb": psutil.Process().memory_info().rss / 2 ** 20,
+    }
+
+
+def run_mode(mode: str, clients: int, args) -> dict:
+    """Run `clients` concurrent clients and aggregate their results"""
+    server = None
+    if mode == "shared":
+        client = InferenceClient(port=args.port)
+        server = subprocess.Popen(client.server_command(args.port) + ["--idle-timeout", "0"], cwd=REPO_ROOT,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 30
+        while client.health() is None:
+            if time.monotonic() > deadline or server.poll() is not None:
+                server.kill()
+                raise RuntimeError("inference server did not start")
+            time.sleep(0.25)
+
+    try:
+        with ProcessPoolExecutor(max_workers=clients, mp_context=get_context("spawn")) as pool:
+            futures = [pool.submit(run_client, args.workload, mode, args.requests, args.weights, args.port)
+                       for _ in range(clients)]
+            rows = [future.result() for future in futures]
+        server_mb = psutil.Process(server.pid).memory_info().rss / 2 ** 20 if server else 0.0
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    slowest = max(row["elapsed_s"] for row in rows)
+    return {
+        "requests_per_s": clients * args.requests / slowest,
+        "mean_load_s": sum(row["load_s"] for row in rows) / clients,
+        "total_mb": sum(row["rss_mb"] for row in rows) + server_mb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare in-process models with the shared inference server")
+    parser.add_argument("--workload", choices=["chat", "detect"], default="chat")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4], help="client counts to measure")
+    parser.add_argument("--requests", type=int, default=5, help="requests per client")
+    parser.add_argument("--weights", default="yolov8n.pt", help="local YOLO weights for the detect workload")
+    parser.add_argument("--port", type=int, default=BENCHMARK_PORT, help="port of the benchmark server")
+    args = parser.parse_args()
+
+    try:
+        serving = InferenceClient(port=args.port).health() is not None
+    except PermissionError:
+        serving = True
+    if serving:
+        sys.exit(f"Port {args.port} is already serving, pick another one with --port")
+
+    print(f"{'mode':<12}{'clients':>8}{'req/s':>10}{'load s':>10}{'total MB':>10}")
+    for clients in args.clients:
+        for mode in ("in-process", "shared"):
+            row = run_mode(mode, clients, args)
+            print(f"{mode:<12}{clients:>8}{row['requests_per_s']:>10.2f}"
+                  f"{row['mean_load_s']:>10.1f}{row['total_mb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
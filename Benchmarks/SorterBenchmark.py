@@ -0,0 +1,125 @@
+"""
+Reproducible throughput benchmark of the picture sorter
+
+Every configuration sorts the same synthetic corpus in a fresh process, so peak memory is
+not polluted by earlier runs. Results are compared with a stored baseline and the exit code
+is non-zero if any configuration of the baseline regressed or failed to run, including
+for want of its model file. Metrics without a baseline value are printed as not gated;
+--strict fails on them.
+
+Every registered detector is benchmarked; detectors without an explicit configuration run
+with their defaults.
+
+Usage (from the repository root):
+    python -m Benchmarks.SorterBenchmark --weights /models/yolov8n.pt --dnn-model /models/face_detection_yunet.onnx
+    python -m Benchmarks.SorterBenchmark --save-baseline
+"""
+import argparse
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from Modules.SortPituresTab.PictureSorter import DETECTORS
+from .Baseline import check_baseline, save_baseline
+from .SyntheticCorpus import generate_corpus, seed_duplicates
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "sorter.json"
+
+CONFIGURATIONS = {
+    "haar": {"method": "haar"},
+    "dnn": {"method": "dnn"},
+    "yolo-torch": {"method": "yolo", "yolo_backend": "torch"},
+    "yolo-torch-batch8": {"method": "yolo", "yolo_backend": "torch", "batch_size": 8},
+    "yolo-onnx": {"method": "yolo", "yolo_backend": "onnx"},
+    "yolo-openvino": {"method": "yolo", "yolo_backend": "openvino"},
+    "yolo-onnx-shm4": {"method": "yolo", "yolo_backend": "onnx", "batch_size": 4, "decode_workers": 4},
+}
+# Detectors added later run with their defaults until they get their own configurations
+for _method in DETECTORS:
+    if not any(options["method"] == _method for options in CONFIGURATIONS.values()):
+        CONFIGURATIONS[_method] = {"method": _method}
+
+# Compared metrics and whether a higher value is better
+COMPARED_METRICS = {"images_per_s": True, "p50_ms": False, "p99_ms": False, "peak_rss_mb": False}
+
+
+def run_configuration(options: dict, corpus: str, manifest: dict, model_files: dict) -> dict:
+    """
+    Sort the corpus once with the given options; runs inside a worker process
+
+    :param model_files: model file per detector option, e.g. {"weights_path": "yolov8n.pt"}
+    """
+    from Modules.SortPituresTab.PictureSorter import PictureSorter
+    from Modules.SortPituresTab.RoutingRules import RoutingRules
+
+    sorter = PictureSorter(log=lambda message: None, **model_files, **options)
+    sorter.load_detector()
+    if "yolo_backend" in options and sorter.detector.active_backend != options["yolo_backend"]:
+        raise RuntimeError(f"fell back to {sorter.detector.active_backend}")
+
+    with tempfile.TemporaryDirectory() as output:
+        destinations = [Path(output) / "with", Path(output) / "without"]
+        seed_duplicates(manifest, Path(corpus), destinations)
+        result = sorter.sort(corpus, RoutingRules.default(*destinations))
+
+    summary = result.metrics.summary()
+    return {
+        "images": summary["images"],
+        "errors": result.errors,
+        "images_per_s": summary["images_per_s"],
+        "p50_ms": summary["image"]["p50_ms"],
+        "p99_ms": summary["image"]["p99_ms"],
+        "peak_rss_mb": summary["peak_rss_mb"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the picture sorter on a synthetic corpus")
+    parser.add_argument("--weights", default="yolov8n.pt",
+                        help="local YOLO weights; YOLO configurations fail if missing")
+    parser.add_argument("--dnn-model", default="face_detection_yunet_2023mar.onnx",
+                        help="local YuNet .onnx or SSD .caffemodel; DNN configurations fail if missing")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGURATIONS), default=list(CONFIGURATIONS))
+    parser.add_argument("--count", type=int, default=200, help="number of corpus images")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", type=Path, default=Path(tempfile.gettempdir()) / "daily_assistant_corpus")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    parser.add_argument("--strict", action="store_true", help="fail if a metric has no baseline value")
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.corpus, args.count, args.seed)
+    model_files = {"weights_path": args.weights, "dnn_model_path": args.dnn_model}
+
+    results = {}
+    for name in args.configs:
+        options = CONFIGURATIONS[name]
+        model_option = DETECTORS[options["method"]].model_option
+        if model_option and not Path(model_files[model_option]).exists():
+            results[name] = {"error": f"model not found at {model_files[model_option]}"}
+            continue
+        # Fresh process per configuration keeps model memory and thread pools isolated
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            try:
+                results[name] = pool.submit(
+                    run_configuration, options, str(args.corpus), manifest, model_files
+                ).result()
+            except Exception as e:
+                results[name] = {"error": str(e)}
+
+    print(f"{'configuration':<20}{'img/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}")
+    for name, row in results.items():
+        if "error" in row:
+            print(f"{name:<20}  failed: {row['error']}")
+        else:
+            print(f"{name:<20}{row['images_per_s']:>10.1f}{row['p50_ms']:>10.1f}"
+                  f"{row['p99_ms']:>10.1f}{row['peak_rss_mb']:>10.0f}")
+
+    if args.save_baseline:
+        sys.exit(save_baseline(results, args.baseline))
+    sys.exit(check_baseline(results, args.baseline, COMPARED_METRICS, args.tolerance, args.strict))
+
+if __name__ == "__main__":
+    main()
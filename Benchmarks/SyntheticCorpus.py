@@ -0,0 +1,104 @@
+"""
+Deterministic synthetic image corpus for the sorter benchmarks
+
+The same seed always produces the same files, so results of different runs and machines
+are comparable. Nothing is downloaded.
+
+Usage (from the repository root):
+    python -m Benchmarks.SyntheticCorpus <folder> [--count 200] [--seed 0]
+"""
+import argparse
+import json
+from pathlib import Path
+import cv2
+import numpy as np
+
+# (width, height) pairs covering thumbnails up to 12MP phone photos, both orientations
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 720), (1920, 1080), (1080, 1920), (4000, 3000)]
+FORMATS = ['.jpg', '.jpg', '.jpg', '.png', '.bmp', '.tiff']
+# Every n-th image reuses an earlier name, to exercise duplicate handling at the destination
+DUPLICATE_EVERY = 10
+MANIFEST_NAME = "corpus.json"
+
+
+def render_image(rng: np.random.Generator, width: int, height: int) -> np.ndarray:
+    """Gradient background with random shapes and sensor-like noise"""
+    x = np.linspace(0, 1, width, dtype=np.float32)
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    base = rng.uniform(0, 255, size=3).astype(np.float32)
+    tint = rng.uniform(-120, 120, size=3).astype(np.float32)
+    img = base + tint * (x[None, :, None] * 0.5 + y[:, :, None] * 0.5)
+
+    img = np.clip(img, 0, 255).astype(np.uint8)
+    for _ in range(int(rng.integers(5, 25))):
+        color = tuple(int(c) for c in rng.integers(0, 256, size=3))
+        cx, cy = int(rng.integers(0, width)), int(rng.integers(0, height))
+        size = int(rng.integers(max(4, min(width, height) // 40), max(8, min(width, height) // 4)))
+        if rng.random() < 0.5:
+            cv2.circle(img, (cx, cy), size, color, thickness=-1)
+        else:
+            cv2.rectangle(img, (cx - size, cy - size), (cx + size, cy + size), color, thickness=-1)
+
+    noise = rng.normal(0, 6, size=img.shape).astype(np.int16)
+    return np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def generate_corpus(folder: Path, count: int = 200, seed: int = 0) -> dict:
+    """
+    Write the corpus into a folder, skipping the work if it already holds the same corpus
+
+    :param folder: destination folder
+    :param count: number of images
+    :param seed: random seed
+    :return: corpus manifest (files, duplicate names, parameters)
+    """
+    folder = Path(folder)
+    manifest_path = folder / MANIFEST_NAME
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest["count"] == count and manifest["seed"] == seed:
+            return manifest
+
+    folder.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    files = []
+    duplicates = []
+
+    for i in range(count):
+        width, height = RESOLUTIONS[int(rng.integers(len(RESOLUTIONS)))]
+        suffix = FORMATS[int(rng.integers(len(FORMATS)))]
+        name = f"IMG_{i:05d}{suffix}"
+        if i and i % DUPLICATE_EVERY == 0:
+            duplicates.append(name)
+
+        img = render_image(rng, width, height)
+        params = [cv2.IMWRITE_JPEG_QUALITY, 90] if suffix == '.jpg' else []
+        cv2.imwrite(str(folder / name), img, params)
+        files.append({"name": name, "width": width, "height": height})
+
+    manifest = {"count": count, "seed": seed, "files": files, "duplicates": duplicates}
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def seed_duplicates(manifest: dict, corpus: Path, destinations: list[Path]):
+    """Pre-populate destination folders with files named like corpus images"""
+    for dest in destinations:
+        dest.mkdir(parents=True, exist_ok=True)
+        for name in manifest["duplicates"]:
+            (dest / name).write_bytes((corpus / name).read_bytes()[:64])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the synthetic benchmark corpus")
+    parser.add_argument("folder", type=Path)
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.folder, args.count, args.seed)
+    print(f"{len(manifest['files'])} images in {args.folder}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare YOLO backends on the same set of images
+
+Usage (from the repository root):
+    python -m Benchmarks.YoloBackendBenchmark --images <folder> [--weights yolov8n.pt]
+"""
+import argparse
+import time
+from pathlib import Path
+import cv2
+from Modules.SortPituresTab.YoloBackend import YoloBackend, DEFAULT_YOLO_WEIGHTS
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}
+
+
+def load_images(folder: Path, limit: int) -> list:
+    """Decode up to `limit` images once, so every backend sees identical frames"""
+    frames = []
+    for path in sorted(folder.iterdir()):
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            img = cv2.imread(str(path))
+            if img is not None:
+                frames.append(img)
+        if len(frames) >= limit:
+            break
+    return frames
+
+
+def benchmark_backend(backend: str, weights: str, frames: list, threads: int, repeat: int) -> dict:
+    """Load one backend and time detection over all frames"""
+    detector = YoloBackend(weights, backend=backend, num_threads=threads)
+
+    start = time.perf_counter()
+    active = detector.load(log=lambda message: None)
+    load_time = time.perf_counter() - start
+
+    if active != backend:
+        return {"backend": backend, "error": f"fell back to {active}"}
+
+    # Warm-up pass, not timed
+    detector.detect(frames[:1])
+
+    latencies = []
+    people = 0
+    for _ in range(repeat):
+        for frame in frames:
+            start = time.perf_counter()
+            detections = detector.detect([frame])[0]
+            latencies.append(time.perf_counter() - start)
+            people += sum(1 for class_id, _ in detections if class_id == 0)
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "backend": backend,
+        "load_s": load_time,
+        "images_per_s": len(latencies) / total,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "people": people // repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare YOLO backends on CPU")
+    parser.add_argument("--images", required=True, type=Path, help="folder with test images")
+    parser.add_argument("--weights", default=DEFAULT_YOLO_WEIGHTS, help="path to the .pt weights")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "openvino"])
+    parser.add_argument("--threads", type=int, default=None, help="intra-op threads (default: physical cores)")
+    parser.add_argument("--limit", type=int, default=100, help="maximum number of images")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the image set")
+    args = parser.parse_args()
+
+    frames = load_images(args.images, args.limit)
+    if not frames:
+        parser.error(f"No readable images in {args.images}")
+    print(f"Benchmarking {len(frames)} images x {args.repeat} passes")
+
+    print(f"{'backend':<10}{'load s':>10}{'img/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'people':>10}")
+    for backend in args.backends:
+        try:
+            row = benchmark_backend(backend, args.weights, frames, args.threads, args.repeat)
+        except Exception as e:
+            row = {"backend": backend, "error": str(e)}
+
+        if "error" in row:
+            print(f"{backend:<10}  skipped: {row['error']}")
+        else:
+            print(f"{row['backend']:<10}{row['load_s']:>10.2f}{row['images_per_s']:>10.1f}"
+                  f"{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['people']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,640 @@
+import tkinter as tk
+import customtkinter as ctk
+import time
+from Modules.Core.AppConfig import ChatSettings, config_store
+from Modules.Core.JobScheduler import Priority, job_scheduler
+from Modules.Core.ModelRegistry import registry
+from Modules.Core.WarmupScheduler import warmup_scheduler
+from Modules.InferenceServer.InferenceClient import RemoteChatEngine, connect_inference_server
+from .ChatEngine import ChatEngine, chat_model_key, get_chat_engine
+from .ChatHistoryStore import ChatHistoryStore, StoredMessage
+from .ResponseCache import response_cache
+
+
+class ChatBotTab:
+    """Tab for AI chatbot using a local transformers model"""
+
+    def __init__(self, parent_frame):
+        self.parent_frame = parent_frame
+        self.store = ChatHistoryStore()
+        self.conversation_id = self.store.latest_conversation() or self.store.new_conversation()
+        self.chat_history = []
+        self.oldest_loaded_id = None
+        self.has_older = False
+        self.loading_older = False
+        self.model_name = self.settings.model_name
+        # Engine on the shared inference server, None when the model runs in this window
+        self.remote_engine = None
+        self.prompt_lookup = False
+        self.response_cache = response_cache
+        self.model_loaded = False
+        self.create_widgets()
+
+        # Load model in background
+        job_scheduler.submit("Load chat model", self.load_model, priority=Priority.BACKGROUND)
+
+    def create_widgets(self):
+        # Main container with a colored background
+        main_container = ctk.CTkFrame(self.parent_frame, fg_color="transparent")
+        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        # Status bar at the top
+        status_frame = ctk.CTkFrame(main_container, height=50)
+        status_frame.pack(fill=tk.X, pady=(0, 15))
+        status_frame.pack_propagate(False)
+
+        self.status_label = ctk.CTkLabel(
+            status_frame,
+            text="⏳ Loading AI model... (this may take a minute on first run)",
+            font=ctk.CTkFont(size=13, weight="bold"),
+            text_color="orange"
+        )
+        self.status_label.pack(expand=True)
+
+        # Chat history area with scroll
+        history_container = ctk.CTkFrame(main_container, fg_color=("gray85", "gray20"))
+        history_container.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+
+        # Scrollable frame for messages
+        self.chat_canvas = tk.Canvas(
+            history_container,
+            bg=ctk.ThemeManager.theme["CTkFrame"]["fg_color"][1] if ctk.get_appearance_mode() == "Dark" else
+            ctk.ThemeManager.theme["CTkFrame"]["fg_color"][0],
+            highlightthickness=0
+        )
+        self.chat_scrollbar = ctk.CTkScrollbar(history_container, command=self.chat_canvas.yview)
+        self.chat_frame = ctk.CTkFrame(self.chat_canvas, fg_color="transparent")
+
+        self.chat_frame.bind(
+            "<Configure>",
+            lambda e: self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
+        )
+
+        self.chat_canvas.create_window((0, 0), window=self.chat_frame, anchor="nw", width=800)
+        self.chat_canvas.configure(yscrollcommand=self.on_chat_scroll)
+
+        self.chat_canvas.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        self.chat_scrollbar.pack(side="right", fill="y", padx=(0, 5), pady=10)
+
+        # Restore the last conversation, or greet on a fresh one
+        if not self.restore_history():
+            self.add_welcome_message()
+
+        # Input area
+        input_frame = ctk.CTkFrame(main_container, fg_color="transparent")
+        input_frame.pack(fill=tk.X)
+
+        # Entry and buttons row
+        entry_row = ctk.CTkFrame(input_frame, fg_color="transparent")
+        entry_row.pack(fill=tk.X)
+
+        self.chat_entry = ctk.CTkEntry(
+            entry_row,
+            placeholder_text="Type your message here and press Enter...",
+            height=50,
+            font=ctk.CTkFont(size=14),
+            border_width=2
+        )
+        self.chat_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+        self.chat_entry.bind("<Return>", lambda e: self.send_message())
+
+        button_frame = ctk.CTkFrame(entry_row, fg_color="transparent")
+        button_frame.pack(side=tk.RIGHT)
+
+        # Draft tokens from the conversation itself and verify them in one pass
+        self.prompt_lookup_switch = ctk.CTkSwitch(
+            button_frame,
+            text="Prompt lookup",
+            font=ctk.CTkFont(size=12),
+            command=self.toggle_prompt_lookup
+        )
+        self.prompt_lookup_switch.pack(side=tk.LEFT, padx=(0, 10))
+
+        # Sampled replies differ on every call; caching them trades variety for instant answers
+        self.cache_switch = ctk.CTkSwitch(
+            button_frame,
+            text="Cache replies",
+            font=ctk.CTkFont(size=12)
+        )
+        self.cache_switch.select()
+        self.cache_switch.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.send_button = ctk.CTkButton(
+            button_frame,
+            text="Send",
+            width=100,
+            height=50,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            command=self.send_message,
+            state="disabled"
+        )
+        self.send_button.pack(side=tk.LEFT, padx=(0, 5))
+
+        self.clear_button = ctk.CTkButton(
+            button_frame,
+            text="Clear",
+            width=80,
+            height=50,
+            font=ctk.CTkFont(size=14),
+            command=self.clear_chat,
+            fg_color="gray40",
+            hover_color="gray30"
+        )
+        self.clear_button.pack(side=tk.LEFT)
+
+    def add_welcome_message(self):
+        """Greet the user on a fresh conversation"""
+        self.add_bot_message(
+            "Hello! I'm your AI Assistant. 👋\n\n"
+            "I'm powered by a local AI model running on your computer - "
+            "no internet connection or API keys required!\n\n"
+            "Please wait while I load the AI model...\n\n"
+            "Once loaded, I can help you with:\n"
+            "• Answering questions\n"
+            "• General conversation\n"
+            "• Providing information\n"
+            "• Writing assistance"
+        )
+
+    def restore_history(self) -> bool:
+        """Render the most recent page of the stored conversation; False if it is empty"""
+        page = self.store.page(self.conversation_id, self.settings.history_page_size,
+                               tokenizer=self.model_name)
+        if not page:
+            return False
+
+        for message in page:
+            self.render_message(message)
+        self.oldest_loaded_id = page[0].id
+        self.has_older = len(page) == self.settings.history_page_size
+        self.chat_history = page[-self.settings.context_messages:]
+        return True
+
+    def render_message(self, message: StoredMessage, before=None):
+        """Show a stored message, optionally above an existing widget"""
+        if message.role == "user":
+            self.add_user_message(message.text, before=before)
+        else:
+            self.add_bot_message(message.text, before=before)
+
+    def on_chat_scroll(self, first, last):
+        """Update the scrollbar and fetch older messages once the top is reached"""
+        self.chat_scrollbar.set(first, last)
+        if float(first) <= 0.0 and self.has_older and not self.loading_older:
+            self.loading_older = True
+            self.parent_frame.after_idle(self.load_older_messages)
+
+    def load_older_messages(self):
+        """Prepend the previous page of messages, keeping the visible messages in place"""
+        try:
+            page = self.store.page(self.conversation_id, self.settings.history_page_size,
+                                   before_id=self.oldest_loaded_id, tokenizer=self.model_name)
+            self.has_older = len(page) == self.settings.history_page_size
+            if not page:
+                return
+
+            old_height = self.chat_frame.winfo_reqheight()
+            anchor = self.chat_frame.winfo_children()[0]
+            for message in page:
+                self.render_message(message, before=anchor)
+            self.oldest_loaded_id = page[0].id
+
+            self.chat_canvas.update_idletasks()
+            new_height = self.chat_frame.winfo_reqheight()
+            self.chat_canvas.yview_moveto((new_height - old_height) / new_height)
+        finally:
+            self.loading_older = False
+
+    @staticmethod
+    def preload(params: dict):
+        """Warm-up task: load the chat model before the tab is first opened"""
+        client = connect_inference_server()
+        if client is not None:
+            RemoteChatEngine(client, ChatEngine(config_store.get().chat.model_name)).load()
+        else:
+            get_chat_engine(config_store.get().chat.model_name, preload=True)
+
+    def load_model(self):
+        """Load the AI model in the background with optimizations"""
+        warmup_scheduler.record_use("chat")
+        try:
+            device = self.load_shared_engine()
+            if device is None:
+                self.parent_frame.after(0, self.update_status, "⏳ Installing required libraries...", "orange")
+
+                # Import required libraries
+                try:
+                    import transformers
+                    import torch
+                except ImportError:
+                    self.parent_frame.after(0, self.show_install_instructions)
+                    return
+
+                self.parent_frame.after(0, self.update_status, "⏳ Loading AI model...", "orange")
+
+                # Reuses the model if it was loaded by an earlier visit or the warm-up scheduler
+                device = get_chat_engine(self.model_name).device
+            self.model_loaded = True
+
+            status_msg = "✅ AI model ready! Start chatting below."
+            if device == "cuda":
+                status_msg += " (GPU acceleration enabled)"
+            elif self.remote_engine is not None:
+                status_msg += " (shared with other windows)"
+            saved = registry.take_saved_seconds(chat_model_key(self.model_name))
+            if saved is not None:
+                status_msg += f" (preloaded in the background, saved {saved:.1f} s)"
+
+            self.parent_frame.after(0, self.update_status, status_msg, "green")
+            self.parent_frame.after(0, self.enable_chat)
+            self.parent_frame.after(0, self.add_bot_message,
+                                    "AI model loaded successfully! I'm ready to chat. 🎉")
+
+        except Exception as e:
+            error_msg = f"Failed to load model: {str(e)}"
+            self.parent_frame.after(0, self.update_status, f"❌ {error_msg}", "red")
+            self.parent_frame.after(0, self.add_error_message, error_msg)
+
+    def load_shared_engine(self) -> str | None:
+        """Generate on the shared inference server if it is enabled and reachable, else return None"""
+        client = connect_inference_server()
+        if client is None:
+            return None
+
+        self.parent_frame.after(0, self.update_status, "⏳ Loading AI model on the shared inference server...", "orange")
+        remote = RemoteChatEngine(client, ChatEngine(self.model_name))
+        try:
+            device = remote.load()
+        except (OSError, RuntimeError) as e:
+            self.parent_frame.after(0, self.add_error_message,
+                                    f"Shared inference server unavailable, loading the model in this window: {str(e)}")
+            return None
+        self.remote_engine = remote
+        return device
+
+    @property
+    def engine(self):
+        """
+        Engine replies are generated with
+
+        A model loaded in this window is fetched from the registry on every use instead of
+        being kept here, so unloading it from the Monitor tab frees it; the next reply loads
+        it again. Before the model is loaded this is an unloaded ChatEngine.
+        """
+        if self.remote_engine is not None:
+            return self.remote_engine
+        if self.model_loaded:
+            return get_chat_engine(self.model_name)
+        return ChatEngine(self.model_name)
+
+    def show_install_instructions(self):
+        """Show installation instructions"""
+        instructions = (
+            "Required libraries not found!\n\n"
+            "Please install by running:\n"
+            "pip install transformers torch\n\n"
+            "Then restart the application."
+        )
+        self.add_error_message(instructions)
+        self.update_status("❌ Libraries not installed", "red")
+
+    def update_status(self, message, color):
+        """Update status label"""
+        self.status_label.configure(text=message, text_color=color)
+
+    def enable_chat(self):
+        """Enable chat input"""
+        self.send_button.configure(state="normal")
+        self.chat_entry.configure(state="normal")
+        self.chat_entry.focus()
+
+    def add_user_message(self, message, before=None):
+        """Add user message bubble, at the end or above the `before` widget"""
+        # Message container (right-aligned)
+        msg_container = ctk.CTkFrame(self.chat_frame, fg_color="transparent")
+        msg_container.pack(fill=tk.X, padx=10, pady=5, before=before)
+
+        # Inner frame for the message bubble (right side)
+        bubble_frame = ctk.CTkFrame(msg_container, fg_color="transparent")
+        bubble_frame.pack(anchor="e", padx=(100, 0))
+
+        # User label
+        label_frame = ctk.CTkFrame(bubble_frame, fg_color="transparent")
+        label_frame.pack(anchor="e", pady=(0, 2))
+
+        user_label = ctk.CTkLabel(
+            label_frame,
+            text="You",
+            font=ctk.CTkFont(size=11, weight="bold"),
+            text_color="#1e88e5"
+        )
+        user_label.pack(anchor="e")
+
+        # Message bubble
+        bubble = ctk.CTkFrame(
+            bubble_frame,
+            fg_color=("#2196F3", "#1565C0"),
+            corner_radius=15
+        )
+        bubble.pack(anchor="e")
+
+        msg_label = ctk.CTkLabel(
+            bubble,
+            text=message,
+            font=ctk.CTkFont(size=13),
+            wraplength=500,
+            justify="left",
+            text_color="white"
+        )
+        msg_label.pack(padx=15, pady=10)
+
+        # Auto scroll, unless an older message was inserted above
+        if before is None:
+            self.chat_canvas.update_idletasks()
+            self.chat_canvas.yview_moveto(1.0)
+
+    def add_bot_message(self, message, before=None):
+        """Add bot message bubble, at the end or above the `before` widget"""
+        # Message container (left-aligned)
+        msg_container = ctk.CTkFrame(self.chat_frame, fg_color="transparent")
+        msg_container.pack(fill=tk.X, padx=10, pady=5, before=before)
+
+        # Inner frame for the message bubble (left side)
+        bubble_frame = ctk.CTkFrame(msg_container, fg_color="transparent")
+        bubble_frame.pack(anchor="w", padx=(0, 100))
+
+        # Bot label
+        label_frame = ctk.CTkFrame(bubble_frame, fg_color="transparent")
+        label_frame.pack(anchor="w", pady=(0, 2))
+
+        bot_label = ctk.CTkLabel(
+            label_frame,
+            text="Assistant",
+            font=ctk.CTkFont(size=11, weight="bold"),
+            text_color="#4caf50"
+        )
+        bot_label.pack(anchor="w")
+
+        # Message bubble
+        bubble = ctk.CTkFrame(
+            bubble_frame,
+            fg_color=("gray70", "gray30"),
+            corner_radius=15
+        )
+        bubble.pack(anchor="w")
+
+        msg_label = ctk.CTkLabel(
+            bubble,
+            text=message,
+            font=ctk.CTkFont(size=13),
+            wraplength=500,
+            justify="left",
+            text_color=("gray10", "gray90")
+        )
+        msg_label.pack(padx=15, pady=10)
+
+        # Auto scroll, unless an older message was inserted above
+        if before is None:
+            self.chat_canvas.update_idletasks()
+            self.chat_canvas.yview_moveto(1.0)
+
+    def add_error_message(self, message):
+        """Add error message bubble"""
+        msg_container = ctk.CTkFrame(self.chat_frame, fg_color="transparent")
+        msg_container.pack(fill=tk.X, padx=10, pady=5)
+
+        bubble = ctk.CTkFrame(
+            msg_container,
+            fg_color=("#ffebee", "#c62828"),
+            corner_radius=10
+        )
+        bubble.pack(anchor="center")
+
+        error_label = ctk.CTkLabel(
+            bubble,
+            text="⚠️ " + message,
+            font=ctk.CTkFont(size=12),
+            wraplength=600,
+            justify="center",
+            text_color=("#c62828", "white")
+        )
+        error_label.pack(padx=15, pady=10)
+
+        self.chat_canvas.update_idletasks()
+        self.chat_canvas.yview_moveto(1.0)
+
+    def show_typing_indicator(self):
+        """Show typing indicator"""
+        self.typing_frame = ctk.CTkFrame(self.chat_frame, fg_color="transparent")
+        self.typing_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        bubble_frame = ctk.CTkFrame(self.typing_frame, fg_color="transparent")
+        bubble_frame.pack(anchor="w", padx=(0, 100))
+
+        bubble = ctk.CTkFrame(
+            bubble_frame,
+            fg_color=("gray70", "gray30"),
+            corner_radius=15
+        )
+        bubble.pack(anchor="w")
+
+        typing_label = ctk.CTkLabel(
+            bubble,
+            text="● ● ●  typing...",
+            font=ctk.CTkFont(size=13, slant="italic"),
+            text_color="gray"
+        )
+        typing_label.pack(padx=15, pady=10)
+
+        self.chat_canvas.update_idletasks()
+        self.chat_canvas.yview_moveto(1.0)
+
+    def remove_typing_indicator(self):
+        """Remove typing indicator"""
+        if hasattr(self, 'typing_frame'):
+            self.typing_frame.destroy()
+            delattr(self, 'typing_frame')
+
+    def clear_chat(self):
+        """Start a new conversation; the previous one stays in the history store"""
+        self.conversation_id = self.store.new_conversation()
+        self.chat_history = []
+        self.oldest_loaded_id = None
+        self.has_older = False
+
+        # Clear all messages
+        for widget in self.chat_frame.winfo_children():
+            widget.destroy()
+
+        self.add_bot_message("Chat cleared! How can I help you? 😊")
+
+    def send_message(self):
+        """Send the user message and get bot response"""
+        message = self.chat_entry.get().strip()
+
+        if not message:
+            return
+
+        if not self.model_loaded:
+            self.add_error_message("Please wait for the AI model to load first!")
+            return
+
+        # Clear entry
+        self.chat_entry.delete(0, tk.END)
+
+        # Add a user message
+        self.add_user_message(message)
+
+        # Disable input
+        self.send_button.configure(state="disabled")
+        self.chat_entry.configure(state="disabled")
+        self.clear_button.configure(state="disabled")
+
+        # Show typing indicator
+        self.show_typing_indicator()
+
+        # Interactive job: bulk work such as sorting pauses until the reply is ready
+        job_scheduler.submit("Chat reply", self.get_bot_response, message, priority=Priority.INTERACTIVE)
+
+    def get_bot_response(self, user_message):
+        """Generate response using the AI model"""
+        try:
+            settings = self.settings
+            if settings.model_name != self.model_name:
+                self.switch_model(settings.model_name)
+            elif self.remote_engine is None and registry.peek(chat_model_key(self.model_name)) is None:
+                self.parent_frame.after(0, self.update_status, "⏳ Reloading AI model...", "orange")
+
+            # Add a user message to history
+            self.chat_history.append(self.store.append(
+                self.conversation_id, "user", user_message, self.encode_message(user_message), self.model_name
+            ))
+
+            # Keep only the last messages
+            self.chat_history = self.chat_history[-settings.context_messages:]
+            self.apply_settings(settings)
+
+            # Canned questions are answered from the cache without running the model
+            start = time.perf_counter()
+            cache_key = None
+            if self.use_response_cache():
+                cache_key = self.response_cache.make_key(self.chat_history, self.engine.settings())
+            reply = self.response_cache.get(cache_key) if cache_key else None
+
+            if reply is not None:
+                status = f"⚡ Cached reply in {(time.perf_counter() - start) * 1000:.1f} ms"
+            else:
+                # Build the conversation from the stored token ids
+                input_ids = [token_id for message in self.chat_history for token_id in self.message_ids(message)]
+                reply = self.engine.generate(input_ids)
+                status = self.describe_stats(reply.stats)
+                if cache_key and reply.text:
+                    self.response_cache.put(cache_key, reply)
+            if cache_key:
+                status += f" · {self.response_cache.describe()}"
+            response = reply.text
+
+            if not response:
+                response = "I'm not sure how to respond to that. Could you rephrase?"
+
+            # Add to history
+            self.chat_history.append(self.store.append(
+                self.conversation_id, "bot", response, self.encode_message(response), self.model_name
+            ))
+
+            # Update UI
+            self.parent_frame.after(0, self.display_response, response)
+            self.parent_frame.after(0, self.update_status, status, "green")
+
+        except Exception as e:
+            error_msg = f"Error generating response: {str(e)}"
+            self.parent_frame.after(0, self.display_error, error_msg)
+
+    def switch_model(self, model_name: str):
+        """
+        Follow a model change in the settings, from the next reply on
+
+        The previous model is unloaded; stored messages are re-encoded for the new
+        tokenizer as they are used.
+        """
+        self.parent_frame.after(0, self.update_status, f"⏳ Loading {model_name}...", "orange")
+        if self.remote_engine is not None:
+            remote = RemoteChatEngine(self.remote_engine.client, ChatEngine(model_name))
+            remote.load()
+            self.remote_engine = remote
+        else:
+            get_chat_engine(model_name)
+            registry.unload(chat_model_key(self.model_name))
+        self.model_name = model_name
+        warmup_scheduler.record_use("chat")
+
+    def encode_message(self, text: str) -> list[int]:
+        """Token ids of one conversation turn"""
+        return self.engine.encode(text)
+
+    def message_ids(self, message: StoredMessage) -> list[int]:
+        """Token ids of a stored message, encoding it only if they were not saved for the current model"""
+        if message.token_ids is None or message.tokenizer != self.model_name:
+            message.token_ids = self.encode_message(message.text)
+            message.tokenizer = self.model_name
+        return message.token_ids
+
+    def toggle_prompt_lookup(self):
+        """Switch between plain sampling and prompt-lookup decoding for the next replies"""
+        self.prompt_lookup = bool(self.prompt_lookup_switch.get())
+
+    @property
+    def settings(self) -> ChatSettings:
+        """Chat settings, re-read when the config file changes"""
+        return config_store.get().chat
+
+    def apply_settings(self, settings: ChatSettings):
+        """
+        Copy generation and cache settings, so edits take effect from the next reply
+
+        Also sets prompt lookup from the switch, as an engine loaded again after an unload
+        starts from its defaults.
+        """
+        engine = self.engine
+        for name in ("max_length", "do_sample", "top_k", "top_p", "temperature", "no_repeat_ngram_size"):
+            setattr(engine, name, getattr(settings, name))
+        engine.lookup_max_draft = settings.prompt_lookup_draft
+        engine.prompt_lookup = self.prompt_lookup
+        self.response_cache.max_entries = settings.response_cache_size
+        self.response_cache.ttl = settings.response_cache_ttl
+
+    def use_response_cache(self) -> bool:
+        """Deterministic replies are always cached; sampled ones only while the switch is on"""
+        if not self.response_cache.max_entries:
+            return False
+        return not self.engine.do_sample or bool(self.cache_switch.get())
+
+    def describe_stats(self, stats) -> str:
+        """Status bar text for the decoding stats of the last reply"""
+        text = f"✅ {stats.new_tokens} tokens at {stats.tokens_per_second:.1f} tokens/s"
+        if self.engine.prompt_lookup:
+            text += (f" · prompt lookup accepted {stats.accepted}/{stats.drafted} drafted"
+                     f" ({stats.acceptance_rate:.0%}) in {stats.forward_passes} passes")
+        return text
+
+    def display_response(self, response):
+        """Display bot response in UI"""
+        self.remove_typing_indicator()
+        self.add_bot_message(response)
+
+        # Re-enable input
+        self.send_button.configure(state="normal")
+        self.chat_entry.configure(state="normal")
+        self.clear_button.configure(state="normal")
+        self.chat_entry.focus()
+
+    def display_error(self, error_message):
+        """Display error in UI"""
+        self.remove_typing_indicator()
+        self.add_error_message(error_message)
+
+        # Re-enable input
+        self.send_button.configure(state="normal")
+        self.chat_entry.configure(state="normal")
+        self.clear_button.configure(state="normal")
+        self.chat_entry.focus()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from Modules.Core.AppPaths import app_data_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id INTEGER NOT NULL REFERENCES conversations(id),
+    role TEXT NOT NULL,
+    text TEXT NOT NULL,
+    token_ids BLOB,
+    tokenizer TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_by_conversation ON messages(conversation_id, id);
+"""
+
+
+@dataclass
+class StoredMessage:
+    """One chat message with the token ids it was encoded to"""
+    id: int
+    role: str
+    text: str
+    token_ids: list[int] | None = None
+    tokenizer: str | None = None  # model name whose tokenizer produced token_ids
+
+
+def pack_ids(token_ids: list[int] | None) -> bytes | None:
+    return array('I', token_ids).tobytes() if token_ids is not None else None
+
+
+def unpack_ids(blob: bytes | None) -> list[int] | None:
+    if blob is None:
+        return None
+    ids = array('I')
+    ids.frombytes(blob)
+    return ids.tolist()
+
+
+class ChatHistoryStore:
+    """
+    Append-only SQLite store of chat conversations
+
+    Messages are never updated or deleted; clearing the chat starts a new conversation.
+    Pages are read newest-first by id, so opening a long conversation only touches the
+    most recent rows.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or app_data_path("chat_history.sqlite3")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        # Stores created before the tokenizer was recorded; their ids are re-encoded on use
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(messages)")]
+        if "tokenizer" not in columns:
+            self._db.execute("ALTER TABLE messages ADD COLUMN tokenizer TEXT")
+
+    def new_conversation(self) -> int:
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT INTO conversations (started_at) VALUES (?)",
+                (datetime.now().isoformat(timespec="seconds"),)
+            )
+            return cursor.lastrowid
+
+    def latest_conversation(self) -> int | None:
+        with self._lock:
+            row = self._db.execute("SELECT MAX(id) FROM conversations").fetchone()
+        return row[0]
+
+    def append(self, conversation_id: int, role: str, text: str, token_ids: list[int] | None = None,
+               tokenizer: str | None = None) -> StoredMessage:
+        """
+        Add a message to a conversation
+
+        :param role: "user" or "bot"
+        :param token_ids: ids the message encodes to, kept so restores skip tokenization
+        :param tokenizer: model name whose tokenizer produced the ids
+        :return: the stored message
+        """
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT INTO messages (conversation_id, role, text, token_ids, tokenizer, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (conversation_id, role, text, pack_ids(token_ids), tokenizer,
+                 datetime.now().isoformat(timespec="seconds"))
+            )
+        return StoredMessage(cursor.lastrowid, role, text, token_ids, tokenizer if token_ids is not None else None)
+
+    def page(self, conversation_id: int, limit: int, before_id: int | None = None,
+             tokenizer: str | None = None) -> list[StoredMessage]:
+        """
+        Load a page of messages, oldest first
+
+        :param limit: maximum number of messages
+        :param before_id: only messages older than this id; None for the most recent page
+        :param tokenizer: model name the caller encodes with; ids stored by another tokenizer
+            are left out so the text gets re-encoded
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, role, text, token_ids, tokenizer FROM messages "
+                "WHERE conversation_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (conversation_id, before_id if before_id is not None else 2 ** 63 - 1, limit)
+            ).fetchall()
+        return [StoredMessage(row[0], row[1], row[2], unpack_ids(row[3]), tokenizer) if row[4] == tokenizer
+                else StoredMessage(row[0], row[1], row[2])
+                for row in reversed(rows)]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
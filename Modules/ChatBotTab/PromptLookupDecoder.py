@@ -0,0 +1,154 @@
+"""
+Prompt-lookup speculative decoding
+
+Candidate tokens are drafted by finding the latest earlier occurrence of the trailing n-gram
+in the conversation and copying what followed it. The model checks the whole draft in one
+forward pass. Chat replies often repeat phrases from the prompt, so several tokens can be
+accepted per pass without a second (draft) model.
+
+Greedy decoding accepts draft tokens while they equal the argmax. Sampling uses
+speculative sampling with a point-mass draft: a drafted token x is accepted with
+probability p(x), and on rejection the replacement is sampled from p with x removed. The
+output distribution is the same as plain sampling with the same logits processors.
+"""
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class DecodeStats:
+    """Counters of one generation call"""
+    new_tokens: int = 0
+    forward_passes: int = 0
+    drafted: int = 0
+    accepted: int = 0
+    elapsed: float = 0.0
+    first_token_time: float | None = None
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.drafted if self.drafted else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.new_tokens / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def find_draft(ids: list[int], ngram_size: int, max_draft: int) -> list[int]:
+    """
+    Tokens that followed the most recent earlier occurrence of the trailing n-gram
+
+    Tries n-grams from `ngram_size` down to 1 and returns an empty list if nothing matches.
+    """
+    for n in range(min(ngram_size, len(ids) - 1), 0, -1):
+        tail = ids[-n:]
+        for start in range(len(ids) - n - 1, -1, -1):
+            if ids[start:start + n] == tail:
+                draft = ids[start + n:start + n + max_draft]
+                if draft:
+                    return draft
+    return []
+
+
+class PromptLookupDecoder:
+    """Speculative decoding loop for a causal LM with a KV cache"""
+
+    def __init__(self, model, processors, do_sample=True, ngram_size=3, max_draft=10):
+        """
+        :param model: transformers causal LM
+        :param processors: LogitsProcessorList applied to every position (repetition rules and sampling warpers)
+        :param do_sample: sample instead of taking the argmax
+        :param ngram_size: longest n-gram used to look up drafts
+        :param max_draft: maximum drafted tokens per forward pass
+        """
+        self.model = model
+        self.processors = processors
+        self.do_sample = do_sample
+        self.ngram_size = ngram_size
+        self.max_draft = max_draft
+
+    def _scores(self, logits, prefix):
+        import torch
+
+        context = torch.tensor([prefix], device=logits.device)
+        return self.processors(context, logits.unsqueeze(0).float())[0]
+
+    def _pick(self, scores):
+        import torch
+
+        if not self.do_sample:
+            return int(scores.argmax())
+        return int(torch.multinomial(torch.softmax(scores, dim=-1), 1))
+
+    def _verify(self, logits, ids, draft):
+        """
+        Accept a prefix of the draft and choose one more token
+
+        :param logits: model logits for [last token] + draft, shape (len(draft) + 1, vocab)
+        :return: tuple (accepted draft token count, next token)
+        """
+        import torch
+
+        for i, candidate in enumerate(draft):
+            scores = self._scores(logits[i], ids + draft[:i])
+            if not self.do_sample:
+                best = int(scores.argmax())
+                if best != candidate:
+                    return i, best
+                continue
+
+            probs = torch.softmax(scores, dim=-1)
+            if torch.rand(()) < probs[candidate]:
+                continue
+            probs[candidate] = 0
+            if probs.sum() <= 0:
+                return i, self._pick(scores)
+            return i, int(torch.multinomial(probs / probs.sum(), 1))
+
+        return len(draft), self._pick(self._scores(logits[len(draft)], ids + draft))
+
+    def generate(self, input_ids: list[int], max_length: int, eos_token_id: int) -> tuple[list[int], DecodeStats]:
+        """
+        Generate until EOS or max_length total tokens
+
+        :param input_ids: prompt token ids
+        :return: tuple (generated token ids including the final EOS, stats)
+        """
+        import torch
+
+        stats = DecodeStats()
+        start = time.perf_counter()
+        device = self.model.device
+        ids = list(input_ids)
+        prompt_length = len(ids)
+
+        # The cache always covers ids[:-1]; the last token is fed with the next draft
+        past = None
+        if len(ids) > 1:
+            past = self.model(torch.tensor([ids[:-1]], device=device), use_cache=True).past_key_values
+            stats.forward_passes += 1
+
+        while len(ids) < max_length:
+            draft = find_draft(ids, self.ngram_size, min(self.max_draft, max_length - len(ids) - 1))
+            output = self.model(torch.tensor([ids[-1:] + draft], device=device),
+                                past_key_values=past, use_cache=True)
+            stats.forward_passes += 1
+            stats.drafted += len(draft)
+
+            accepted, token = self._verify(output.logits[0], ids, draft)
+            stats.accepted += accepted
+            cached_length = len(ids) + accepted
+            ids += draft[:accepted] + [token]
+            if stats.first_token_time is None:
+                stats.first_token_time = time.perf_counter() - start
+
+            past = output.past_key_values
+            past.crop(cached_length)
+
+            if eos_token_id in ids[prompt_length:]:
+                del ids[ids.index(eos_token_id, prompt_length) + 1:]
+                break
+
+        stats.elapsed = time.perf_counter() - start
+        stats.new_tokens = len(ids) - prompt_length
+        return ids[prompt_length:], stats
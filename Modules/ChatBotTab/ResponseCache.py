@@ -0,0 +1,77 @@
+import string
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_text(text: str) -> str:
+    """Case, whitespace and trailing punctuation insensitive form of a message"""
+    return " ".join(text.lower().split()).strip(string.punctuation + " ")
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of chatbot replies with a time to live
+
+    Keys are the normalized last messages of the conversation plus the model name and
+    generation settings, so "Hi!" and "hi" share an entry but a change of model or
+    temperature does not.
+    """
+
+    def __init__(self, max_entries=256, ttl=3600.0, context_messages=2):
+        """
+        :param max_entries: entries kept before the least recently used is evicted
+        :param ttl: seconds an entry stays valid
+        :param context_messages: trailing conversation messages that make up the key
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.context_messages = context_messages
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, messages, settings: tuple) -> tuple:
+        """
+        :param messages: conversation messages with `role` and `text`, oldest first
+        :param settings: hashable model name and generation settings, see ChatEngine.settings
+        """
+        recent = messages[-self.context_messages:] if self.context_messages else messages
+        return tuple((m.role, normalize_text(m.text)) for m in recent), settings
+
+    def get(self, key):
+        """Cached value for the key, or None on a miss or an expired entry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def describe(self) -> str:
+        """Hit/miss counters for the status bar"""
+        return f"cache {self.hits} hits / {self.misses} misses"
+
+
+# One cache per process, so replies survive the chat tab being rebuilt on every visit
+response_cache = ResponseCache()
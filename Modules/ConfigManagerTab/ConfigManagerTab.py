@@ -1,53 +1,171 @@
 import tkinter as tk
+from dataclasses import asdict, fields
 import customtkinter as ctk
+from Modules.Core.AppConfig import AppConfig, config_from_dict, config_store, setting_choices
+
+SECTION_TITLES = {
+    "sorting": "📸 Sort Pictures",
+    "chat": "💬 Chatbot",
+    "performance": "⚡ Performance",
+}
 
 
 class ConfigManagerTab:
-    """Tab for placeholder"""
+    """Tab for editing the application settings"""
 
     def __init__(self, parent_frame):
         self.parent_frame = parent_frame
+        # (section, setting) -> tk variable of its input
+        self.variables = {}
         self.create_widgets()
+        self.show_config(config_store.get())
+        if config_store.errors:
+            self.show_errors(config_store.errors)
+
+        # Follow edits made to the YAML file while the tab is open
+        unsubscribe = config_store.subscribe(self.on_config_changed)
+        self.main_container.bind("<Destroy>", lambda e: unsubscribe(), add="+")
 
     def create_widgets(self):
         # Main container
-        main_container = ctk.CTkFrame(self.parent_frame, fg_color="transparent")
-        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-
-        # Center frame for content
-        center_frame = ctk.CTkFrame(main_container)
-        center_frame.place(relx=0.5, rely=0.5, anchor="center")
-
-        # Icon/emoji
-        icon_label = ctk.CTkLabel(
-            center_frame,
-            text="⚙️",
-            font=ctk.CTkFont(size=80)
+        self.main_container = ctk.CTkFrame(self.parent_frame, fg_color="transparent")
+        self.main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        info_label = ctk.CTkLabel(
+            self.main_container,
+            text=f"Settings are stored in {config_store.path} and apply without restarting. "
+                 f"Edits to the file are picked up automatically.",
+            font=ctk.CTkFont(size=12),
+            text_color=("gray40", "gray60"),
+            wraplength=800,
+            justify="left"
         )
-        icon_label.pack(pady=(20, 10))
+        info_label.pack(anchor="w", pady=(0, 10))
+
+        settings_frame = ctk.CTkScrollableFrame(self.main_container)
+        settings_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+        settings_frame.columnconfigure(1, weight=1)
+
+        row = 0
+        for section in fields(AppConfig):
+            title = ctk.CTkLabel(
+                settings_frame,
+                text=SECTION_TITLES.get(section.name, section.name.title()),
+                font=ctk.CTkFont(size=16, weight="bold")
+            )
+            title.grid(row=row, column=0, columnspan=2, sticky="w", padx=10, pady=(15, 5))
+            row += 1
 
-        # Title
-        title_label = ctk.CTkLabel(
-            center_frame,
-            text="Placeholder",
-            font=ctk.CTkFont(size=24, weight="bold")
+            defaults = section.default_factory()
+            for setting in fields(defaults):
+                self.create_input(settings_frame, row, section.name, setting, getattr(defaults, setting.name))
+                row += 1
+
+        # Buttons
+        button_frame = ctk.CTkFrame(self.main_container, fg_color="transparent")
+        button_frame.pack(fill=tk.X)
+
+        save_button = ctk.CTkButton(
+            button_frame,
+            text="Save",
+            width=120,
+            height=40,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            command=self.save
         )
-        title_label.pack(pady=(0, 10))
-
-        # Subtitle
-        subtitle_label = ctk.CTkLabel(
-            center_frame,
-            text="Coming Soon",
-            font=ctk.CTkFont(size=16),
-            text_color=("gray50", "gray60")
+        save_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        reload_button = ctk.CTkButton(
+            button_frame,
+            text="Reload",
+            width=120,
+            height=40,
+            font=ctk.CTkFont(size=14),
+            command=self.reload,
+            fg_color="gray40",
+            hover_color="gray30"
         )
-        subtitle_label.pack(pady=(0, 20))
-
-        # Description
-        desc_label = ctk.CTkLabel(
-            center_frame,
-            text="This is just a placeholder.",
-            font=ctk.CTkFont(size=13),
-            text_color=("gray40", "gray70")
+        reload_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        defaults_button = ctk.CTkButton(
+            button_frame,
+            text="Reset to Defaults",
+            width=150,
+            height=40,
+            font=ctk.CTkFont(size=14),
+            command=lambda: self.show_config(AppConfig()),
+            fg_color="gray40",
+            hover_color="gray30"
         )
-        desc_label.pack(pady=(0, 20))
+        defaults_button.pack(side=tk.LEFT)
+
+        self.status_label = ctk.CTkLabel(
+            button_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            wraplength=500,
+            justify="left"
+        )
+        self.status_label.pack(side=tk.LEFT, padx=15)
+
+    def create_input(self, parent, row, section: str, setting, default):
+        """Label and input for one setting: a switch, a drop-down or a text entry"""
+        label = ctk.CTkLabel(parent, text=setting.metadata["label"], font=ctk.CTkFont(size=13))
+        label.grid(row=row, column=0, sticky="w", padx=(20, 10), pady=4)
+
+        if isinstance(default, bool):
+            variable = tk.BooleanVar()
+            widget = ctk.CTkSwitch(parent, text="", variable=variable)
+        elif setting_choices(setting.metadata):
+            variable = tk.StringVar()
+            widget = ctk.CTkOptionMenu(parent, values=list(setting_choices(setting.metadata)), variable=variable)
+        else:
+            variable = tk.StringVar()
+            widget = ctk.CTkEntry(parent, textvariable=variable, width=300)
+        widget.grid(row=row, column=1, sticky="w", padx=(0, 10), pady=4)
+        self.variables[section, setting.name] = variable
+
+    def show_config(self, config: AppConfig):
+        """Fill the inputs from a config"""
+        for section, values in asdict(config).items():
+            for name, value in values.items():
+                self.variables[section, name].set(value)
+
+    def read_inputs(self) -> dict:
+        """Current input values as a nested dict, in the layout of the YAML file"""
+        data = {}
+        for (section, name), variable in self.variables.items():
+            value = variable.get()
+            data.setdefault(section, {})[name] = value.strip() if isinstance(value, str) else value
+        return data
+
+    def save(self):
+        """Validate the inputs and write them to the settings file"""
+        config, errors = config_from_dict(self.read_inputs())
+        if errors:
+            self.show_errors(errors)
+            return
+        try:
+            config_store.save(config)
+        except OSError as e:
+            self.show_errors([f"Could not save settings: {str(e)}"])
+            return
+        self.status_label.configure(text="✅ Settings saved and applied", text_color="green")
+
+    def reload(self):
+        """Discard unsaved edits and show the settings file again"""
+        self.show_config(config_store.get())
+        if config_store.errors:
+            self.show_errors(config_store.errors)
+        else:
+            self.status_label.configure(text="🔄 Reloaded from file", text_color=("gray10", "gray90"))
+
+    def on_config_changed(self, config: AppConfig):
+        """The settings file changed outside this tab"""
+        if config == config_from_dict(self.read_inputs())[0]:
+            return
+        self.show_config(config)
+        self.status_label.configure(text="🔄 Settings file changed, reloaded", text_color=("gray10", "gray90"))
+
+    def show_errors(self, errors: list[str]):
+        self.status_label.configure(text="❌ " + "\n".join(errors), text_color="red")
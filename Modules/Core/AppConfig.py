@@ -0,0 +1,232 @@
+import os
+import threading
+from dataclasses import asdict, dataclass, field, fields
+import yaml
+from Modules.Core.AppPaths import app_data_path
+
+
+def setting(default, label, choices=None, minimum=None, maximum=None):
+    """
+    Dataclass field with what the settings tab needs to show and validate it
+
+    :param label: text shown next to the input
+    :param choices: allowed values, shown as a drop-down; a function returning them for
+        values that come from a registry
+    :param minimum: smallest allowed number
+    :param maximum: largest allowed number
+    """
+    return field(default=default, metadata={"label": label, "choices": choices, "minimum": minimum,
+                                            "maximum": maximum})
+
+
+def setting_choices(metadata: dict) -> tuple | None:
+    """Allowed values of a setting, None if any value goes"""
+    choices = metadata.get("choices")
+    if callable(choices):
+        try:
+            choices = choices()
+        except ImportError:
+            # The registry's module cannot load here, so there is nothing to check against
+            return None
+    return tuple(choices) if choices else None
+
+
+def detection_methods() -> tuple:
+    """Registered detectors; imported on use because the sorter itself reads these settings"""
+    from Modules.SortPituresTab.PictureSorter import DETECTORS
+    return tuple(DETECTORS)
+
+
+def yolo_backends() -> tuple:
+    from Modules.SortPituresTab.YoloBackend import YoloBackend
+    return YoloBackend.BACKENDS
+
+
+@dataclass
+class SortingSettings:
+    method: str = setting("yolo", "Detection method", choices=detection_methods)
+    yolo_weights: str = setting("../../yolov8n.pt", "YOLO weights path")
+    yolo_backend: str = setting("auto", "YOLO backend", choices=yolo_backends)
+    batch_size: int = setting(1, "YOLO batch size", minimum=1)
+    decode_workers: int = setting(0, "Decode worker processes (0 = decode in-process)", minimum=0)
+    haar_scale_factor: float = setting(1.1, "Haar scale factor", minimum=1.01)
+    haar_min_neighbors: int = setting(5, "Haar min neighbors", minimum=0)
+    haar_min_size: int = setting(30, "Haar min face size (px)", minimum=1)
+    dnn_model_path: str = setting("../../face_detection_yunet_2023mar.onnx", "DNN face model (YuNet .onnx or SSD .caffemodel)")
+    dnn_score_threshold: float = setting(0.6, "DNN face confidence threshold", minimum=0.0)
+    videos: bool = setting(True, "Sort videos too")
+    video_sample_seconds: float = setting(1.0, "Video: seconds between sampled frames", minimum=0.1)
+    video_max_frames: int = setting(16, "Video: most frames checked per clip", minimum=1)
+    watch_settle_seconds: float = setting(2.0, "Watch mode: seconds a new file must stay unchanged", minimum=0.1)
+    watch_poll_interval: float = setting(2.0, "Watch mode: rescan interval without inotify (s)", minimum=0.2)
+
+
+@dataclass
+class ChatSettings:
+    model_name: str = setting("microsoft/DialoGPT-small", "Model")
+    max_length: int = setting(1000, "Max conversation length (tokens)", minimum=16)
+    do_sample: bool = setting(True, "Sample replies")
+    top_k: int = setting(50, "Top-k", minimum=0)
+    top_p: float = setting(0.95, "Top-p", minimum=0.0, maximum=1.0)
+    temperature: float = setting(0.7, "Temperature", minimum=0.01)
+    no_repeat_ngram_size: int = setting(3, "No-repeat n-gram size", minimum=0)
+    context_messages: int = setting(10, "Messages given to the model", minimum=1)
+    history_page_size: int = setting(30, "Messages loaded per history page", minimum=1)
+    prompt_lookup_draft: int = setting(10, "Prompt lookup draft tokens", minimum=1)
+    response_cache_size: int = setting(256, "Response cache entries", minimum=0)
+    response_cache_ttl: float = setting(3600.0, "Response cache lifetime (s)", minimum=0.0)
+
+
+@dataclass
+class PerformanceSettings:
+    thread_budget: int = setting(0, "Compute threads for all jobs (0 = one per physical core)", minimum=0)
+    shared_models: bool = setting(False, "Share models through the local inference server")
+    warmup: bool = setting(True, "Preload recently used models at start-up")
+    warmup_recent_days: int = setting(14, "Preload models used within (days)", minimum=1)
+    monitor_interval: float = setting(2.0, "Resource sampling interval (s)", minimum=0.5)
+    metrics_export: bool = setting(False, "Write resource samples to metrics.csv")
+    metrics_max_mb: float = setting(5.0, "Metrics file size before rolling over (MB)", minimum=0.1)
+
+
+@dataclass
+class AppConfig:
+    """All user-tunable settings, one section per area of the app"""
+    sorting: SortingSettings = field(default_factory=SortingSettings)
+    chat: ChatSettings = field(default_factory=ChatSettings)
+    performance: PerformanceSettings = field(default_factory=PerformanceSettings)
+
+
+def coerce(value, default, name: str, metadata: dict):
+    """
+    Convert a parsed value to the type of the default and check its constraints
+
+    :raises ValueError: with a readable message if the value does not fit
+    """
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise ValueError(f"{name} must be true or false")
+    elif isinstance(default, (int, float)):
+        if isinstance(value, bool):
+            raise ValueError(f"{name} must be a number")
+        if isinstance(default, int) and isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{name} must be a whole number")
+        try:
+            value = type(default)(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be a {'whole number' if isinstance(default, int) else 'number'}") from None
+        if metadata.get("minimum") is not None and value < metadata["minimum"]:
+            raise ValueError(f"{name} must be at least {metadata['minimum']}")
+        if metadata.get("maximum") is not None and value > metadata["maximum"]:
+            raise ValueError(f"{name} must be at most {metadata['maximum']}")
+    else:
+        value = str(value)
+
+    choices = setting_choices(metadata)
+    if choices and value not in choices:
+        raise ValueError(f"{name} must be one of {', '.join(choices)}")
+    return value
+
+
+def section_from_dict(cls, data: dict, errors: list):
+    """Build one settings section, keeping the default for every missing or invalid value"""
+    section = cls()
+    for f in fields(cls):
+        if f.name not in data:
+            continue
+        try:
+            setattr(section, f.name, coerce(data[f.name], getattr(section, f.name), f.name, f.metadata))
+        except (TypeError, ValueError) as e:
+            errors.append(str(e))
+    return section
+
+
+def config_from_dict(data: dict) -> tuple[AppConfig, list[str]]:
+    """
+    :return: tuple (config, list of problems that fell back to defaults)
+    """
+    errors = []
+    sections = {}
+    for f in fields(AppConfig):
+        raw = data.get(f.name) or {}
+        if not isinstance(raw, dict):
+            errors.append(f"{f.name} must be a mapping")
+            raw = {}
+        sections[f.name] = section_from_dict(f.default_factory, raw, errors)
+    return AppConfig(**sections), errors
+
+
+class ConfigStore:
+    """
+    YAML backed configuration, parsed once and cached
+
+    get() only stats the file and re-parses it when its mtime changed, so callers can read
+    settings at the point of use and pick up edits without a restart. Subscribers are told
+    about changes from poll(), which the main window calls on the Tk thread.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or app_data_path("config.yaml")
+        self.errors: list[str] = []
+        self._config = None
+        self._mtime = None
+        self._subscribers = []
+        self._notified = None
+        self._lock = threading.Lock()
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self) -> AppConfig:
+        """Current settings, re-read if the file changed since the last call"""
+        mtime = self._file_mtime()
+        with self._lock:
+            if self._config is None or mtime != self._mtime:
+                self._config, self.errors = self._read()
+                self._mtime = mtime
+            return self._config
+
+    def _read(self) -> tuple[AppConfig, list[str]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            return AppConfig(), []
+        except (OSError, yaml.YAMLError) as e:
+            return AppConfig(), [f"Could not read {self.path}: {str(e)}"]
+        if not isinstance(data, dict):
+            return AppConfig(), [f"{self.path} must contain a mapping"]
+        return config_from_dict(data)
+
+    def save(self, config: AppConfig):
+        """Write the settings and notify subscribers on the next poll"""
+        with self._lock:
+            temp_path = self.path.with_suffix(".yaml.partial")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                yaml.safe_dump(asdict(config), f, sort_keys=False)
+            os.replace(temp_path, self.path)
+        self.get()
+
+    def subscribe(self, callback):
+        """
+        :param callback: called with the new AppConfig after every change
+        :return: function removing the subscription
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback) if callback in self._subscribers else None
+
+    def poll(self):
+        """Reload if the file changed and tell subscribers; call periodically on the Tk thread"""
+        config = self.get()
+        if config is not self._notified:
+            first = self._notified is None
+            self._notified = config
+            if not first:
+                for callback in list(self._subscribers):
+                    callback(config)
+
+
+# One store per process, shared by all tabs
+config_store = ConfigStore()
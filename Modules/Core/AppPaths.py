@@ -0,0 +1,27 @@
+from pathlib import Path
+
+APP_DATA_DIR = Path.home() / ".daily_assistant"
+
+
+def app_data_path(*parts: str) -> Path:
+    """
+    Path inside the per-user application data folder, creating parent folders as needed
+
+    :param parts: path components below the data folder
+    :return: absolute path
+    """
+    path = APP_DATA_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def app_data_dir(*parts: str) -> Path:
+    """
+    Folder inside the per-user application data folder, created if missing
+
+    :param parts: path components below the data folder
+    :return: absolute path
+    """
+    path = APP_DATA_DIR.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,243 @@
+import itertools
+import sys
+import threading
+import time
+from enum import IntEnum
+from Modules.Core.AppConfig import config_store
+
+
+_local = threading.local()
+
+
+def current_job():
+    """Job running on the calling thread, None outside scheduler jobs"""
+    return getattr(_local, "job", None)
+
+
+class Priority(IntEnum):
+    """Job priority, lower runs first"""
+    INTERACTIVE = 0  # the user is waiting on it, e.g. a chat reply
+    BACKGROUND = 1   # model loads and warm-up
+    BULK = 2         # long batch work, e.g. sorting; paused while interactive jobs run
+
+
+def apply_thread_budget(threads: int):
+    """
+    Set the intra-op thread count of the libraries already in use, for the calling thread
+
+    torch's OpenMP setting only reaches work started from the thread that set it, so every
+    job applies its own share on its own thread. torch is only configured if some job has
+    imported it.
+    """
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+    if "cv2" in sys.modules:
+        sys.modules["cv2"].setNumThreads(threads)
+
+
+def sync_job_threads():
+    """Pick up a rebalanced thread share; call from the work's checkpoints"""
+    job = current_job()
+    if job is not None:
+        job.sync_threads()
+
+
+class Job:
+    """
+    One unit of background work and its controls
+
+    Pausing can come from the user or from the scheduler (preemption); the job only resumes
+    once neither holds it. The work itself stays in charge of honouring pause and cancel,
+    through the hooks given to attach().
+    """
+
+    def __init__(self, name, target, args, priority, on_progress=None):
+        self.name = name
+        self.target = target
+        self.args = args
+        self.priority = priority
+        self.on_progress = on_progress
+        self.progress = None
+        self.status = "queued"
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.user_paused = False
+        self.preempted = False
+        # Share of the thread budget set by the scheduler, and the share last applied by the job
+        self.threads = None
+        self._applied_threads = None
+        self._cancelled = threading.Event()
+        self._hooks = (None, None, None)
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return self.user_paused or self.preempted
+
+    def attach(self, pause=None, resume=None, cancel=None):
+        """
+        Connect the job to the object doing the work, applying the current state right away
+
+        :param pause: callable holding the work at its next checkpoint
+        :param resume: callable releasing it
+        :param cancel: callable stopping it at its next checkpoint
+        """
+        with self._lock:
+            self._hooks = (pause, resume, cancel)
+            paused, cancelled = self.paused, self.cancelled
+        if cancelled and cancel:
+            cancel()
+        elif paused and pause:
+            pause()
+
+    def _update(self, user_paused=None, preempted=None):
+        with self._lock:
+            was_paused = self.paused
+            if user_paused is not None:
+                self.user_paused = user_paused
+            if preempted is not None:
+                self.preempted = preempted
+            now_paused = self.paused
+            pause, resume, _ = self._hooks
+        if now_paused != was_paused:
+            hook = pause if now_paused else resume
+            if hook:
+                hook()
+
+    def pause(self):
+        """Pause on the user's request"""
+        self._update(user_paused=True)
+
+    def resume(self):
+        """Resume on the user's request; a preempted job waits for the interactive work to finish"""
+        self._update(user_paused=False)
+
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            cancel = self._hooks[2]
+        if cancel:
+            cancel()
+
+    def sync_threads(self):
+        """Apply the job's current thread share if it changed; only call on the job's own thread"""
+        threads = self.threads
+        if threads and threads != self._applied_threads:
+            apply_thread_budget(threads)
+            self._applied_threads = threads
+
+    def report(self, progress):
+        """
+        Publish progress of the running work
+
+        :param progress: anything the submitter's callback understands, e.g. SortMetrics
+        """
+        self.progress = progress
+        if self.on_progress:
+            self.on_progress(progress)
+
+
+class JobScheduler:
+    """
+    App-wide runner for background work
+
+    Interactive and background jobs start at once; bulk jobs run one at a time in
+    submission order and are paused while any interactive job runs, so a chat reply does not
+    compete with a sort for the same cores. The thread budget is split evenly between the
+    jobs that are actually running; each job applies its share to torch and OpenCV on its
+    own thread when it starts and at its checkpoints.
+    """
+
+    def __init__(self, thread_budget=None, max_bulk=1):
+        """
+        :param thread_budget: threads for all jobs together, None to follow the performance settings
+        """
+        self.thread_budget = thread_budget
+        self.max_bulk = max_bulk
+        self._running: list[Job] = []
+        self._queued: list[tuple[int, int, Job]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, target, *args, priority=Priority.BULK, on_progress=None) -> Job:
+        """
+        Run `target(*args)` on a daemon thread under the scheduler's control
+
+        :param name: label shown in monitoring
+        :param on_progress: callable receiving whatever the job passes to Job.report
+        :return: the job, to attach pause/cancel hooks and control it
+        """
+        job = Job(name, target, args, priority, on_progress)
+        with self._lock:
+            self._queued.append((priority, next(self._counter), job))
+            self._queued.sort(key=lambda item: item[:2])
+        self._schedule()
+        return job
+
+    def budget(self) -> int:
+        """Threads for all jobs together"""
+        from Modules.SortPituresTab.YoloBackend import default_num_threads
+
+        return self.thread_budget or config_store.get().performance.thread_budget or default_num_threads()
+
+    def jobs(self) -> list[Job]:
+        """Running and queued jobs, running first"""
+        with self._lock:
+            return self._running + [job for _, _, job in self._queued]
+
+    def _schedule(self):
+        """Start what may start, preempt or resume bulk work and rebalance threads"""
+        started = []
+        with self._lock:
+            running_bulk = sum(job.priority == Priority.BULK for job in self._running)
+            for item in list(self._queued):
+                job = item[2]
+                if job.priority == Priority.BULK:
+                    if running_bulk >= self.max_bulk:
+                        continue
+                    running_bulk += 1
+                self._queued.remove(item)
+                self._running.append(job)
+                started.append(job)
+
+            interactive = any(job.priority == Priority.INTERACTIVE for job in self._running)
+            bulk = [job for job in self._running if job.priority == Priority.BULK]
+            active = sum(not job.paused for job in self._running if job.priority != Priority.BULK)
+            active += 0 if interactive else sum(not job.user_paused for job in bulk)
+            running = list(self._running)
+
+        for job in bulk:
+            job._update(preempted=interactive)
+        share = max(1, self.budget() // max(1, active))
+        for job in running:
+            job.threads = share
+
+        for job in started:
+            job.status = "running"
+            job.started_at = time.time()
+            threading.Thread(target=self._run, args=(job,), name=f"job-{job.name}", daemon=True).start()
+
+    def _run(self, job: Job):
+        _local.job = job
+        job.sync_threads()
+        try:
+            job.target(*job.args)
+            job.status = "cancelled" if job.cancelled else "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._running.remove(job)
+            self._schedule()
+
+
+# One scheduler per process, shared by all tabs
+job_scheduler = JobScheduler()
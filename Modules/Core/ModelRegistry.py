@@ -0,0 +1,110 @@
+import gc
+import sys
+import threading
+import time
+from dataclasses import dataclass
+import psutil
+
+
+@dataclass
+class ModelEntry:
+    """A loaded model and how it got there"""
+    model: object
+    load_seconds: float
+    rss_bytes: int = 0  # growth of the process RSS during the load, approximate if loads overlap
+    preloaded: bool = False
+    claimed: bool = False
+    loaded_at: float = 0.0
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models
+
+    Tabs are rebuilt every time they are opened; getting models from here keeps them loaded
+    across tab switches and lets the warm-up scheduler load them before they are needed.
+    Concurrent requests for the same key wait for a single load instead of loading twice.
+    """
+
+    def __init__(self):
+        self._entries: dict[object, ModelEntry] = {}
+        self._key_locks: dict[object, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key, loader, preload=False):
+        """
+        Loaded model for the key, loading it on first use
+
+        :param key: hashable model identity, e.g. ("yolo", weights, backend)
+        :param loader: callable returning the loaded (and warmed up) model
+        :param preload: True when called by the warm-up scheduler rather than a user action
+        """
+        with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry is None:
+                process = psutil.Process()
+                rss_before = process.memory_info().rss
+                start = time.perf_counter()
+                model = loader()
+                entry = ModelEntry(model, time.perf_counter() - start,
+                                   rss_bytes=max(0, process.memory_info().rss - rss_before),
+                                   preloaded=preload, loaded_at=time.time())
+                with self._lock:
+                    self._entries[key] = entry
+            return entry.model
+
+    def peek(self, key):
+        """Loaded model for the key, None if it is not loaded"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry.model if entry else None
+
+    def take_saved_seconds(self, key) -> float | None:
+        """
+        Load time saved by preloading, reported once per model
+
+        :return: seconds the first user of a preloaded model did not have to wait, None if
+            the model was not preloaded or the saving was already reported
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.preloaded or entry.claimed:
+                return None
+            entry.claimed = True
+            return entry.load_seconds
+
+    def unload(self, key) -> bool:
+        """
+        Drop a model from the registry and collect it
+
+        Tabs fetch their models from here on every use rather than keeping them, so the
+        memory is returned now and the model is loaded again when next needed.
+
+        :return: False if the model was not loaded
+        """
+        with self._key_lock(key), self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        del entry
+        gc.collect()
+        if "torch" in sys.modules and sys.modules["torch"].cuda.is_available():
+            sys.modules["torch"].cuda.empty_cache()
+        return True
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._entries)
+
+    def entries(self) -> list[tuple[object, ModelEntry]]:
+        """Snapshot of the loaded models, for monitoring"""
+        with self._lock:
+            return list(self._entries.items())
+
+
+# One registry per process, shared by all tabs
+registry = ModelRegistry()
@@ -0,0 +1,218 @@
+import csv
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+import psutil
+from Modules.Core.AppConfig import config_store
+from Modules.Core.AppPaths import app_data_path
+from Modules.Core.JobScheduler import job_scheduler
+from Modules.Core.ModelRegistry import registry
+
+# Rolled over metrics files kept next to the current one: metrics.1.csv, metrics.2.csv, ...
+METRICS_BACKUPS = 3
+METRICS_FIELDS = ("timestamp", "rss_mb", "cpu_percent", "threads", "busiest_thread", "busiest_thread_cpu",
+                  "models", "models_mb", "jobs_running", "jobs_queued", "throughput")
+
+
+def model_label(key) -> str:
+    """Readable name of a registry key, e.g. "yolo · yolov8n.pt · auto" """
+    parts = key if isinstance(key, tuple) else (key,)
+    return " · ".join(os.path.basename(str(part)) or str(part) for part in parts)
+
+
+def job_throughput(progress) -> tuple[float, str] | None:
+    """
+    Rate of a job from the progress it reported
+
+    :param progress: SortMetrics, DecodeStats or anything else passed to Job.report
+    :return: tuple (rate, unit), None if the progress carries no rate
+    """
+    if hasattr(progress, "images_per_second"):
+        return progress.images_per_second(), "img/s"
+    if hasattr(progress, "tokens_per_second"):
+        return progress.tokens_per_second, "tok/s"
+    return None
+
+
+@dataclass
+class ModelSample:
+    key: object
+    label: str
+    rss_bytes: int
+    load_seconds: float
+    preloaded: bool
+
+
+@dataclass
+class JobSample:
+    name: str
+    priority: str
+    status: str
+    paused: bool
+    runtime: float
+    done: int | None
+    total: int | None
+    rate: tuple[float, str] | None
+
+
+@dataclass
+class ResourceSample:
+    """Process resources, loaded models and jobs at one point in time"""
+    timestamp: float
+    rss_bytes: int
+    cpu_percent: float
+    threads: list[tuple[str, float]] = field(default_factory=list)  # (name, cpu %), busiest first
+    models: list[ModelSample] = field(default_factory=list)
+    jobs: list[JobSample] = field(default_factory=list)
+
+    @property
+    def models_bytes(self) -> int:
+        return sum(model.rss_bytes for model in self.models)
+
+    @property
+    def queued(self) -> int:
+        return sum(job.status == "queued" for job in self.jobs)
+
+    def csv_row(self) -> dict:
+        running = [job for job in self.jobs if job.status == "running"]
+        busiest = self.threads[0] if self.threads else ("", 0.0)
+        rates = [f"{job.name}={job.rate[0]:.2f} {job.rate[1]}" for job in running if job.rate]
+        return {
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(timespec="seconds"),
+            "rss_mb": f"{self.rss_bytes / 2 ** 20:.1f}",
+            "cpu_percent": f"{self.cpu_percent:.1f}",
+            "threads": len(self.threads),
+            "busiest_thread": busiest[0],
+            "busiest_thread_cpu": f"{busiest[1]:.1f}",
+            "models": len(self.models),
+            "models_mb": f"{self.models_bytes / 2 ** 20:.1f}",
+            "jobs_running": len(running),
+            "jobs_queued": self.queued,
+            "throughput": "; ".join(rates),
+        }
+
+
+class ResourceMonitor:
+    """
+    Samples the process in the background at a low rate
+
+    One sample costs a few psutil calls and a walk over the registry and the job list, so
+    the default interval of two seconds stays well below 1% of one core. CPU is computed
+    from the difference of CPU times between samples, per process and per thread. The
+    latest samples are kept for the monitor tab, which only reads them on the Tk thread;
+    with metrics export enabled each sample is also appended to a rolling CSV file.
+    """
+
+    def __init__(self, path=None, history=300):
+        """
+        :param path: metrics CSV file, defaults to metrics.csv in the app data folder
+        :param history: samples kept in memory
+        """
+        self.path = path or app_data_path("logs", "metrics.csv")
+        self.history = history
+        self.samples: list[ResourceSample] = []
+        self._process = psutil.Process()
+        self._last_times = None
+        self._last_threads = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start sampling on a daemon thread; does nothing if already running"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def latest(self) -> ResourceSample | None:
+        with self._lock:
+            return self.samples[-1] if self.samples else None
+
+    def _run(self):
+        while not self._stop.is_set():
+            settings = config_store.get().performance
+            try:
+                sample = self.sample()
+            except psutil.Error:
+                sample = None
+            if sample is not None:
+                with self._lock:
+                    self.samples.append(sample)
+                    del self.samples[:-self.history]
+                if settings.metrics_export:
+                    try:
+                        self.export(sample, int(settings.metrics_max_mb * 2 ** 20))
+                    except OSError:
+                        pass
+            self._stop.wait(settings.monitor_interval)
+
+    def sample(self) -> ResourceSample:
+        now = time.monotonic()
+        with self._process.oneshot():
+            rss = self._process.memory_info().rss
+            times = self._process.cpu_times()
+            threads = self._process.threads()
+
+        # CPU since the previous sample, as a percentage of one core
+        cpu_percent = 0.0
+        thread_percent = {}
+        if self._last_times is not None:
+            last_now, last_times = self._last_times
+            span = now - last_now
+            if span > 0:
+                cpu_percent = (times.user + times.system - last_times.user - last_times.system) / span * 100
+                for thread in threads:
+                    previous = self._last_threads.get(thread.id)
+                    if previous is not None:
+                        thread_percent[thread.id] = (thread.user_time + thread.system_time - previous) / span * 100
+        self._last_times = (now, times)
+        self._last_threads = {thread.id: thread.user_time + thread.system_time for thread in threads}
+
+        names = {thread.native_id: thread.name for thread in threading.enumerate()}
+        thread_loads = sorted(((names.get(thread.id, f"native-{thread.id}"), thread_percent.get(thread.id, 0.0))
+                               for thread in threads), key=lambda item: item[1], reverse=True)
+
+        models = [ModelSample(key, model_label(key), entry.rss_bytes, entry.load_seconds, entry.preloaded)
+                  for key, entry in registry.entries()]
+
+        jobs = []
+        for job in job_scheduler.jobs():
+            progress = job.progress
+            jobs.append(JobSample(
+                name=job.name,
+                priority=job.priority.name.lower(),
+                status=job.status,
+                paused=job.paused,
+                runtime=time.time() - job.started_at if job.started_at else 0.0,
+                done=getattr(progress, "processed", None),
+                total=getattr(progress, "total", None),
+                rate=job_throughput(progress) if progress is not None else None,
+            ))
+
+        return ResourceSample(time.time(), rss, cpu_percent, thread_loads, models, jobs)
+
+    def export(self, sample: ResourceSample, max_bytes: int):
+        """Append a sample to the metrics file, rolling it over once it exceeds max_bytes"""
+        if self.path.exists() and self.path.stat().st_size >= max_bytes:
+            for index in range(METRICS_BACKUPS - 1, 0, -1):
+                older = self.path.with_suffix(f".{index}.csv")
+                if older.exists():
+                    os.replace(older, self.path.with_suffix(f".{index + 1}.csv"))
+            os.replace(self.path, self.path.with_suffix(".1.csv"))
+
+        new_file = not self.path.exists()
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=METRICS_FIELDS)
+            if new_file:
+                writer.writeheader()
+            writer.writerow(sample.csv_row())
+
+
+# One monitor per process, started by the main window
+resource_monitor = ResourceMonitor()
@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+from Modules.Core.AppConfig import config_store
+from Modules.Core.AppPaths import app_data_path
+from Modules.Core.JobScheduler import Priority, current_job, job_scheduler
+
+# Seconds between checks whether the user's work has finished
+IDLE_POLL_S = 0.5
+
+class WarmupScheduler:
+    """
+    Preloads the models the user is likely to need, in the background after start-up
+
+    Every model use is recorded in a small JSON file. On start, models used recently are
+    loaded and warmed up one after another, most used first, as one background job, so the
+    Tk main loop never waits. Each load waits until no interactive or bulk job runs, so
+    preloading only uses otherwise idle time. The time a tab saves this way is reported by the model
+    registry when it first gets the model.
+    """
+
+    def __init__(self, path=None, recent_days=None):
+        """
+        :param recent_days: preload models used within this many days, None to follow the performance settings
+        """
+        self.path = path or app_data_path("model_usage.json")
+        self.recent_days = recent_days
+        self.tasks = {}
+        self.warmed = {}
+        self._lock = threading.Lock()
+        self._job = None
+
+    def register(self, name: str, preload):
+        """
+        :param name: model kind, as passed to record_use
+        :param preload: callable receiving the params of the last use and loading the model
+        """
+        self.tasks[name] = preload
+
+    def load_usage(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def record_use(self, name: str, **params):
+        """
+        Remember that a model was used, with the parameters needed to preload it
+
+        :param name: model kind, e.g. "chat" or "yolo"
+        """
+        with self._lock:
+            usage = self.load_usage()
+            entry = usage.setdefault(name, {"count": 0})
+            entry["count"] += 1
+            entry["last_used"] = time.time()
+            entry["params"] = params
+            self.path.write_text(json.dumps(usage, indent=2), encoding="utf-8")
+
+    def plan(self) -> list[tuple[str, dict]]:
+        """Registered models used recently, most used first, with the params of their last use"""
+        recent_days = self.recent_days or config_store.get().performance.warmup_recent_days
+        cutoff = time.time() - recent_days * 86400
+        recent = [(name, entry) for name, entry in self.load_usage().items()
+                  if name in self.tasks and entry.get("last_used", 0) >= cutoff]
+        recent.sort(key=lambda item: item[1].get("count", 0), reverse=True)
+        return [(name, entry.get("params", {})) for name, entry in recent]
+
+    def start(self):
+        """Start preloading in the background; does nothing if already started or disabled in the settings"""
+        if self._job is None and config_store.get().performance.warmup:
+            self._job = job_scheduler.submit("Preload models", self._run, priority=Priority.BACKGROUND)
+
+    @staticmethod
+    def user_busy() -> bool:
+        """Whether interactive or bulk work is running or queued; user-paused jobs do not count"""
+        return any(job.priority != Priority.BACKGROUND and not job.user_paused for job in job_scheduler.jobs())
+
+    def _run(self):
+        job = current_job()
+        for name, params in self.plan():
+            while self.user_busy() and not job.cancelled:
+                time.sleep(IDLE_POLL_S)
+            if job.cancelled:
+                return
+            start = time.perf_counter()
+            try:
+                self.tasks[name](params)
+            except Exception:
+                # The tab loads the model again on first use and reports the error there
+                continue
+            self.warmed[name] = time.perf_counter() - start
+
+
+# One scheduler per process, started by the main window
+warmup_scheduler = WarmupScheduler()
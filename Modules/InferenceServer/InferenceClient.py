@@ -0,0 +1,197 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from Modules.Core.AppConfig import config_store
+from Modules.Core.AppPaths import app_data_path
+from .InferenceServer import CHAT_SETTINGS, DEFAULT_HOST, DEFAULT_PORT, TOKEN_HEADER, server_token
+
+# Set to 1 (or pass --shared-models to app.py) to use the shared inference server regardless of the settings
+SHARED_MODELS_ENV = "DAILY_ASSISTANT_SHARED_MODELS"
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def shared_models_enabled() -> bool:
+    if os.environ.get(SHARED_MODELS_ENV, "") not in ("", "0"):
+        return True
+    return config_store.get().performance.shared_models
+
+
+class InferenceClient:
+    """HTTP client of the local inference server"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=300.0):
+        self.base_url = f"http://{host}:{port}"
+        self.port = port
+        self.timeout = timeout
+        self.token = server_token()
+
+    def request(self, path: str, payload=None, body: bytes | None = None, timeout=None) -> dict:
+        """
+        Call one route and return its JSON answer
+
+        :param payload: JSON request body
+        :param body: raw request body, used instead of payload
+        :raises OSError: if the server cannot be reached
+        :raises PermissionError: if the server rejects the token, e.g. it belongs to another user
+        :raises RuntimeError: if the server reports an error
+        """
+        if payload is not None:
+            body = json.dumps(payload).encode()
+        request = urllib.request.Request(self.base_url + path, data=body,
+                                         headers={"Content-Type": "application/octet-stream",
+                                                  TOKEN_HEADER: self.token})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code == 403:
+                raise PermissionError(f"{self.base_url} is not this user's inference server") from None
+            raise RuntimeError(json.loads(e.read()).get("error", str(e))) from None
+
+    def health(self) -> dict | None:
+        """
+        Server status, None if no server is listening
+
+        :raises PermissionError: if the port is served by another user's server
+        """
+        try:
+            return self.request("/health", timeout=2)
+        except PermissionError:
+            raise
+        except OSError:
+            return None
+
+    @staticmethod
+    def server_command(port: int) -> list[str]:
+        """Command line starting the server; the frozen app starts it through its own executable"""
+        if getattr(sys, "frozen", False):
+            return [sys.executable, "--inference-server", "--port", str(port)]
+        return [sys.executable, "-m", "Modules.InferenceServer.InferenceServer", "--port", str(port)]
+
+    def ensure_server(self, wait=30.0) -> dict:
+        """
+        Start the server in the background if none is running and wait for it
+
+        :param wait: seconds to wait for a freshly started server
+        :return: server status
+        :raises OSError: if the server did not come up or the port belongs to another user
+        """
+        status = self.health()
+        if status is not None:
+            return status
+
+        # Detach the server so it outlives the window that started it
+        if os.name == "nt":
+            options = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            options = {"start_new_session": True}
+        with open(app_data_path("logs", "inference_server.log"), "ab") as log:
+            subprocess.Popen(self.server_command(self.port), cwd=REPO_ROOT, stdin=subprocess.DEVNULL,
+                             stdout=log, stderr=subprocess.STDOUT, **options)
+
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(0.25)
+            status = self.health()
+            if status is not None:
+                return status
+        raise OSError(f"Inference server did not start on {self.base_url}")
+
+
+def connect_inference_server() -> InferenceClient | None:
+    """Client of a running (or freshly started) server if shared models are enabled, else None"""
+    if not shared_models_enabled():
+        return None
+    client = InferenceClient()
+    try:
+        client.ensure_server()
+    except OSError:
+        return None
+    return client
+
+
+class RemoteChatEngine:
+    """
+    ChatEngine stand-in that generates on the inference server
+
+    Has the same settings attributes and methods as ChatEngine, so ChatBotTab and the
+    response cache do not need to know where the model runs.
+    """
+
+    def __init__(self, client: InferenceClient, engine):
+        """
+        :param engine: unloaded ChatEngine whose settings are sent with every request
+        """
+        self.client = client
+        self._engine = engine
+        self.device = None
+
+    def __getattr__(self, name):
+        return getattr(self._engine, name)
+
+    def __setattr__(self, name, value):
+        if name in CHAT_SETTINGS:
+            setattr(self._engine, name, value)
+        else:
+            super().__setattr__(name, value)
+
+    @property
+    def loaded(self) -> bool:
+        return self.device is not None
+
+    def load(self) -> str:
+        """Make sure the server runs and has the model loaded"""
+        self.client.ensure_server()
+        self.encode("")
+        self.device = "shared server"
+        return self.device
+
+    def encode(self, text: str) -> list[int]:
+        return self.client.request("/encode", {"model": self.model_name, "text": text})["token_ids"]
+
+    def generate(self, input_ids: list[int]):
+        from Modules.ChatBotTab.ChatEngine import ChatReply
+        from Modules.ChatBotTab.PromptLookupDecoder import DecodeStats
+
+        answer = self.client.request("/chat", {
+            "model": self.model_name,
+            "input_ids": input_ids,
+            "settings": {name: getattr(self._engine, name) for name in CHAT_SETTINGS},
+        })
+        return ChatReply(answer["text"], answer["token_ids"], DecodeStats(**answer["stats"]))
+
+
+class RemoteYoloBackend:
+    """YoloBackend stand-in that detects on the inference server; frames are letterboxed before sending"""
+
+    def __init__(self, client: InferenceClient, weights_path, backend="auto", imgsz=640):
+        self.client = client
+        self.weights_path = Path(weights_path).resolve()
+        self.backend = backend
+        self.imgsz = imgsz
+        self.num_threads = "shared"
+        self.active_backend = None
+
+    def load(self, log=print) -> str:
+        self.client.ensure_server()
+        self.detect([])
+        return self.active_backend
+
+    def detect(self, frames: list) -> list[list[tuple[int, float]]]:
+        import numpy as np
+        from urllib.parse import urlencode
+        from Modules.SortPituresTab.YoloBackend import letterbox
+
+        size = self.imgsz
+        blob = np.stack([frame if frame.shape[:2] == (size, size) else letterbox(frame, size) for frame in frames]) \
+            if frames else np.empty((0, size, size, 3), dtype=np.uint8)
+        query = urlencode({"weights": str(self.weights_path), "backend": self.backend,
+                           "count": len(frames), "size": size})
+        answer = self.client.request(f"/detect?{query}", body=np.ascontiguousarray(blob).tobytes())
+        self.active_backend = f"{answer['backend']} (shared)"
+        return [[(int(class_id), float(conf)) for class_id, conf in frame] for frame in answer["detections"]]
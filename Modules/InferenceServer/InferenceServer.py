@@ -0,0 +1,268 @@
+"""
+Local inference server shared by all Daily Assistant windows
+
+Loads every model once and serves chat generation and YOLO detection over HTTP on
+localhost, so several app instances on one machine (e.g. users of a terminal server) share
+a single copy of each model. Started on demand by InferenceClient; stops by itself after
+being idle.
+
+Every user runs their own server on a port derived from their user id, so several users of
+one machine each get a shared server for their windows. Every request must carry the
+per-user token from the app data folder, so other users cannot make the server load (and
+unpickle) files of their choosing.
+
+Usage (from the repository root):
+    python -m Modules.InferenceServer.InferenceServer [--port <port>] [--idle-timeout 1800]
+"""
+import argparse
+import getpass
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+import zlib
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from Modules.Core.AppPaths import app_data_path
+
+DEFAULT_HOST = "127.0.0.1"
+# Per-user ports are picked below the ephemeral port ranges of Linux and Windows
+USER_PORT_BASE = 10000
+USER_PORT_RANGE = 20000
+# Generation settings a client may override per request
+CHAT_SETTINGS = ("max_length", "do_sample", "top_k", "top_p", "temperature", "no_repeat_ngram_size",
+                 "prompt_lookup", "lookup_ngram_size", "lookup_max_draft")
+TOKEN_HEADER = "X-Daily-Assistant-Token"
+
+
+def user_port() -> int:
+    """Port of the calling user's server, from the uid (a hash of the user name on Windows)"""
+    if hasattr(os, "getuid"):
+        key = os.getuid()
+    else:
+        key = zlib.crc32(getpass.getuser().encode())
+    return USER_PORT_BASE + key % USER_PORT_RANGE
+
+
+DEFAULT_PORT = user_port()
+
+
+def server_token() -> str:
+    """
+    Secret shared by the server and the windows of one user, created on first use
+
+    The token file is only readable by its owner, which is what keeps other users out.
+    """
+    path = app_data_path("inference_server.token")
+    try:
+        descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another window may be writing it right now
+        for _ in range(20):
+            token = path.read_text(encoding="utf-8").strip()
+            if token:
+                return token
+            time.sleep(0.05)
+        # Left empty by a crash; an empty token must never match
+        descriptor = os.open(path, os.O_WRONLY | os.O_TRUNC, 0o600)
+    token = secrets.token_hex(32)
+    with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+        file.write(token)
+    return token
+
+
+class HostedModel:
+    """One served model; its lock is held while the model loads and while a request uses it"""
+
+    def __init__(self):
+        self.model = None
+        self.lock = threading.Lock()
+
+
+class ModelHost:
+    """Lazily loaded models, one per name or weights/backend pair, each used by one request at a time"""
+
+    def __init__(self):
+        self._chat: dict[str, HostedModel] = {}
+        self._yolo: dict[tuple, HostedModel] = {}
+        # Only guards adding entries, so a slow load never blocks other models or /health
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.last_request = time.monotonic()
+
+    def _get(self, models: dict, key, factory):
+        with self._lock:
+            entry = models.setdefault(key, HostedModel())
+        with entry.lock:
+            # A failed load leaves the entry empty so the next request tries again
+            if entry.model is None:
+                entry.model = factory()
+        return entry.model, entry.lock
+
+    def chat_engine(self, model_name: str):
+        """Loaded ChatEngine and the lock serializing its use"""
+        from Modules.ChatBotTab.ChatEngine import ChatEngine
+
+        def load():
+            engine = ChatEngine(model_name)
+            engine.load()
+            engine.warm_up()
+            return engine
+
+        return self._get(self._chat, model_name, load)
+
+    def yolo_backend(self, weights_path: str, backend: str):
+        """Loaded YoloBackend and the lock serializing its use"""
+        from Modules.SortPituresTab.YoloBackend import YoloBackend
+
+        def load():
+            yolo = YoloBackend(weights_path, backend=backend)
+            yolo.load(log=lambda message: None)
+            yolo.warm_up()
+            return yolo
+
+        return self._get(self._yolo, (weights_path, backend), load)
+
+    def describe(self) -> dict:
+        """Loaded models for /health; models still loading are left out"""
+        chat, yolo = list(self._chat.items()), list(self._yolo.items())
+        return {
+            "chat": [name for name, entry in chat if entry.model is not None],
+            "yolo": [{"weights": weights, "backend": backend, "active": entry.model.active_backend}
+                     for (weights, backend), entry in yolo if entry.model is not None],
+        }
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        GET  /health  - server status and loaded models
+        POST /encode  - {"model", "text"} -> {"token_ids"}
+        POST /chat    - {"model", "input_ids", "settings"} -> {"text", "token_ids", "stats"}
+        POST /detect?weights=..&backend=..&count=..&size=.. - raw uint8 letterboxed frames
+                        -> {"backend", "detections": [[[class_id, confidence], ...], ...]}
+    """
+
+    server_version = "DailyAssistantInference/1.0"
+
+    @property
+    def host(self) -> ModelHost:
+        return self.server.host
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload: dict, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def authorized(self) -> bool:
+        """Check the request token, answering 403 if it is missing or wrong"""
+        if hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), self.server.token):
+            return True
+        self.send_json({"error": "invalid inference server token"}, 403)
+        return False
+
+    def do_GET(self):
+        if not self.authorized():
+            return
+        if urlparse(self.path).path != "/health":
+            self.send_json({"error": "not found"}, 404)
+            return
+        self.send_json({"status": "ok", "pid": os.getpid(), "models": self.host.describe(),
+                        "requests": self.host.requests})
+
+    def do_POST(self):
+        if not self.authorized():
+            return
+        self.host.requests += 1
+        self.host.last_request = time.monotonic()
+        url = urlparse(self.path)
+        routes = {"/encode": self.encode, "/chat": self.chat, "/detect": self.detect}
+        if url.path not in routes:
+            self.send_json({"error": "not found"}, 404)
+            return
+        try:
+            self.send_json(routes[url.path](url))
+        except Exception as e:
+            self.send_json({"error": str(e)}, 500)
+
+    def encode(self, url) -> dict:
+        request = json.loads(self.read_body())
+        engine, _ = self.host.chat_engine(request["model"])
+        return {"token_ids": engine.encode(request["text"])}
+
+    def chat(self, url) -> dict:
+        request = json.loads(self.read_body())
+        engine, lock = self.host.chat_engine(request["model"])
+        with lock:
+            for name, value in request.get("settings", {}).items():
+                if name in CHAT_SETTINGS:
+                    setattr(engine, name, value)
+            reply = engine.generate(request["input_ids"])
+        return {"text": reply.text, "token_ids": reply.token_ids, "stats": asdict(reply.stats)}
+
+    def detect(self, url) -> dict:
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        count, size = int(query["count"]), int(query["size"])
+        frames = np.frombuffer(self.read_body(), dtype=np.uint8).reshape(count, size, size, 3)
+
+        yolo, lock = self.host.yolo_backend(query["weights"], query.get("backend", "auto"))
+        if yolo.imgsz != size:
+            raise ValueError(f"frames must be {yolo.imgsz}x{yolo.imgsz}, got {size}x{size}")
+        if not count:
+            return {"backend": yolo.active_backend, "detections": []}
+        with lock:
+            detections = yolo.detect(list(frames))
+        return {"backend": yolo.active_backend, "detections": detections}
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, idle_timeout=1800.0):
+    """
+    Run the server until it has been idle for `idle_timeout` seconds
+
+    :param idle_timeout: seconds without requests before shutting down, 0 to run forever
+    """
+    server = ThreadingHTTPServer((host, port), InferenceHandler)
+    server.daemon_threads = True
+    server.host = ModelHost()
+    server.token = server_token()
+
+    if idle_timeout:
+        def watch_idle():
+            while time.monotonic() - server.host.last_request < idle_timeout:
+                time.sleep(min(idle_timeout, 30))
+            server.shutdown()
+
+        threading.Thread(target=watch_idle, daemon=True).start()
+
+    print(f"Inference server listening on http://{host}:{port} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve chat and detection models to Daily Assistant windows")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=float, default=1800.0,
+                        help="seconds without requests before the server exits, 0 to run forever")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.idle_timeout)
+
+
+if __name__ == "__main__":
+    main()
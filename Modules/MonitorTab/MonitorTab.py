@@ -0,0 +1,173 @@
+import tkinter as tk
+import customtkinter as ctk
+from Modules.Core.AppConfig import config_store
+from Modules.Core.ModelRegistry import registry
+from Modules.Core.ResourceMonitor import ResourceSample, resource_monitor
+
+# Threads listed, busiest first
+TOP_THREADS = 8
+
+
+class MonitorTab:
+    """Tab showing memory, CPU, loaded models and running jobs of the app"""
+
+    def __init__(self, parent_frame):
+        self.parent_frame = parent_frame
+        self.model_keys = None
+        self.create_widgets()
+        resource_monitor.start()
+        self.refresh()
+
+    def create_widgets(self):
+        # Main container
+        self.main_container = ctk.CTkFrame(self.parent_frame, fg_color="transparent")
+        self.main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        self.summary_label = ctk.CTkLabel(
+            self.main_container,
+            text="⏳ Collecting the first samples...",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            anchor="w"
+        )
+        self.summary_label.pack(fill=tk.X, pady=(0, 5))
+
+        self.export_label = ctk.CTkLabel(
+            self.main_container,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=("gray40", "gray60"),
+            anchor="w"
+        )
+        self.export_label.pack(fill=tk.X, pady=(0, 15))
+
+        # Loaded models, each with an unload button
+        models_frame = ctk.CTkFrame(self.main_container)
+        models_frame.pack(fill=tk.X, pady=(0, 15))
+
+        models_label = ctk.CTkLabel(
+            models_frame,
+            text="Loaded Models:",
+            font=ctk.CTkFont(size=12, weight="bold"),
+            anchor="w"
+        )
+        models_label.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        self.models_list = ctk.CTkFrame(models_frame, fg_color="transparent")
+        self.models_list.pack(fill=tk.X, padx=10, pady=(0, 5))
+
+        self.models_status = ctk.CTkLabel(
+            models_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=("gray40", "gray60"),
+            anchor="w"
+        )
+        self.models_status.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+        # Jobs and threads side by side
+        lists_frame = ctk.CTkFrame(self.main_container, fg_color="transparent")
+        lists_frame.pack(fill=tk.BOTH, expand=True)
+        lists_frame.columnconfigure((0, 1), weight=1, uniform="column")
+        lists_frame.rowconfigure(0, weight=1)
+
+        self.jobs_text = self.create_list(lists_frame, "Jobs:", 0)
+        self.threads_text = self.create_list(lists_frame, "Threads (CPU % of one core):", 1)
+
+    @staticmethod
+    def create_list(parent, title, column):
+        """Read-only text box with a title in one column of the parent grid"""
+        frame = ctk.CTkFrame(parent)
+        frame.grid(row=0, column=column, sticky="nsew", padx=(0, 10) if column == 0 else 0)
+
+        label = ctk.CTkLabel(frame, text=title, font=ctk.CTkFont(size=12, weight="bold"), anchor="w")
+        label.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        text = ctk.CTkTextbox(frame, height=200)
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        text.configure(state="disabled")
+        return text
+
+    def refresh(self):
+        """Show the latest sample and schedule the next refresh while the tab is open"""
+        if not self.main_container.winfo_exists():
+            return
+        sample = resource_monitor.latest()
+        if sample is not None:
+            self.show_sample(sample)
+
+        settings = config_store.get().performance
+        if settings.metrics_export:
+            self.export_label.configure(text=f"📝 Writing metrics to {resource_monitor.path}")
+        else:
+            self.export_label.configure(text="Metrics export is off (Settings → Performance)")
+        self.parent_frame.after(int(settings.monitor_interval * 1000), self.refresh)
+
+    def show_sample(self, sample: ResourceSample):
+        running = sum(job.status == "running" for job in sample.jobs)
+        self.summary_label.configure(
+            text=f"Memory {sample.rss_bytes / 2 ** 20:.0f} MB  |  CPU {sample.cpu_percent:.0f}%  |  "
+                 f"{len(sample.threads)} threads  |  {len(sample.models)} models "
+                 f"({sample.models_bytes / 2 ** 20:.0f} MB)  |  {running} jobs running, {sample.queued} queued"
+        )
+
+        # Rebuild the model rows only when the set of models changed, so buttons stay clickable
+        keys = [model.key for model in sample.models]
+        if keys != self.model_keys:
+            self.model_keys = keys
+            self.show_models(sample)
+
+        jobs = []
+        for job in sample.jobs:
+            line = f"{job.name} [{job.priority}] {'paused' if job.paused else job.status}, {job.runtime:.0f}s"
+            if job.total:
+                line += f", {job.done}/{job.total}"
+            if job.rate:
+                line += f", {job.rate[0]:.1f} {job.rate[1]}"
+            jobs.append(line)
+        self.set_text(self.jobs_text, jobs or ["No jobs running"])
+
+        self.set_text(self.threads_text, [f"{cpu:5.1f}%  {name}" for name, cpu in sample.threads[:TOP_THREADS]])
+
+    def show_models(self, sample: ResourceSample):
+        for widget in self.models_list.winfo_children():
+            widget.destroy()
+
+        if not sample.models:
+            empty_label = ctk.CTkLabel(self.models_list, text="No models loaded", anchor="w")
+            empty_label.pack(fill=tk.X)
+            return
+
+        for model in sample.models:
+            row = ctk.CTkFrame(self.models_list, fg_color="transparent")
+            row.pack(fill=tk.X, pady=2)
+
+            text = f"{model.label}  —  ~{model.rss_bytes / 2 ** 20:.0f} MB, loaded in {model.load_seconds:.1f}s"
+            if model.preloaded:
+                text += " (preloaded)"
+            label = ctk.CTkLabel(row, text=text, font=ctk.CTkFont(size=12), anchor="w")
+            label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+            unload_button = ctk.CTkButton(
+                row,
+                text="Unload",
+                width=90,
+                height=28,
+                fg_color="gray40",
+                hover_color="gray30",
+                command=lambda key=model.key, name=model.label: self.unload(key, name)
+            )
+            unload_button.pack(side=tk.RIGHT)
+
+    def unload(self, key, name):
+        """Drop a model from memory; the tab using it loads it again when needed"""
+        if registry.unload(key):
+            self.models_status.configure(text=f"✅ Unloaded {name}; it is loaded again when next used")
+        else:
+            self.models_status.configure(text=f"⚠️ {name} was already unloaded")
+
+    @staticmethod
+    def set_text(textbox, lines):
+        textbox.configure(state="normal")
+        textbox.delete("1.0", tk.END)
+        textbox.insert("1.0", "\n".join(lines))
+        textbox.configure(state="disabled")
@@ -0,0 +1,66 @@
+import inspect
+from typing import Protocol
+
+# Detection result of one frame: (counts per class name, best person confidence or None)
+Detection = tuple[dict[str, int], float | None]
+
+# Detector classes keyed by the value of their radio button, in the order they are shown
+DETECTORS: dict[str, type] = {}
+
+
+class Detector(Protocol):
+    """
+    A people/object detector the sorter can run
+
+    Implementations register themselves with @register_detector and are built by
+    create_detector, so adding one needs no change to the sorting loop or the tab.
+    """
+
+    # Radio button text
+    label: str
+    # Name of the option holding the model file, None if nothing has to be provided
+    model_option: str | None
+    # Whether several frames per detect() call are faster than one at a time
+    batched: bool
+    # False if only people (faces) are found, so routing rules on other classes never match
+    finds_objects: bool
+    # Side of the square frames are letterboxed to when decoding in worker processes; None
+    # if the detector needs frames at their native resolution, so they are decoded in-process
+    frame_size: int | None
+
+    def load(self, log=print) -> str:
+        """
+        Load the model, reusing an already loaded one
+
+        :return: short description of what runs, e.g. "onnx, 4 threads"
+        """
+
+    def detect(self, frames: list) -> list[Detection]:
+        """
+        :param frames: BGR images
+        :return: one Detection per frame, in order
+        """
+
+
+def register_detector(key: str):
+    """Class decorator adding a detector to DETECTORS under its radio button value"""
+    def register(cls):
+        DETECTORS[key] = cls
+        return cls
+    return register
+
+
+def create_detector(method: str, **options) -> Detector:
+    """
+    Build the detector registered for a method
+
+    :param options: every detection setting of the sorter; each detector takes the ones
+        its constructor declares
+    :raises ValueError: for an unknown method
+    """
+    try:
+        cls = DETECTORS[method]
+    except KeyError:
+        raise ValueError(f"Unknown detection method: {method}") from None
+    accepted = inspect.signature(cls).parameters
+    return cls(**{name: value for name, value in options.items() if name in accepted})
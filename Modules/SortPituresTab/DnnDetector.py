@@ -0,0 +1,123 @@
+from pathlib import Path
+import cv2
+import numpy as np
+from Modules.Core.ModelRegistry import registry
+from .Detector import Detection, register_detector
+
+DEFAULT_DNN_MODEL = '../../face_detection_yunet_2023mar.onnx'
+# Longest side frames are scaled down to before YuNet runs; also the worker decode size
+DNN_FRAME_SIZE = 640
+# Input of the res10 SSD face model and the mean subtracted from its input
+SSD_INPUT_SIZE = (300, 300)
+SSD_MEAN = (104.0, 177.0, 123.0)
+
+
+def dnn_model_key(model_path=DEFAULT_DNN_MODEL) -> tuple:
+    return "dnn", str(Path(model_path).resolve())
+
+
+@register_detector("dnn")
+class DnnDetector:
+    """
+    OpenCV DNN face detector, between Haar and YOLO in speed and accuracy
+
+    Takes either a YuNet model (.onnx, run through cv2.FaceDetectorYN) or the res10 SSD
+    face model (.caffemodel, with <model name>.prototxt or deploy.prototxt next to it).
+    Neither needs anything besides OpenCV. Faces are reported as "person".
+    """
+
+    label = "OpenCV DNN (Balanced)"
+    model_option = "dnn_model_path"
+    finds_objects = False
+    frame_size = DNN_FRAME_SIZE
+
+    def __init__(self, dnn_model_path=DEFAULT_DNN_MODEL, dnn_score_threshold=0.6):
+        """
+        :param dnn_model_path: YuNet .onnx or SSD .caffemodel file
+        :param dnn_score_threshold: lowest confidence counted as a face
+        """
+        self.model_path = Path(dnn_model_path)
+        self.score_threshold = dnn_score_threshold
+        self.is_ssd = self.model_path.suffix.lower() == ".caffemodel"
+        self.loaded = False
+
+    @property
+    def model_key(self) -> tuple:
+        return *dnn_model_key(self.model_path), self.score_threshold
+
+    @property
+    def model(self):
+        """
+        Loaded network, None before load()
+
+        Fetched from the registry on every use, so a model unloaded from the Monitor tab is
+        freed and loaded again when needed.
+        """
+        return registry.get(self.model_key, self._load_model) if self.loaded else None
+
+    @property
+    def batched(self) -> bool:
+        # The SSD takes a whole batch in one forward pass, YuNet one frame at a time
+        return self.is_ssd
+
+    def prototxt_path(self) -> Path:
+        """
+        Deploy file of the SSD model: <model name>.prototxt, else the standard deploy.prototxt
+
+        :raises FileNotFoundError: if neither is next to the model
+        """
+        candidates = [self.model_path.with_suffix(".prototxt"), self.model_path.parent / "deploy.prototxt"]
+        for candidate in candidates:
+            if candidate.exists():
+                return candidate
+        raise FileNotFoundError(f"No deploy file for {self.model_path.name}, expected "
+                                f"{' or '.join(candidate.name for candidate in candidates)} next to it")
+
+    def _load_model(self):
+        if not self.model_path.exists():
+            raise FileNotFoundError(f"DNN model not found: {self.model_path}")
+        if self.is_ssd:
+            return cv2.dnn.readNetFromCaffe(str(self.prototxt_path()), str(self.model_path))
+        return cv2.FaceDetectorYN.create(str(self.model_path), "", (DNN_FRAME_SIZE, DNN_FRAME_SIZE),
+                                         score_threshold=self.score_threshold)
+
+    def load(self, log=print) -> str:
+        if registry.peek(self.model_key) is None:
+            registry.get(self.model_key, self._load_model)
+            log(f"DNN face model loaded ({self.model_path.name})")
+        self.loaded = True
+        return "SSD" if self.is_ssd else "YuNet"
+
+    def detect(self, frames: list) -> list[Detection]:
+        if self.is_ssd:
+            return self._detect_ssd(frames)
+
+        model = self.model
+        results = []
+        for img in frames:
+            h, w = img.shape[:2]
+            scale = min(1.0, DNN_FRAME_SIZE / max(h, w))
+            if scale < 1.0:
+                img = cv2.resize(img, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+            model.setInputSize((img.shape[1], img.shape[0]))
+            _, faces = model.detect(img)
+            if faces is None or not len(faces):
+                results.append(({}, None))
+            else:
+                # The last column of every row is the face score
+                results.append(({"person": len(faces)}, float(faces[:, -1].max())))
+        return results
+
+    def _detect_ssd(self, frames: list) -> list[Detection]:
+        blob = cv2.dnn.blobFromImages(frames, 1.0, SSD_INPUT_SIZE, SSD_MEAN)
+        model = self.model
+        model.setInput(blob)
+        # Rows of (image index, class, confidence, x1, y1, x2, y2)
+        detections = model.forward().reshape(-1, 7)
+        detections = detections[detections[:, 2] >= self.score_threshold]
+
+        results = []
+        for index in range(len(frames)):
+            scores = detections[detections[:, 0] == index, 2]
+            results.append(({"person": len(scores)}, float(np.max(scores))) if len(scores) else ({}, None))
+        return results
@@ -0,0 +1,275 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+# inotify event flags, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+# Longest wait between checks of the stop condition
+MAX_WAIT = 1.0
+
+
+class InotifySource:
+    """
+    Change notifications from the Linux kernel
+
+    Only completed writes and files moved into the folder are reported, which is how sync
+    clients deliver files, so the watcher sleeps in select() while nothing arrives. Renames
+    within the folder are paired by their cookie and listed in `moves`.
+    """
+
+    mode = "inotify"
+
+    def __init__(self, folder: Path):
+        # Set once the kernel dropped the watch, e.g. the folder was deleted or unmounted
+        self.removed = False
+        # New path -> old name of the files renamed within the folder in the last wait()
+        self.moves: dict[Path, str] = {}
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.folder = folder
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"Cannot watch {folder}")
+
+    def wait(self, timeout: float) -> list[Path] | None:
+        """
+        :return: paths that changed, None if events were lost or the watch was removed and
+            the folder must be rescanned
+        """
+        self.moves = {}
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths = []
+        moved_from = {}
+        offset = 0
+        while offset < len(data):
+            _, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_IGNORED:
+                self.removed = True
+                return None
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_MOVED_FROM:
+                moved_from[cookie] = os.fsdecode(name)
+            elif name:
+                path = self.folder / os.fsdecode(name)
+                if mask & IN_MOVED_TO and cookie in moved_from:
+                    self.moves[path] = moved_from.pop(cookie)
+                paths.append(path)
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingSource:
+    """Fallback for other platforms and file systems without inotify: rescan at a fixed interval"""
+
+    mode = "polling"
+    removed = False
+
+    def __init__(self, folder: Path, interval: float):
+        # Renames are only found by comparing rescans
+        self.moves: dict[Path, str] = {}
+        self.folder = folder
+        self.interval = interval
+        self._next = time.monotonic() + interval
+
+    def wait(self, timeout: float) -> list[Path] | None:
+        delay = self._next - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return []
+        time.sleep(max(0.0, delay))
+        self._next = time.monotonic() + self.interval
+        return None
+
+    def close(self):
+        pass
+
+
+class FolderWatcher:
+    """
+    Reports files as they arrive in a folder, once they are completely written
+
+    A file counts as complete once its size and modification time have not changed for
+    `settle` seconds, which also covers clients that write a file in several sessions.
+    Files already in the folder when watching starts are left alone, also when they are
+    renamed or moved within it later: inotify pairs the two names of a rename, a rescan takes
+    a new name for a rename if a known file with the same size and modification time is gone.
+    Copies of known files are new files and are reported. If the inotify watch is removed
+    (the folder was deleted or unmounted), watching continues by polling; if the folder is
+    gone, the next rescan raises OSError.
+    """
+
+    def __init__(self, folder, extensions, settle=2.0, poll_interval=2.0, batch_size=16, use_inotify=True,
+                 log=print):
+        """
+        :param extensions: lower-case suffixes of the files to report, e.g. {".jpg"}
+        :param settle: seconds a file must stay unchanged before it is reported
+        :param poll_interval: seconds between rescans when inotify is unavailable
+        :param batch_size: most files reported at once
+        :param log: callable receiving status messages
+        """
+        self.folder = Path(folder)
+        self.extensions = extensions
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.log = log
+        # name -> (size, mtime) of every file seen so far, reported or present at start
+        self.known: dict[str, tuple | None] = {}
+        # (size, mtime) -> names in known; a rename keeps both, which finds the old name
+        self.known_signatures: dict[tuple, set[str]] = {}
+        for path, signature in self._scan():
+            self._remember(path.name, signature)
+        self.pending: dict[Path, tuple[tuple, float]] = {}
+
+        self.source = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self.source = InotifySource(self.folder)
+            except OSError:
+                self.source = None
+        if self.source is None:
+            self.source = PollingSource(self.folder, poll_interval)
+
+    @property
+    def mode(self) -> str:
+        return self.source.mode
+
+    def _wanted(self, path: Path) -> bool:
+        # Sync clients and copy_to write to hidden temporary names first
+        return path.suffix.lower() in self.extensions and not path.name.startswith(".")
+
+    @staticmethod
+    def _signature(path: Path) -> tuple | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _scan(self):
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                path = Path(entry.path)
+                if entry.is_file() and self._wanted(path):
+                    yield path, self._signature(path)
+
+    def _remember(self, name: str, signature: tuple | None):
+        self._forget(name)
+        self.known[name] = signature
+        if signature is not None:
+            self.known_signatures.setdefault(signature, set()).add(name)
+
+    def _forget(self, name: str):
+        signature = self.known.pop(name, None)
+        names = self.known_signatures.get(signature)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self.known_signatures[signature]
+
+    def _renamed_from(self, path: Path, signature: tuple | None) -> str | None:
+        """Known name the file was renamed from: same size and mtime, and no longer in the folder"""
+        for name in self.known_signatures.get(signature, ()):
+            if name != path.name and not (self.folder / name).exists():
+                return name
+        return None
+
+    def _note(self, path: Path, now: float):
+        """Start or restart the settle timer of a changed file"""
+        signature = self._signature(path)
+        if signature is None:
+            self.pending.pop(path, None)
+        elif path not in self.pending or self.pending[path][0] != signature:
+            self.pending[path] = (signature, now)
+
+    def poll(self, timeout: float) -> list[Path]:
+        """
+        Wait up to `timeout` for changes and return the files that became complete
+
+        :return: completed files, sorted by name
+        """
+        now = time.monotonic()
+        if self.pending:
+            next_due = min(changed_at for _, changed_at in self.pending.values()) + self.settle
+            timeout = min(timeout, max(0.05, next_due - now))
+
+        changed = self.source.wait(timeout)
+        moves = self.source.moves
+        now = time.monotonic()
+        if self.source.removed:
+            self.log(f"⚠ Lost the inotify watch on {self.folder}, rescanning every {self.poll_interval:g} s instead")
+            self.source.close()
+            self.source = PollingSource(self.folder, self.poll_interval)
+        rescanned = changed is None
+        if rescanned:
+            changed = [path for path, signature in self._scan() if self.known.get(path.name) != signature]
+        for path in changed:
+            if not self._wanted(path):
+                continue
+            signature = self._signature(path)
+            old_name = moves.get(path)
+            if old_name is None and rescanned:
+                old_name = self._renamed_from(path, signature)
+            if old_name is not None and old_name in self.known:
+                self._forget(old_name)
+                self._remember(path.name, signature)
+                self.pending.pop(path, None)
+            else:
+                self._note(path, now)
+
+        ready = []
+        for path, (signature, changed_at) in list(self.pending.items()):
+            if now - changed_at < self.settle:
+                continue
+            current = self._signature(path)
+            if current != signature:
+                # Still being written, or gone
+                self._note(path, now)
+                continue
+            del self.pending[path]
+            self._remember(path.name, signature)
+            ready.append(path)
+        return sorted(ready)
+
+    def run(self, on_files, should_stop):
+        """
+        Report completed files in batches until should_stop() returns True
+
+        :param on_files: called with each batch of up to batch_size completed files
+        :param should_stop: checked at least once per second
+        """
+        while not should_stop():
+            ready = self.poll(MAX_WAIT)
+            for start in range(0, len(ready), self.batch_size):
+                on_files(ready[start:start + self.batch_size])
+
+    def close(self):
+        self.source.close()
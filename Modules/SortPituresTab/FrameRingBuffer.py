@@ -0,0 +1,131 @@
+import functools
+import hashlib
+import io
+import queue
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from .YoloBackend import letterbox_into
+
+
+@functools.cache
+def pillow_image():
+    """Pillow's Image module with HEIC support if pillow-heif is installed, None without Pillow"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        from pillow_heif import register_heif_opener
+        register_heif_opener()
+    except ImportError:
+        pass
+    return Image
+
+
+def decode_image(data: bytes):
+    """
+    BGR frame of an encoded picture, None if it cannot be decoded
+
+    OpenCV reads most formats; the rest (e.g. GIF, HEIC) are tried with Pillow.
+    """
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if img is not None:
+        return img
+    image = pillow_image()
+    if image is None:
+        return None
+    try:
+        with image.open(io.BytesIO(data)) as picture:
+            return cv2.cvtColor(np.asarray(picture.convert("RGB")), cv2.COLOR_RGB2BGR)
+    except Exception:
+        # Pillow raises a variety of errors on data it cannot read
+        return None
+
+
+class FrameRingBuffer:
+    """
+    Fixed number of frame slots in one shared memory block
+
+    Decode workers write letterboxed frames into free slots and pass only the slot index
+    to the detector, which reads the frame as a numpy view of the shared block. Nothing is
+    pickled or copied per frame and the slots are reused for the whole run.
+    """
+
+    def __init__(self, slots: int, frame_size: int, name: str | None = None):
+        """
+        :param slots: number of frames held at once
+        :param frame_size: side of the square frames (the detector input size)
+        :param name: attach to an existing block instead of creating one
+        """
+        self.slots = slots
+        self.frame_size = frame_size
+        shape = (slots, frame_size, frame_size, 3)
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner,
+                                               size=int(np.prod(shape)))
+        self.frames = np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def slot(self, index: int) -> np.ndarray:
+        """Zero-copy view of one frame slot"""
+        return self.frames[index]
+
+    def close(self):
+        """Detach from the block and free it if this instance created it"""
+        self.frames = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def decode_worker(buffer_name, slots, frame_size, tasks, free_slots, ready, stop, hash_files):
+    """
+    Worker process: decode pictures into ring buffer slots
+
+    :param tasks: queue of (index, path) items, None to finish
+    :param free_slots: queue of slot indices the worker may write to
+    :param ready: queue receiving (index, path, size, digest, slot or None, error)
+    :param stop: event telling the worker to quit early
+    """
+    # The parent parallelizes over processes; keep OpenCV from oversubscribing cores
+    cv2.setNumThreads(1)
+    buffer = FrameRingBuffer(slots, frame_size, name=buffer_name)
+    try:
+        while not stop.is_set():
+            task = tasks.get()
+            if task is None:
+                break
+            index, path = task
+
+            size, digest, img, error = 0, None, None, None
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                size = len(data)
+                if hash_files:
+                    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                img = decode_image(data)
+            except OSError as e:
+                error = str(e)
+
+            if img is None:
+                ready.put((index, path, size, digest, None, error))
+                continue
+
+            slot = None
+            while slot is None and not stop.is_set():
+                try:
+                    slot = free_slots.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            if slot is None:
+                break
+
+            letterbox_into(img, buffer.slot(slot))
+            ready.put((index, path, size, digest, slot, None))
+    finally:
+        buffer.close()
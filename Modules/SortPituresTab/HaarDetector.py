@@ -0,0 +1,47 @@
+import cv2
+from .Detector import Detection, register_detector
+
+
+@register_detector("haar")
+class HaarDetector:
+    """OpenCV Haar Cascade face detector; faces are reported as "person" """
+
+    label = "Haar Cascade (Fastest)"
+    model_option = None
+    batched = False
+    finds_objects = False
+    # Faces are searched at native resolution; a letterboxed frame would lose small ones
+    frame_size = None
+
+    def __init__(self, haar_scale_factor=1.1, haar_min_neighbors=5, haar_min_size=30):
+        """
+        :param haar_scale_factor: image pyramid step
+        :param haar_min_neighbors: overlapping detections needed to keep a face
+        :param haar_min_size: smallest face side in pixels
+        """
+        self.scale_factor = haar_scale_factor
+        self.min_neighbors = haar_min_neighbors
+        self.min_size = haar_min_size
+        self.face_cascade = None
+
+    def load(self, log=print) -> str:
+        if self.face_cascade is None:
+            cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+            face_cascade = cv2.CascadeClassifier(cascade_path)
+            if face_cascade.empty():
+                raise RuntimeError("Could not load face detection model")
+            self.face_cascade = face_cascade
+        return "frontal faces"
+
+    def detect(self, frames: list) -> list[Detection]:
+        results = []
+        for img in frames:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            faces = self.face_cascade.detectMultiScale(
+                gray,
+                scaleFactor=self.scale_factor,
+                minNeighbors=self.min_neighbors,
+                minSize=(self.min_size, self.min_size)
+            )
+            results.append(({"person": len(faces)} if len(faces) else {}, None))
+        return results
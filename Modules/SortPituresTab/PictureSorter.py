@@ -0,0 +1,659 @@
+import functools
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+import polars as pl
+from Modules.Core.JobScheduler import sync_job_threads
+from .FolderWatcher import FolderWatcher
+from .FrameRingBuffer import FrameRingBuffer, decode_image, decode_worker
+from .RoutingRules import RoutingRules
+from .SortManifest import build_manifest
+from .SortMetrics import SortMetrics
+from .VideoSampler import VIDEO_EXTENSIONS, VideoSampler
+from .Detector import DETECTORS, Detection, create_detector
+# Importing the detectors registers them, in the order the tab shows them
+from . import YoloDetector, DnnDetector, HaarDetector
+
+# Formats OpenCV cannot read are decoded with Pillow; .heic also needs pillow-heif installed
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.heic'}
+UNREADABLE = "Could not read"
+# Most new pictures classified together in watch mode
+WATCH_BATCH_SIZE = 16
+
+
+class SortCancelled(Exception):
+    """Raised at the next checkpoint after PictureSorter.cancel()"""
+
+
+def ends_run(method):
+    """
+    Clear pause and cancel requests when a run ends
+
+    Requests made before a run starts (e.g. while the model loads) still apply to it.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._reset_controls()
+    return wrapper
+
+
+@dataclass
+class SortResult:
+    """Counts and metrics of a finished sorting run"""
+    routed: dict[str, int]
+    errors: int
+    metrics: SortMetrics
+    cancelled: bool = False
+
+
+@dataclass
+class Classification:
+    """Detection outcome of one image"""
+    index: int
+    path: Path
+    size: int = 0
+    digest: str | None = None
+    counts: dict[str, int] = field(default_factory=dict)
+    confidence: float | None = None
+    error: str | None = None
+    elapsed: float = 0.0
+    frames: int = 0  # video frames run through the detector, 0 for pictures
+
+    @property
+    def people_count(self) -> int:
+        return self.counts.get("person", 0)
+
+    def describe(self) -> str:
+        """Detected classes as 'person: 2, dog: 1'"""
+        return ", ".join(f"{name}: {count}" for name, count in sorted(self.counts.items()))
+
+
+class PictureSorter:
+    """
+    Headless picture sorting engine
+
+    Holds the loaded detector between runs and reports through callbacks, so it can be
+    driven by SortPicturesTab as well as by the benchmarks without any UI.
+    """
+
+    def __init__(self, method="yolo", batch_size=1, decode_workers=0, log=print, progress=None,
+                 video_sampler: VideoSampler = None, **detector_options):
+        """
+        :param method: detector key in DETECTORS, as set by the tab's radio buttons
+        :param batch_size: frames per detection call, for detectors that gain from batching
+        :param video_sampler: frame sampling of video clips, None to leave videos alone
+        :param detector_options: detector settings, e.g. weights_path, yolo_backend, inference_client,
+            haar_min_size or dnn_model_path; each detector takes the ones it knows
+        """
+        self.method = method
+        self.detector = create_detector(method, **detector_options)
+        self.batch_size = max(1, batch_size) if self.detector.batched else 1
+        self.decode_workers = decode_workers
+        self.log = log
+        self.progress = progress
+        self.video_sampler = video_sampler
+        self.extensions = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS if video_sampler else IMAGE_EXTENSIONS
+        self._last_progress = 0.0
+        self._cancel = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def pause(self):
+        """Hold the run before the next image; the loaded model stays in memory"""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        """Stop the run before the next image, also when paused"""
+        self._cancel.set()
+        self._running.set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def checkpoint(self):
+        """
+        Block while paused and raise SortCancelled once cancelled
+
+        Called between images and between copies, so controls take effect within one
+        image (or one batch for detection already in flight).
+        """
+        self._running.wait()
+        if self._cancel.is_set():
+            raise SortCancelled()
+        sync_job_threads()
+
+    def _reset_controls(self):
+        self._cancel.clear()
+        self._running.set()
+
+    def load_detector(self):
+        """Load the detection model for the selected method, reusing an already loaded one"""
+        self.detector.load(log=self.log)
+
+    def scan(self, input_folder) -> list[Path]:
+        """List the images (and videos, if enabled) of a folder"""
+        return [f for f in Path(input_folder).iterdir()
+                if f.suffix.lower() in self.extensions]
+
+    def detect(self, images: list) -> list[Detection]:
+        """
+        Count detected objects per class in a batch of decoded images
+
+        :param images: list of BGR images
+        :return: per image, tuple (counts per class name, best person confidence or None if unknown)
+        """
+        return self.detector.detect(images)
+
+    def classify(self, image_files: list[Path], metrics: SortMetrics, hash_files=False, first_index=1,
+                 parallel=True):
+        """
+        Decode and run detection on images batch by batch
+
+        Every file is read from disk once; the hash (if requested) and the decoded frame both
+        come from the same bytes. Videos are classified after the pictures.
+
+        :param image_files: images and videos to classify
+        :param metrics: metrics receiving decode/detect timings
+        :param hash_files: also compute a content hash of every file
+        :param first_index: Classification.index of the first file
+        :param parallel: use the decode workers, if configured and the detector has a fixed frame size
+        :return: generator of Classification, in input order (completion order with decode workers)
+        """
+        images = [f for f in image_files if f.suffix.lower() not in VIDEO_EXTENSIONS]
+        videos = [f for f in image_files if f.suffix.lower() in VIDEO_EXTENSIONS]
+
+        if self.decode_workers > 0 and parallel and images and self.detector.frame_size:
+            yield from self._classify_parallel(images, metrics, hash_files, first_index)
+        else:
+            yield from self._classify_serial(images, metrics, hash_files, first_index)
+
+        for i, video in enumerate(videos, first_index + len(images)):
+            self.checkpoint()
+            yield self._classify_video(Classification(i, video), metrics, hash_files)
+
+    def _classify_video(self, item: Classification, metrics: SortMetrics, hash_files: bool) -> Classification:
+        """
+        Run detection on sampled frames of a clip, stopping at the first batch with a person
+
+        Counts are the most objects of each class seen in a single frame.
+        """
+        start = time.perf_counter()
+        try:
+            item.size = item.path.stat().st_size
+            if hash_files:
+                item.digest = self.file_digest(item.path)
+
+            frames = self.video_sampler.frames(item.path)
+            try:
+                while True:
+                    with metrics.stage("decode"):
+                        batch = [frame for _, frame in zip(range(self.batch_size), frames)]
+                    if not batch:
+                        break
+                    with metrics.stage("detect"):
+                        detections = self.detect(batch)
+                    item.frames += len(batch)
+                    for counts, confidence in detections:
+                        for name, count in counts.items():
+                            item.counts[name] = max(item.counts.get(name, 0), count)
+                        if confidence is not None:
+                            item.confidence = max(item.confidence or 0.0, confidence)
+                    if item.people_count:
+                        break
+                    self.checkpoint()
+            finally:
+                frames.close()
+            if not item.frames:
+                item.error = UNREADABLE
+        except OSError as e:
+            item.error = str(e)
+        except SortCancelled:
+            raise
+        except Exception as e:
+            item.error = str(e)
+
+        metrics.video_done(item.frames)
+        item.elapsed = time.perf_counter() - start
+        return item
+
+    def _classify_serial(self, image_files: list[Path], metrics: SortMetrics, hash_files=False, first_index=1):
+        """
+        Classify with decoding on the calling thread
+
+        :param first_index: Classification.index of the first image
+        """
+        for start in range(0, len(image_files), self.batch_size):
+            batch_start = time.perf_counter()
+            decoded = []
+            for i, image_file in enumerate(image_files[start:start + self.batch_size], start + first_index):
+                self.checkpoint()
+                item = Classification(i, image_file)
+                img = None
+                try:
+                    with metrics.stage("decode"):
+                        data = image_file.read_bytes()
+                        item.size = len(data)
+                        if hash_files:
+                            item.digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                        img = decode_image(data)
+                except OSError as e:
+                    item.error = str(e)
+
+                if img is None:
+                    item.error = item.error or UNREADABLE
+                    yield item
+                else:
+                    decoded.append((item, img))
+
+            if not decoded:
+                continue
+
+            try:
+                with metrics.stage("detect"):
+                    detections = self.detect([img for _, img in decoded])
+                for (item, _), (counts, confidence) in zip(decoded, detections):
+                    item.counts = counts
+                    item.confidence = confidence
+            except Exception as e:
+                for item, _ in decoded:
+                    item.error = str(e)
+
+            per_image = (time.perf_counter() - batch_start) / len(decoded)
+            for item, _ in decoded:
+                item.elapsed = per_image
+                yield item
+
+    def _classify_parallel(self, image_files: list[Path], metrics: SortMetrics, hash_files: bool, first_index=1):
+        """
+        Classify with decoding spread over worker processes
+
+        Workers letterbox frames straight into a shared memory ring buffer sized to the
+        detector input; this thread only receives slot indices and runs detection on
+        zero-copy views. A slot returns to the free list once its batch is detected, so a
+        slow detector throttles the workers instead of growing memory.
+        """
+        frame_size = self.detector.frame_size
+        slots = 2 * self.decode_workers + self.batch_size
+        context = multiprocessing.get_context("spawn")
+        buffer = FrameRingBuffer(slots, frame_size)
+        tasks, free_slots, ready = context.Queue(), context.Queue(), context.Queue()
+        stop = context.Event()
+
+        for slot in range(slots):
+            free_slots.put(slot)
+        for task in enumerate(map(str, image_files), first_index):
+            tasks.put(task)
+        for _ in range(self.decode_workers):
+            tasks.put(None)
+
+        workers = [
+            context.Process(
+                target=decode_worker,
+                args=(buffer.name, slots, frame_size, tasks, free_slots, ready, stop, hash_files),
+                daemon=True
+            )
+            for _ in range(self.decode_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            remaining = len(image_files)
+            while remaining:
+                self.checkpoint()
+                batch_start = time.perf_counter()
+
+                # Block for the first frame, then take whatever else is ready up to a batch
+                with metrics.stage("decode"):
+                    messages = [self._next_frame(ready, workers)]
+                    while len(messages) < self.batch_size:
+                        try:
+                            messages.append(ready.get_nowait())
+                        except queue.Empty:
+                            break
+                remaining -= len(messages)
+
+                decoded = []
+                for index, path, size, digest, slot, error in messages:
+                    item = Classification(index, Path(path), size, digest)
+                    if slot is None:
+                        item.error = error or UNREADABLE
+                        yield item
+                    else:
+                        decoded.append((item, slot))
+
+                if not decoded:
+                    continue
+
+                try:
+                    with metrics.stage("detect"):
+                        detections = self.detect([buffer.slot(slot) for _, slot in decoded])
+                    for (item, _), (counts, confidence) in zip(decoded, detections):
+                        item.counts = counts
+                        item.confidence = confidence
+                except Exception as e:
+                    for item, _ in decoded:
+                        item.error = str(e)
+                finally:
+                    for _, slot in decoded:
+                        free_slots.put(slot)
+
+                per_image = (time.perf_counter() - batch_start) / len(decoded)
+                for item, _ in decoded:
+                    item.elapsed = per_image
+                    yield item
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            for q in (tasks, free_slots, ready):
+                q.cancel_join_thread()
+                q.close()
+            buffer.close()
+
+    @staticmethod
+    def _next_frame(ready, workers):
+        """Wait for the next decoded frame, failing if every worker has died"""
+        while True:
+            try:
+                return ready.get(timeout=1.0)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    raise RuntimeError("Decode workers exited unexpectedly")
+
+    def report_progress(self, metrics: SortMetrics, force=False):
+        """Call the progress callback at most twice a second"""
+        if self.progress and (force or time.monotonic() - self._last_progress >= 0.5):
+            self._last_progress = time.monotonic()
+            self.progress(metrics)
+
+    @staticmethod
+    def file_digest(path: Path) -> str:
+        """Content hash of a file as stored in the manifest, read in chunks"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def find_copy(cls, image_file: Path, dest_folder, size: int, digest: str) -> Path | None:
+        """
+        Copy of a file already in a folder, under its name or a counter-suffixed one
+
+        Only files of the same size are hashed.
+        """
+        folder = Path(dest_folder)
+        stem = glob.escape(image_file.stem)
+        candidates = [folder / image_file.name, *folder.glob(f"{stem}_*{glob.escape(image_file.suffix)}")]
+        for candidate in candidates:
+            try:
+                if candidate.stat().st_size == size and cls.file_digest(candidate) == digest:
+                    return candidate
+            except OSError:
+                continue
+        return None
+
+    @staticmethod
+    def copy_to(image_file: Path, dest_folder) -> Path:
+        """
+        Copy a file into a folder, adding a counter suffix if the name is taken
+
+        The data is written to a temporary name first and renamed into place, so an
+        interrupted run never leaves a truncated picture behind.
+        """
+        dest_path = Path(dest_folder) / image_file.name
+
+        # Handle duplicate names
+        counter = 1
+        while dest_path.exists():
+            dest_path = Path(dest_folder) / f"{image_file.stem}_{counter}{image_file.suffix}"
+            counter += 1
+
+        partial_path = dest_path.with_name(f".{dest_path.name}.partial")
+        try:
+            shutil.copy2(image_file, partial_path)
+            os.replace(partial_path, dest_path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
+        return dest_path
+
+    def _prepare(self, input_folder, rules: RoutingRules, metrics: SortMetrics) -> list[Path]:
+        """Load the model, check the rules against it and list the input images"""
+        self.load_detector()
+        self.warn_unmatched_rules(rules)
+
+        with metrics.stage("scan"):
+            image_files = self.scan(input_folder)
+        metrics.total = len(image_files)
+        self.log(f"Found {len(image_files)} images to process")
+        return image_files
+
+    def warn_unmatched_rules(self, rules: RoutingRules):
+        if rules.needs_objects and not self.detector.finds_objects:
+            self.log(f"⚠️ {self.detector.label} only detects faces; rules on other classes will never match")
+
+    @ends_run
+    def sort(self, input_folder, rules: RoutingRules) -> SortResult:
+        """
+        Sort all images of the input folder according to the routing rules
+
+        :return: SortResult with counts per destination and run metrics
+        """
+        metrics = SortMetrics(self.method)
+        image_files = self._prepare(input_folder, rules, metrics)
+        for destination in rules.destinations:
+            Path(destination).mkdir(parents=True, exist_ok=True)
+        result = SortResult(dict.fromkeys(rules.destinations, 0), 0, metrics)
+
+        try:
+            for item in self.classify(image_files, metrics):
+                copy_start = time.perf_counter()
+                self._route(item, rules, result)
+                metrics.image_done(item.elapsed + time.perf_counter() - copy_start)
+                self.report_progress(metrics)
+        except SortCancelled:
+            result.cancelled = True
+            self.log("⏹ Sorting cancelled")
+
+        self.report_progress(metrics, force=True)
+        return result
+
+    @ends_run
+    def watch(self, input_folder, rules: RoutingRules, settle=2.0, poll_interval=2.0) -> SortResult:
+        """
+        Sort pictures as they arrive in the input folder, until cancelled
+
+        The detector stays loaded; new files are classified in small batches as soon as
+        they are completely written. Decoding always runs in-process here, as starting
+        worker processes would cost more than a batch of a few pictures.
+
+        :param settle: seconds a new file must stay unchanged before it is sorted
+        :param poll_interval: seconds between folder rescans where inotify is unavailable
+        :return: SortResult of everything sorted while watching
+        """
+        self.load_detector()
+        self.warn_unmatched_rules(rules)
+        for destination in rules.destinations:
+            Path(destination).mkdir(parents=True, exist_ok=True)
+        metrics = SortMetrics(self.method)
+        result = SortResult(dict.fromkeys(rules.destinations, 0), 0, metrics)
+
+        def sort_batch(image_files: list[Path]):
+            first_index = metrics.total + 1
+            metrics.total += len(image_files)
+            for item in self.classify(image_files, metrics, first_index=first_index, parallel=False):
+                copy_start = time.perf_counter()
+                self._route(item, rules, result)
+                metrics.image_done(item.elapsed + time.perf_counter() - copy_start)
+            self.report_progress(metrics, force=True)
+
+        watcher = FolderWatcher(input_folder, self.extensions, settle=settle, poll_interval=poll_interval,
+                                batch_size=max(self.batch_size, WATCH_BATCH_SIZE), log=self.log)
+        self.log(f"👀 Watching {input_folder} for new pictures ({watcher.mode})...")
+        try:
+            watcher.run(sort_batch, self._cancel.is_set)
+        except SortCancelled:
+            pass
+        finally:
+            watcher.close()
+        self.log("⏹ Stopped watching")
+        return result
+
+    def _route(self, item: Classification, rules: RoutingRules, result: SortResult):
+        """Copy one classified image to every destination it is routed to"""
+        name = item.path.name
+        if item.error == UNREADABLE:
+            self.log(f"⚠️ Could not read: {name}")
+            result.errors += 1
+            return
+        if item.error:
+            self.log(f"❌ Error processing {name}: {item.error}")
+            result.errors += 1
+            return
+
+        try:
+            destinations = [destination for _, destination in rules.route(item.counts)]
+            with result.metrics.stage("copy"):
+                for destination in destinations:
+                    self.copy_to(item.path, destination)
+                    result.routed[destination] += 1
+
+            detected = f" ({item.describe()})" if item.counts else ""
+            if item.frames:
+                detected += f" [{item.frames} frames]"
+            targets = ", ".join(Path(destination).name for destination in destinations)
+            self.log(f"✓ [{item.index}/{result.metrics.total}] {name} → {targets}{detected}")
+
+        except Exception as e:
+            self.log(f"❌ Error processing {name}: {str(e)}")
+            result.errors += 1
+
+    @ends_run
+    def plan(self, input_folder, rules: RoutingRules):
+        """
+        Classify all images without copying anything
+
+        With rules that copy to every match, an image gets one manifest row per destination.
+
+        :return: tuple (manifest frame, SortResult with the planned counts)
+        """
+        metrics = SortMetrics(self.method)
+        image_files = self._prepare(input_folder, rules, metrics)
+        result = SortResult(dict.fromkeys(rules.destinations, 0), 0, metrics)
+        rows = []
+
+        try:
+            self._plan_rows(image_files, rules, result, rows)
+        except SortCancelled:
+            result.cancelled = True
+            self.log("⏹ Planning cancelled")
+
+        self.report_progress(metrics, force=True)
+        return build_manifest(rows), result
+
+    def _plan_rows(self, image_files, rules: RoutingRules, result: SortResult, rows: list):
+        """Classify images and append their manifest rows"""
+        metrics = result.metrics
+        for item in self.classify(image_files, metrics, hash_files=True):
+            try:
+                mtime_ns = item.path.stat().st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            row = {
+                "path": str(item.path),
+                "size": item.size,
+                "mtime_ns": mtime_ns,
+                "hash": item.digest,
+                "person_count": item.people_count,
+                "confidence": item.confidence,
+                "class_counts": json.dumps(item.counts, sort_keys=True),
+                "rule": None,
+                "destination": None,
+                "error": item.error,
+            }
+            if item.error:
+                self.log(f"❌ Error processing {item.path.name}: {item.error}")
+                result.errors += 1
+                rows.append(row)
+            else:
+                for rule, destination in rules.route(item.counts):
+                    result.routed[destination] += 1
+                    rows.append({**row, "rule": rule.condition if rule else None, "destination": destination})
+
+            metrics.image_done(item.elapsed)
+            self.report_progress(metrics)
+
+    @ends_run
+    def apply(self, manifest) -> SortMetrics:
+        """
+        Copy the files of a manifest to their planned destinations
+
+        Transfers are grouped by destination folder and ordered by source path, so every
+        folder is created once and written sequentially. Files whose size or modification
+        time differ from the plan are skipped, as their classification may no longer hold.
+        Files whose content is already in the destination folder, e.g. when a plan is
+        applied again, are not copied a second time.
+
+        :param manifest: manifest frame (see SortManifest)
+        :return: metrics of the copy run; errors, skipped files and files already present are
+            counted in it
+        :raises SortCancelled: if cancelled; files copied so far are complete
+        """
+        metrics = SortMetrics("apply")
+        planned = manifest.filter(manifest["destination"].is_not_null()).sort(["destination", "path"])
+        # Manifests written before modification times were recorded are checked on size only
+        if "mtime_ns" not in planned.columns:
+            planned = planned.with_columns(pl.lit(None, dtype=pl.Int64).alias("mtime_ns"))
+        if "hash" not in planned.columns:
+            planned = planned.with_columns(pl.lit(None, dtype=pl.Utf8).alias("hash"))
+        metrics.total = planned.height
+        self.log(f"Applying plan: {planned.height} files")
+
+        for destination, group in planned.group_by("destination", maintain_order=True):
+            destination = destination[0]
+            Path(destination).mkdir(parents=True, exist_ok=True)
+            copied = 0
+            for path, size, mtime_ns, digest in group.select("path", "size", "mtime_ns", "hash").iter_rows():
+                self.checkpoint()
+                start = time.perf_counter()
+                path = Path(path)
+                try:
+                    stat = path.stat()
+                    if stat.st_size != size or (mtime_ns is not None and stat.st_mtime_ns != mtime_ns):
+                        self.log(f"⚠ {path.name} changed since the plan, skipped")
+                        metrics.skipped += 1
+                    elif digest is not None and self.find_copy(path, destination, size, digest):
+                        metrics.present += 1
+                    else:
+                        with metrics.stage("copy"):
+                            self.copy_to(path, destination)
+                        copied += 1
+                except Exception as e:
+                    self.log(f"❌ Error copying {path.name}: {str(e)}")
+                    metrics.errors += 1
+                metrics.image_done(time.perf_counter() - start)
+                self.report_progress(metrics)
+
+            self.log(f"✓ {copied} files → {destination}")
+
+        self.report_progress(metrics, force=True)
+        return metrics
@@ -0,0 +1,163 @@
+"""
+Routing rules that map detected class counts to destination folders
+
+One rule per line, ``<condition> -> <folder>``::
+
+    person>=3 -> D:/Pictures/Groups
+    dog|cat -> D:/Pictures/Pets
+    car+truck+bus>=2 & !person -> D:/Pictures/Traffic
+
+A condition is a list of terms joined by ``|`` (or) and ``&`` (and, binds tighter). A term
+is a class name or a ``+`` sum of class names, optionally prefixed with ``!`` (none of them)
+or followed by a comparison (``>=``, ``<=``, ``>``, ``<``, ``==``, ``!=``) with a number.
+A bare class name means "at least one". Class names are COCO names with spaces written
+as underscores (``cell_phone``).
+"""
+import operator
+import re
+from dataclasses import dataclass, field
+
+COCO_CLASSES = (
+    'person', 'bicycle', 'car', 'motorcycle', 'airplane', 'bus', 'train', 'truck', 'boat',
+    'traffic_light', 'fire_hydrant', 'stop_sign', 'parking_meter', 'bench', 'bird', 'cat', 'dog',
+    'horse', 'sheep', 'cow', 'elephant', 'bear', 'zebra', 'giraffe', 'backpack', 'umbrella',
+    'handbag', 'tie', 'suitcase', 'frisbee', 'skis', 'snowboard', 'sports_ball', 'kite',
+    'baseball_bat', 'baseball_glove', 'skateboard', 'surfboard', 'tennis_racket', 'bottle',
+    'wine_glass', 'cup', 'fork', 'knife', 'spoon', 'bowl', 'banana', 'apple', 'sandwich', 'orange',
+    'broccoli', 'carrot', 'hot_dog', 'pizza', 'donut', 'cake', 'chair', 'couch', 'potted_plant',
+    'bed', 'dining_table', 'toilet', 'tv', 'laptop', 'mouse', 'remote', 'keyboard', 'cell_phone',
+    'microwave', 'oven', 'toaster', 'sink', 'refrigerator', 'book', 'clock', 'vase', 'scissors',
+    'teddy_bear', 'hair_drier', 'toothbrush',
+)
+
+OPERATORS = {
+    '>=': operator.ge, '<=': operator.le, '==': operator.eq,
+    '!=': operator.ne, '>': operator.gt, '<': operator.lt, '=': operator.eq,
+}
+
+TERM_PATTERN = re.compile(r'^(!?)\s*([a-z_+\s]+?)\s*(?:(>=|<=|==|!=|>|<|=)\s*(\d+))?$')
+
+
+def class_counts(detections: list[tuple[int, float]]) -> dict[str, int]:
+    """Count detections per COCO class name"""
+    counts = {}
+    for class_id, _ in detections:
+        name = COCO_CLASSES[class_id] if class_id < len(COCO_CLASSES) else f"class_{class_id}"
+        counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def parse_term(text: str):
+    """Compile one term into a predicate over class counts"""
+    match = TERM_PATTERN.match(text.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid rule term: '{text.strip()}'")
+
+    negate, names, op, value = match.groups()
+    names = [name.strip() for name in names.split('+')]
+    unknown = [name for name in names if name not in COCO_CLASSES]
+    if unknown:
+        raise ValueError(f"Unknown class: {', '.join(unknown)}")
+    if negate and op:
+        raise ValueError(f"'!' cannot be combined with a comparison: '{text.strip()}'")
+
+    compare = OPERATORS[op] if op else operator.ge
+    threshold = int(value) if op else 1
+
+    def predicate(counts):
+        total = sum(counts.get(name, 0) for name in names)
+        return total == 0 if negate else compare(total, threshold)
+
+    return predicate
+
+
+@dataclass
+class Rule:
+    """One condition and the folder it routes to"""
+    condition: str
+    destination: str
+    classes: set = field(init=False, default_factory=set)
+
+    def __post_init__(self):
+        # Disjunction of conjunctions of term predicates
+        self._clauses = [
+            [parse_term(term) for term in clause.split('&')]
+            for clause in self.condition.split('|')
+        ]
+        self.classes = set(re.findall(r'[a-z_]+', self.condition.lower()))
+
+    def matches(self, counts: dict[str, int]) -> bool:
+        return any(all(term(counts) for term in clause) for clause in self._clauses)
+
+
+class RoutingRules:
+    """
+    Ordered rules evaluated against the class counts of a single detection pass
+
+    With ``copy_to_all`` an image goes to every matching rule, which is what running one
+    sort per rule would produce; otherwise the first match wins. Images matching no rule
+    go to the fallback folder.
+    """
+
+    def __init__(self, rules: list[Rule], fallback: str, copy_to_all=False):
+        self.rules = rules
+        self.fallback = fallback
+        self.copy_to_all = copy_to_all
+
+    @classmethod
+    def default(cls, with_people_folder, without_people_folder) -> "RoutingRules":
+        """The classic two-way split"""
+        return cls([Rule("person", str(with_people_folder))], str(without_people_folder))
+
+    @classmethod
+    def parse(cls, text: str, with_people_folder, without_people_folder, copy_to_all=False) -> "RoutingRules":
+        """
+        Build rules from user text, followed by the default people rule and fallback
+
+        :param text: one ``<condition> -> <folder>`` rule per line; blank lines and # comments are skipped
+        :raises ValueError: with the offending line number on syntax errors
+        """
+        rules = []
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            condition, arrow, destination = line.partition('->')
+            if not arrow or not condition.strip() or not destination.strip():
+                raise ValueError(f"Line {number}: expected '<condition> -> <folder>'")
+            try:
+                rules.append(Rule(condition.strip(), destination.strip()))
+            except ValueError as e:
+                raise ValueError(f"Line {number}: {str(e)}") from None
+
+        rules.append(Rule("person", str(with_people_folder)))
+        return cls(rules, str(without_people_folder), copy_to_all)
+
+    @property
+    def destinations(self) -> list[str]:
+        """All folders a picture can be routed to"""
+        return list(dict.fromkeys([rule.destination for rule in self.rules] + [self.fallback]))
+
+    @property
+    def needs_objects(self) -> bool:
+        """True if a rule uses classes other than person, which face detectors cannot see"""
+        return any(rule.classes - {'person'} for rule in self.rules)
+
+    def route(self, counts: dict[str, int]) -> list[tuple[Rule | None, str]]:
+        """
+        Destinations for one image
+
+        :param counts: detections per class name
+        :return: list of (matched rule or None for the fallback, destination folder)
+        """
+        matched = []
+        for rule in self.rules:
+            # Several rules may share a folder; copy there once
+            if rule.destination in (destination for _, destination in matched):
+                continue
+            if rule.matches(counts):
+                matched.append((rule, rule.destination))
+                if not self.copy_to_all:
+                    break
+
+        return matched or [(None, self.fallback)]
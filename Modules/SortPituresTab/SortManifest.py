@@ -0,0 +1,71 @@
+"""
+Columnar classification manifest of a planned sort
+
+One row per image and destination with its size, modification time, content hash, detection result (person
+count, best person confidence and all class counts as JSON), the routing rule that matched
+and the planned destination folder. The manifest can be reviewed and re-routed with regular
+polars expressions before it is applied, e.g.::
+
+    manifest = read_manifest("plan.parquet")
+    manifest = reroute(manifest, pl.col("person_count") >= 3, "D:/Pictures/Groups")
+    manifest = reroute(manifest, pl.col("class_counts").str.contains('"dog"'), "D:/Pictures/Pets")
+    write_manifest(manifest, "plan.parquet")
+"""
+from pathlib import Path
+import polars as pl
+
+MANIFEST_SCHEMA = {
+    "path": pl.Utf8,
+    "size": pl.Int64,
+    "mtime_ns": pl.Int64,
+    "hash": pl.Utf8,
+    "person_count": pl.Int32,
+    "confidence": pl.Float32,
+    "class_counts": pl.Utf8,
+    "rule": pl.Utf8,
+    "destination": pl.Utf8,
+    "error": pl.Utf8,
+}
+
+IPC_SUFFIXES = {'.arrow', '.ipc', '.feather'}
+
+
+def build_manifest(rows: list[dict]) -> pl.DataFrame:
+    """Create a manifest frame from row dicts"""
+    return pl.DataFrame(rows, schema=MANIFEST_SCHEMA, orient="row")
+
+
+def write_manifest(manifest: pl.DataFrame, path) -> Path:
+    """Write the manifest as Parquet, or Arrow IPC for .arrow/.ipc/.feather paths"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() in IPC_SUFFIXES:
+        manifest.write_ipc(path)
+    else:
+        manifest.write_parquet(path)
+    return path
+
+
+def read_manifest(path) -> pl.DataFrame:
+    """Read a manifest written by write_manifest"""
+    path = Path(path)
+    if path.suffix.lower() in IPC_SUFFIXES:
+        return pl.read_ipc(path)
+    return pl.read_parquet(path)
+
+
+def reroute(manifest: pl.DataFrame, condition: pl.Expr, destination: str) -> pl.DataFrame:
+    """
+    Send every image matching a condition to another folder
+
+    :param manifest: manifest frame
+    :param condition: polars boolean expression over the manifest columns
+    :param destination: new destination folder for matching rows
+    :return: updated manifest
+    """
+    return manifest.with_columns(
+        pl.when(condition & pl.col("error").is_null())
+        .then(pl.lit(str(destination)))
+        .otherwise(pl.col("destination"))
+        .alias("destination")
+    )
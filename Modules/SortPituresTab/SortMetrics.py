@@ -0,0 +1,175 @@
+import csv
+import json
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import psutil
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+class SortMetrics:
+    """Per-stage latency, throughput and memory statistics of one sorting run"""
+
+    STAGES = ("scan", "decode", "detect", "copy")
+
+    def __init__(self, method: str = "", sample_interval: float = 1.0, rate_window: float = 10.0):
+        self.method = method
+        self.sample_interval = sample_interval
+        self.rate_window = rate_window
+        self.latencies = defaultdict(list)
+        self.throughput = []  # (seconds since start, images processed)
+        self.total = 0
+        self.processed = 0
+        self.errors = 0   # files that failed, counted in processed too
+        self.skipped = 0  # files left alone on purpose, e.g. changed since the plan
+        self.present = 0  # files already at their destination, e.g. a plan applied twice
+        self.peak_rss = 0
+        self.video_frames = []  # frames run through the detector, per video clip
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._last_sample = float("-inf")
+        self._recent = deque()
+        self._process = psutil.Process()
+        self.sample_memory()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as one sample of the given stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latencies[name].append(time.perf_counter() - start)
+
+    def sample_memory(self):
+        """Update peak RSS from the current process memory"""
+        info = self._process.memory_info()
+        # Windows exposes the true peak working set, elsewhere we rely on sampling
+        self.peak_rss = max(self.peak_rss, info.rss, getattr(info, "peak_wset", 0))
+
+    def image_done(self, latency: float | None = None):
+        """
+        Count one processed image and sample throughput/memory at most once per interval
+
+        :param latency: end-to-end seconds spent on the image, if known
+        """
+        self.processed += 1
+        if latency is not None:
+            self.latencies["image"].append(latency)
+        now = time.perf_counter()
+        self._recent.append(now)
+        while self._recent and now - self._recent[0] > self.rate_window:
+            self._recent.popleft()
+
+        if now - self._last_sample >= self.sample_interval:
+            self._last_sample = now
+            self.throughput.append((now - self._start, self.processed))
+            self.sample_memory()
+
+    def video_done(self, frames: int):
+        """Record how many sampled frames one video clip needed"""
+        self.video_frames.append(frames)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def images_per_second(self) -> float:
+        """Throughput over the recent window, so the figure follows speed changes"""
+        if len(self._recent) < 2:
+            elapsed = self.elapsed()
+            return self.processed / elapsed if elapsed > 0 else 0.0
+        span = self._recent[-1] - self._recent[0]
+        return (len(self._recent) - 1) / span if span > 0 else 0.0
+
+    def eta_seconds(self) -> float | None:
+        """Estimated seconds until all images are processed, None while unknown"""
+        rate = self.images_per_second()
+        if rate <= 0 or not self.total:
+            return None
+        return max(self.total - self.processed, 0) / rate
+
+    def histogram(self, name: str) -> dict[str, int]:
+        """Latency histogram of a stage, keyed by bucket label"""
+        counts = {f"<={bound}ms": 0 for bound in HISTOGRAM_BUCKETS_MS}
+        counts[f">{HISTOGRAM_BUCKETS_MS[-1]}ms"] = 0
+        for seconds in self.latencies[name]:
+            ms = seconds * 1000
+            for bound in HISTOGRAM_BUCKETS_MS:
+                if ms <= bound:
+                    counts[f"<={bound}ms"] += 1
+                    break
+            else:
+                counts[f">{HISTOGRAM_BUCKETS_MS[-1]}ms"] += 1
+        return counts
+
+    def stage_summary(self, name: str) -> dict:
+        values = sorted(self.latencies[name])
+        total = sum(values)
+        return {
+            "count": len(values),
+            "total_s": total,
+            "mean_ms": total / len(values) * 1000 if values else 0.0,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p90_ms": percentile(values, 0.90) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "max_ms": values[-1] * 1000 if values else 0.0,
+        }
+
+    def summary(self) -> dict:
+        self.sample_memory()
+        elapsed = self.elapsed()
+        return {
+            "method": self.method,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "elapsed_s": elapsed,
+            "images": self.processed,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "present": self.present,
+            "images_per_s": self.processed / elapsed if elapsed > 0 else 0.0,
+            "peak_rss_mb": self.peak_rss / 2 ** 20,
+            "videos": len(self.video_frames),
+            "video_frames_mean": sum(self.video_frames) / len(self.video_frames) if self.video_frames else 0.0,
+            "image": self.stage_summary("image"),
+            "stages": {
+                name: {**self.stage_summary(name), "histogram": self.histogram(name)}
+                for name in self.STAGES
+            },
+            "throughput": [{"t_s": t, "images": n} for t, n in self.throughput],
+        }
+
+    def write_report(self, folder: Path) -> tuple[Path, Path]:
+        """
+        Write the JSON report and a CSV with one row per stage
+
+        :param folder: destination folder
+        :return: tuple (json_path, csv_path)
+        """
+        folder.mkdir(parents=True, exist_ok=True)
+        stem = f"sort_{self.started_at:%Y%m%d_%H%M%S}"
+        summary = self.summary()
+
+        json_path = folder / f"{stem}.json"
+        json_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+        csv_path = folder / f"{stem}.csv"
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            fields = ["stage", "count", "total_s", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            for name, stats in summary["stages"].items():
+                writer.writerow({"stage": name, **stats})
+
+        return json_path, csv_path
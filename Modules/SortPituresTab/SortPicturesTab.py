@@ -2,11 +2,20 @@ import tkinter as tk
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import os
-import threading
-import cv2
+import time
 from pathlib import Path
-import shutil
-from ultralytics import YOLO
+from Modules.Core.AppPaths import app_data_dir, app_data_path
+from Modules.Core.AppConfig import config_store
+from Modules.Core.JobScheduler import Priority, current_job, job_scheduler
+from Modules.Core.WarmupScheduler import warmup_scheduler
+from Modules.InferenceServer.InferenceClient import RemoteYoloBackend, connect_inference_server
+from .Detector import DETECTORS
+from .PictureSorter import PictureSorter, SortCancelled
+from .RoutingRules import RoutingRules
+from .SortManifest import read_manifest, write_manifest
+from .SortMetrics import SortMetrics
+from .VideoSampler import VideoSampler
+from .YoloBackend import YoloBackend, get_yolo_backend
 
 class SortPicturesTab:
     """Tab for sorting pictures with/without people"""
@@ -17,8 +26,13 @@ class SortPicturesTab:
         self.with_people_folder = tk.StringVar()
         self.without_people_folder = tk.StringVar()
         self.is_sorting = False
-        self.detection_method = tk.StringVar(value="yolo")  # Default to YOLO
-        self.yolo_model = None
+        settings = config_store.get().sorting
+        self.detection_method = tk.StringVar(value=settings.method)
+        self.yolo_backend = tk.StringVar(value=settings.yolo_backend)
+        self.copy_to_all = tk.BooleanVar(value=False)
+        self.sorter = None
+        self.sorter_options = None
+        self.job = None
 
         self.create_widgets()
 
@@ -55,23 +69,31 @@ class SortPicturesTab:
         )
         method_label.pack(side=tk.LEFT, padx=(10, 20))
 
-        yolo_radio = ctk.CTkRadioButton(
+        # One radio button per registered detector
+        for key, detector in DETECTORS.items():
+            radio = ctk.CTkRadioButton(
+                method_frame,
+                text=detector.label,
+                variable=self.detection_method,
+                value=key,
+                font=ctk.CTkFont(size=12)
+            )
+            radio.pack(side=tk.LEFT, padx=(0, 20))
+
+        backend_menu = ctk.CTkOptionMenu(
             method_frame,
-            text="YOLO (More Accurate)",
-            variable=self.detection_method,
-            value="yolo",
-            font=ctk.CTkFont(size=12)
+            values=list(YoloBackend.BACKENDS),
+            variable=self.yolo_backend,
+            width=110
         )
-        yolo_radio.pack(side=tk.LEFT, padx=(0, 20))
+        backend_menu.pack(side=tk.RIGHT, padx=(0, 10))
 
-        haar_radio = ctk.CTkRadioButton(
+        backend_label = ctk.CTkLabel(
             method_frame,
-            text="Haar Cascade (Faster)",
-            variable=self.detection_method,
-            value="haar",
+            text="YOLO Backend:",
             font=ctk.CTkFont(size=12)
         )
-        haar_radio.pack(side=tk.LEFT)
+        backend_label.pack(side=tk.RIGHT, padx=(20, 10))
 
         # File picker section
         picker_frame = ctk.CTkFrame(main_container)
@@ -104,15 +126,115 @@ class SortPicturesTab:
             2
         )
 
-        # Start button
+        # Extra routing rules
+        rules_frame = ctk.CTkFrame(main_container)
+        rules_frame.pack(fill=tk.X, pady=(0, 20))
+
+        rules_header = ctk.CTkFrame(rules_frame, fg_color="transparent")
+        rules_header.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        rules_label = ctk.CTkLabel(
+            rules_header,
+            text="Extra Routing Rules (optional, YOLO): one per line, e.g.  person>=3 -> D:/Groups   dog|cat -> D:/Pets",
+            font=ctk.CTkFont(size=12, weight="bold"),
+            anchor="w"
+        )
+        rules_label.pack(side=tk.LEFT)
+
+        copy_all_check = ctk.CTkCheckBox(
+            rules_header,
+            text="Copy to every matching folder",
+            variable=self.copy_to_all,
+            font=ctk.CTkFont(size=12)
+        )
+        copy_all_check.pack(side=tk.RIGHT)
+
+        self.rules_text = ctk.CTkTextbox(rules_frame, height=60)
+        self.rules_text.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+        # Action buttons
+        button_row = ctk.CTkFrame(main_container, fg_color="transparent")
+        button_row.pack(fill=tk.X, pady=(0, 5))
+
         self.start_button = ctk.CTkButton(
-            main_container,
+            button_row,
             text="Start Sorting",
             font=ctk.CTkFont(size=14, weight="bold"),
             height=45,
             command=self.start_sorting
         )
-        self.start_button.pack(fill=tk.X, pady=(0, 15))
+        self.start_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+
+        self.plan_button = ctk.CTkButton(
+            button_row,
+            text="Dry Run (Plan)",
+            font=ctk.CTkFont(size=14),
+            width=150,
+            height=45,
+            fg_color="gray40",
+            hover_color="gray30",
+            command=self.start_planning
+        )
+        self.plan_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.apply_button = ctk.CTkButton(
+            button_row,
+            text="Apply Plan...",
+            font=ctk.CTkFont(size=14),
+            width=150,
+            height=45,
+            fg_color="gray40",
+            hover_color="gray30",
+            command=self.start_applying
+        )
+        self.apply_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.watch_button = ctk.CTkButton(
+            button_row,
+            text="Watch Folder",
+            font=ctk.CTkFont(size=14),
+            width=150,
+            height=45,
+            fg_color="gray40",
+            hover_color="gray30",
+            command=self.start_watching
+        )
+        self.watch_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.pause_button = ctk.CTkButton(
+            button_row,
+            text="Pause",
+            font=ctk.CTkFont(size=14),
+            width=100,
+            height=45,
+            fg_color="gray40",
+            hover_color="gray30",
+            state="disabled",
+            command=self.toggle_pause
+        )
+        self.pause_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.cancel_button = ctk.CTkButton(
+            button_row,
+            text="Cancel",
+            font=ctk.CTkFont(size=14),
+            width=100,
+            height=45,
+            fg_color=("#e53935", "#c62828"),
+            hover_color=("#c62828", "#b71c1c"),
+            state="disabled",
+            command=self.cancel_job
+        )
+        self.cancel_button.pack(side=tk.LEFT)
+
+        # Live throughput
+        self.rate_label = ctk.CTkLabel(
+            main_container,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=("gray40", "gray60")
+        )
+        self.rate_label.pack(fill=tk.X, pady=(0, 10))
 
         # Status area
         status_frame = ctk.CTkFrame(main_container)
@@ -176,171 +298,238 @@ class SortPicturesTab:
         self.status_text.see(tk.END)
         self.status_text.configure(state="disabled")
 
-    def start_sorting(self):
-        """Start the sorting process"""
-        if self.is_sorting:
-            return
-
-        # Validate inputs
+    def validate_folders(self) -> bool:
+        """Check the folder inputs and create the output folders"""
         if not self.input_folder.get():
             messagebox.showwarning("Warning", "Please select an input folder")
-            return
+            return False
         if not self.with_people_folder.get():
             messagebox.showwarning("Warning", "Please select a folder for pictures with people")
-            return
+            return False
         if not self.without_people_folder.get():
             messagebox.showwarning("Warning", "Please select a folder for pictures without people")
-            return
+            return False
 
         if not os.path.exists(self.input_folder.get()):
             messagebox.showerror("Error", "Input folder does not exist")
-            return
+            return False
 
         # Create output folders if they don't exist
         os.makedirs(self.with_people_folder.get(), exist_ok=True)
         os.makedirs(self.without_people_folder.get(), exist_ok=True)
+        return True
+
+    def build_rules(self) -> RoutingRules | None:
+        """Parse the rules box into routing rules, None (after warning) if it is invalid"""
+        try:
+            return RoutingRules.parse(
+                self.rules_text.get("1.0", tk.END),
+                self.with_people_folder.get(),
+                self.without_people_folder.get(),
+                copy_to_all=self.copy_to_all.get()
+            )
+        except ValueError as e:
+            messagebox.showwarning("Warning", f"Invalid routing rule\n\n{str(e)}")
+            return None
 
+    def begin_job(self, button, text, target, *args):
+        """Lock the UI, clear the log and run a job in a background thread"""
         self.is_sorting = True
-        self.start_button.configure(state="disabled", text="Sorting...")
+        for btn in (self.start_button, self.plan_button, self.apply_button, self.watch_button):
+            btn.configure(state="disabled")
+        button.configure(text=text)
+        self.pause_button.configure(state="normal", text="Pause")
+        self.cancel_button.configure(state="normal")
 
         # Clear status
         self.status_text.configure(state="normal")
         self.status_text.delete("1.0", tk.END)
         self.status_text.configure(state="disabled")
 
-        # Run in thread
-        threading.Thread(target=self.sort_pictures, daemon=True).start()
+        # Bulk job: runs in the background and yields to interactive work such as chat replies
+        self.job = job_scheduler.submit(
+            text.rstrip("."), target, *args,
+            priority=Priority.BULK,
+            on_progress=lambda metrics: self.parent_frame.after(0, self.update_rate, metrics)
+        )
+
+    def start_sorting(self):
+        """Start the sorting process"""
+        if self.is_sorting or not self.validate_folders():
+            return
+        rules = self.build_rules()
+        if rules:
+            self.begin_job(self.start_button, "Sorting...", self.sort_pictures, rules)
+
+    def start_planning(self):
+        """Classify pictures into a manifest without copying"""
+        if self.is_sorting or not self.validate_folders():
+            return
+        rules = self.build_rules()
+        if rules:
+            self.begin_job(self.plan_button, "Planning...", self.plan_pictures, rules)
 
-    def has_people_yolo(self, image_path: str) -> tuple[bool, int]:
-        """
-        Check if people are in the picture using YOLO
+    def start_watching(self):
+        """Sort pictures as they arrive in the input folder until cancelled"""
+        if self.is_sorting or not self.validate_folders():
+            return
+        rules = self.build_rules()
+        if rules:
+            self.begin_job(self.watch_button, "Watching...", self.watch_pictures, rules)
 
-        :param image_path: path to the image
-        :return: tuple (has_people: bool, count: int)
-        """
-        if self.yolo_model is None:
-            self.yolo_model = YOLO('../../yolov8n.pt')
+    def start_applying(self):
+        """Pick a manifest and copy its files to the planned destinations"""
+        if self.is_sorting:
+            return
+        manifest_path = filedialog.askopenfilename(
+            title="Select Sorting Plan",
+            initialdir=app_data_dir("manifests"),
+            filetypes=[("Sorting plans", "*.parquet *.arrow *.ipc"), ("All files", "*.*")]
+        )
+        if manifest_path:
+            self.begin_job(self.apply_button, "Applying...", self.apply_manifest, manifest_path)
 
-        results = self.yolo_model(image_path, verbose=False)
+    def toggle_pause(self):
+        """Pause or resume the running job"""
+        if self.job is None:
+            return
+        if self.job.user_paused:
+            self.job.resume()
+            self.pause_button.configure(text="Pause")
+            self.log_status("▶ Resumed" if not self.job.preempted else "▶ Resuming once the chatbot has answered")
+        else:
+            self.job.pause()
+            self.pause_button.configure(text="Resume")
+            self.log_status("⏸ Paused after the current picture (model stays loaded)")
+
+    def cancel_job(self):
+        """Stop the running job after the current picture"""
+        if self.job is None:
+            return
+        self.job.cancel()
+        self.pause_button.configure(state="disabled")
+        self.cancel_button.configure(state="disabled")
+        self.log_status("⏹ Cancelling after the current picture...")
+
+    def update_rate(self, metrics: SortMetrics):
+        """Show current images/sec and ETA"""
+        eta = metrics.eta_seconds()
+        eta_text = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta is not None else "--:--:--"
+        self.rate_label.configure(
+            text=f"{metrics.processed}/{metrics.total} images • "
+                 f"{metrics.images_per_second():.1f} images/sec • ETA {eta_text}"
+        )
 
-        # class 0 in COCO dataset = person
-        person_count = 0
-        for result in results:
-            for box in result.boxes:
-                if int(box.cls) == 0:
-                    person_count += 1
+    def get_sorter(self) -> PictureSorter | None:
+        """Sorter for the current settings with its model loaded, None if loading failed"""
+        method = self.detection_method.get()
+        settings = config_store.get().sorting
+        options = {
+            "method": method,
+            "yolo_backend": self.yolo_backend.get(),
+            "weights_path": settings.yolo_weights,
+            "batch_size": settings.batch_size,
+            "decode_workers": settings.decode_workers,
+            "haar_scale_factor": settings.haar_scale_factor,
+            "haar_min_neighbors": settings.haar_min_neighbors,
+            "haar_min_size": settings.haar_min_size,
+            "dnn_model_path": settings.dnn_model_path,
+            "dnn_score_threshold": settings.dnn_score_threshold,
+            "video_sampler": VideoSampler(settings.video_sample_seconds, settings.video_max_frames)
+            if settings.videos else None,
+        }
+
+        # Keep the sorter between runs with the same settings; loaded models stay in the registry either way
+        sorter = self.sorter
+        if sorter is None or options != self.sorter_options:
+            sorter = PictureSorter(
+                log=self.log_status,
+                inference_client=connect_inference_server() if method == "yolo" else None,
+                **options
+            )
 
-        return person_count > 0, person_count
+        try:
+            sorter.load_detector()
+        except Exception as e:
+            self.log_status(f"Error loading detection model: {str(e)}")
+            if method == "yolo":
+                self.log_status("Please install ultralytics: pip install ultralytics")
+            return None
+
+        if method == "yolo":
+            warmup_scheduler.record_use("yolo", weights=str(options["weights_path"]), backend=options["yolo_backend"])
+        self.sorter = sorter
+        self.sorter_options = options
+        self.bind_job(sorter)
+        return sorter
+
+    def bind_job(self, sorter: PictureSorter):
+        """Route the sorter's progress to the running job and let the job pause and cancel it"""
+        job = current_job()
+        sorter.progress = job.report
+        job.attach(sorter.pause, sorter.resume, sorter.cancel)
 
-    def sort_pictures(self):
+    @staticmethod
+    def preload(params: dict):
+        """Warm-up task: load the YOLO model last used for sorting before the tab is opened"""
+        client = connect_inference_server()
+        if client is not None:
+            RemoteYoloBackend(client, params["weights"], backend=params["backend"]).load()
+        else:
+            get_yolo_backend(params["weights"], params["backend"], log=lambda message: None, preload=True)
+
+    def log_metrics(self, metrics: SortMetrics, report_name: str):
+        """Log throughput and stage latencies and save the report"""
+        summary = metrics.summary()
+        self.log_status(f"Throughput: {summary['images_per_s']:.1f} images/sec, "
+                        f"peak memory: {summary['peak_rss_mb']:.0f} MB")
+        if summary["videos"]:
+            self.log_status(f"Videos: {summary['videos']}, "
+                            f"{summary['video_frames_mean']:.1f} frames checked per clip on average")
+        for stage, stats in summary["stages"].items():
+            if stats["count"]:
+                self.log_status(f"  {stage:<7} p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms")
+        json_path, _ = metrics.write_report(app_data_dir("reports", report_name))
+        self.log_status(f"Report saved to {json_path.parent}")
+
+    def log_routed(self, result, verb: str):
+        """Log the number of pictures per destination folder"""
+        for destination, count in result.routed.items():
+            label = {
+                self.with_people_folder.get(): "with people",
+                self.without_people_folder.get(): "without people",
+            }.get(destination, Path(destination).name)
+            self.log_status(f"Pictures {verb} {label}: {count}")
+
+    def sort_pictures(self, rules: RoutingRules):
         """Sort pictures using selected detection method"""
         try:
             method = self.detection_method.get()
             self.log_status(f"Starting picture sorting using {method.upper()} detection...")
 
-            # Initialize detection model
-            if method == "haar":
-                cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-                face_cascade = cv2.CascadeClassifier(cascade_path)
-
-                if face_cascade.empty():
-                    self.log_status("Error: Could not load face detection model")
-                    self.finish_sorting()
-                    return
-            else:  # YOLO
-                try:
-                    self.log_status("Loading YOLO model (this may take a moment)...")
-                    self.yolo_model = YOLO('../../yolov8n.pt')
-                    self.log_status("YOLO model loaded successfully")
-                except Exception as e:
-                    self.log_status(f"Error loading YOLO: {str(e)}")
-                    self.log_status("Please install ultralytics: pip install ultralytics")
-                    self.finish_sorting()
-                    return
-
-            # Get all image files
-            input_path = Path(self.input_folder.get())
-            image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.heic'}
-            image_files = [f for f in input_path.iterdir()
-                           if f.suffix.lower() in image_extensions]
-
-            self.log_status(f"Found {len(image_files)} images to process")
-
-            with_people_count = 0
-            without_people_count = 0
-            error_count = 0
-
-            for i, image_file in enumerate(image_files, 1):
-                try:
-                    has_people = False
-                    people_count = 0
-
-                    if method == "yolo":
-                        # Use YOLO detection
-                        has_people, people_count = self.has_people_yolo(str(image_file))
-                    else:
-                        # Use Haar Cascade detection
-                        img = cv2.imread(str(image_file))
-                        if img is None:
-                            self.log_status(f"⚠️ Could not read: {image_file.name}")
-                            error_count += 1
-                            continue
-
-                        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                        faces = face_cascade.detectMultiScale(
-                            gray,
-                            scaleFactor=1.1,
-                            minNeighbors=5,
-                            minSize=(30, 30)
-                        )
-                        has_people = len(faces) > 0
-                        people_count = len(faces)
-
-                    # Determine destination
-                    if has_people:
-                        dest_folder = self.with_people_folder.get()
-                        with_people_count += 1
-                        status = f"✓ [{i}/{len(image_files)}] {image_file.name} → WITH people ({people_count} detected)"
-                    else:
-                        dest_folder = self.without_people_folder.get()
-                        without_people_count += 1
-                        status = f"✓ [{i}/{len(image_files)}] {image_file.name} → WITHOUT people"
-
-                    # Copy file
-                    dest_path = Path(dest_folder) / image_file.name
-
-                    # Handle duplicate names
-                    counter = 1
-                    while dest_path.exists():
-                        dest_path = Path(dest_folder) / f"{image_file.stem}_{counter}{image_file.suffix}"
-                        counter += 1
-
-                    # Copy the file
-                    shutil.copy2(image_file, dest_path)
-
-                    self.log_status(status)
-
-                except Exception as e:
-                    self.log_status(f"❌ Error processing {image_file.name}: {str(e)}")
-                    error_count += 1
+            sorter = self.get_sorter()
+            if sorter is None:
+                return
+
+            result = sorter.sort(self.input_folder.get(), rules)
 
             # Summary
             self.log_status("\n" + "=" * 50)
-            self.log_status("SORTING COMPLETE!")
+            self.log_status("SORTING CANCELLED!" if result.cancelled else "SORTING COMPLETE!")
             self.log_status(f"Detection method: {method.upper()}")
-            self.log_status(f"Pictures with people: {with_people_count}")
-            self.log_status(f"Pictures without people: {without_people_count}")
-            if error_count > 0:
-                self.log_status(f"Errors: {error_count}")
+            self.log_routed(result, "→")
+            if result.errors > 0:
+                self.log_status(f"Errors: {result.errors}")
+            self.log_metrics(result.metrics, "sort")
             self.log_status("=" * 50)
 
             messagebox.showinfo(
-                "Success",
-                f"Sorting complete!\n\n"
+                "Cancelled" if result.cancelled else "Success",
+                f"Sorting {'cancelled' if result.cancelled else 'complete'}!\n\n"
                 f"Method: {method.upper()}\n"
-                f"With people: {with_people_count}\n"
-                f"Without people: {without_people_count}\n"
-                f"Errors: {error_count}"
+                f"With people: {result.routed[self.with_people_folder.get()]}\n"
+                f"Without people: {result.routed[self.without_people_folder.get()]}\n"
+                f"Errors: {result.errors}"
             )
 
         except Exception as e:
@@ -350,7 +539,112 @@ class SortPicturesTab:
         finally:
             self.finish_sorting()
 
+    def watch_pictures(self, rules: RoutingRules):
+        """Keep the detector loaded and sort every new picture of the input folder"""
+        try:
+            method = self.detection_method.get()
+            self.log_status(f"Starting watch mode using {method.upper()} detection...")
+            self.log_status("Pictures already in the folder are left alone; use 'Start Sorting' for those")
+
+            sorter = self.get_sorter()
+            if sorter is None:
+                return
+
+            settings = config_store.get().sorting
+            result = sorter.watch(self.input_folder.get(), rules,
+                                  settle=settings.watch_settle_seconds,
+                                  poll_interval=settings.watch_poll_interval)
+
+            self.log_status("\n" + "=" * 50)
+            self.log_status("WATCH MODE STOPPED!")
+            self.log_routed(result, "→")
+            if result.errors > 0:
+                self.log_status(f"Errors: {result.errors}")
+            if result.metrics.processed:
+                self.log_metrics(result.metrics, "watch")
+            self.log_status("=" * 50)
+
+        except Exception as e:
+            self.log_status(f"❌ Fatal error: {str(e)}")
+            messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
+
+        finally:
+            self.finish_sorting()
+
+    def plan_pictures(self, rules: RoutingRules):
+        """Classify pictures and save the plan as a manifest, without copying anything"""
+        try:
+            method = self.detection_method.get()
+            self.log_status(f"Planning picture sorting using {method.upper()} detection (dry run)...")
+
+            sorter = self.get_sorter()
+            if sorter is None:
+                return
+
+            manifest, result = sorter.plan(self.input_folder.get(), rules)
+            if result.cancelled:
+                self.log_status("Plan cancelled, no manifest was saved")
+                return
+
+            manifest_path = write_manifest(
+                manifest,
+                app_data_path("manifests", f"plan_{result.metrics.started_at:%Y%m%d_%H%M%S}.parquet")
+            )
+
+            self.log_status("\n" + "=" * 50)
+            self.log_status("PLAN READY! No files were copied.")
+            self.log_routed(result, "planned →")
+            if result.errors > 0:
+                self.log_status(f"Errors: {result.errors}")
+            self.log_metrics(result.metrics, "plan")
+            self.log_status(f"Manifest: {manifest_path}")
+            self.log_status("Review it, then use 'Apply Plan...' to copy the files")
+            self.log_status("=" * 50)
+
+        except Exception as e:
+            self.log_status(f"❌ Fatal error: {str(e)}")
+            messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
+
+        finally:
+            self.finish_sorting()
+
+    def apply_manifest(self, manifest_path):
+        """Copy the files of a saved plan to their destinations"""
+        try:
+            self.log_status(f"Applying plan {manifest_path}...")
+            if self.sorter is None:
+                self.sorter = PictureSorter(log=self.log_status)
+            self.bind_job(self.sorter)
+            metrics = self.sorter.apply(read_manifest(manifest_path))
+
+            self.log_status("\n" + "=" * 50)
+            self.log_status("PLAN APPLIED!")
+            self.log_status(f"Files copied: {metrics.processed - metrics.errors - metrics.skipped - metrics.present}")
+            if metrics.present:
+                self.log_status(f"Already at their destination: {metrics.present}")
+            if metrics.skipped:
+                self.log_status(f"Changed since the plan (skipped): {metrics.skipped}")
+            if metrics.errors:
+                self.log_status(f"Copy errors: {metrics.errors}")
+            self.log_metrics(metrics, "apply")
+            self.log_status("=" * 50)
+
+        except SortCancelled:
+            self.log_status("⏹ Apply cancelled; files copied so far are complete")
+
+        except Exception as e:
+            self.log_status(f"❌ Fatal error: {str(e)}")
+            messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
+
+        finally:
+            self.finish_sorting()
+
     def finish_sorting(self):
         """Reset UI after sorting"""
         self.is_sorting = False
-        self.start_button.configure(state="normal", text="Start Sorting")
\ No newline at end of file
+        self.start_button.configure(state="normal", text="Start Sorting")
+        self.plan_button.configure(state="normal", text="Dry Run (Plan)")
+        self.apply_button.configure(state="normal", text="Apply Plan...")
+        self.watch_button.configure(state="normal", text="Watch Folder")
+        self.pause_button.configure(state="disabled", text="Pause")
+        self.cancel_button.configure(state="disabled")
@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from pathlib import Path
+import cv2
+
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.m4v', '.avi', '.mkv', '.3gp', '.webm'}
+# Samples at most this many frames ahead are reached by skipping forward instead of seeking
+FORWARD_GRAB_LIMIT = 12
+
+
+@dataclass
+class VideoSampler:
+    """
+    Picks a few frames of a clip instead of decoding all of them
+
+    Frames are taken every `sample_seconds`, spread over the whole clip when that would
+    exceed `max_frames`. Every sample is reached by seeking, so the decoder starts from the
+    nearest keyframe instead of decoding the clip from the beginning.
+    """
+    sample_seconds: float = 1.0
+    max_frames: int = 16
+
+    def frame_numbers(self, frame_count: int, fps: float) -> list[int]:
+        """Frame numbers to sample from a clip, in playback order"""
+        if frame_count <= 0:
+            return [0]
+        step = max(1, round(self.sample_seconds * fps)) if fps > 0 else frame_count
+        numbers = list(range(0, frame_count, step))
+        if len(numbers) > self.max_frames:
+            # Spread the samples evenly over the whole clip instead
+            numbers = [int(i * frame_count / self.max_frames) for i in range(self.max_frames)]
+        return numbers
+
+    def frames(self, path: Path):
+        """
+        Decode the sampled frames of a clip
+
+        :return: generator of BGR frames; stops early at unreadable frames
+        :raises OSError: if the clip cannot be opened
+        """
+        capture = cv2.VideoCapture(str(path))
+        if not capture.isOpened():
+            raise OSError(f"Could not open video {path.name}")
+        try:
+            frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            fps = capture.get(cv2.CAP_PROP_FPS)
+            position = 0
+            for number in self.frame_numbers(frame_count, fps):
+                # Close samples are cheaper to reach by skipping forward than by seeking back to a keyframe
+                gap = number - position
+                if 0 <= gap <= FORWARD_GRAB_LIMIT:
+                    for _ in range(gap):
+                        capture.grab()
+                else:
+                    capture.set(cv2.CAP_PROP_POS_FRAMES, number)
+                ok, frame = capture.read()
+                if not ok:
+                    return
+                position = number + 1
+                yield frame
+        finally:
+            capture.release()
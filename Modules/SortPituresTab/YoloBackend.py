@@ -0,0 +1,250 @@
+import os
+from pathlib import Path
+import cv2
+import numpy as np
+from Modules.Core.JobScheduler import job_scheduler
+from Modules.Core.ModelRegistry import registry
+
+DEFAULT_YOLO_WEIGHTS = '../../yolov8n.pt'
+
+
+def default_num_threads() -> int:
+    """Number of intra-op threads to use: one per physical core"""
+    try:
+        import psutil
+        physical = psutil.cpu_count(logical=False)
+    except ImportError:
+        physical = None
+    return physical or os.cpu_count() or 1
+
+
+def letterbox(img: np.ndarray, size: int) -> np.ndarray:
+    """
+    Resize an image to a size x size square, keeping aspect ratio and padding the rest
+
+    :param img: BGR image
+    :param size: side of the output square
+    :return: letterboxed BGR image (uint8, size x size x 3)
+    """
+    h, w = img.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = round(w * scale), round(h * scale)
+    if (new_w, new_h) != (w, h):
+        img = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    top = (size - new_h) // 2
+    left = (size - new_w) // 2
+    return cv2.copyMakeBorder(
+        img, top, size - new_h - top, left, size - new_w - left,
+        cv2.BORDER_CONSTANT, value=(114, 114, 114)
+    )
+
+
+def letterbox_into(img: np.ndarray, out: np.ndarray):
+    """
+    Letterbox an image directly into a preallocated square buffer
+
+    Used for shared memory slots, so the resized frame is written once in place instead of
+    being allocated and copied.
+
+    :param img: BGR image
+    :param out: uint8 buffer of shape (size, size, 3), e.g. a ring buffer slot
+    """
+    size = out.shape[0]
+    h, w = img.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = round(w * scale), round(h * scale)
+    top = (size - new_h) // 2
+    left = (size - new_w) // 2
+
+    # Only the padding is filled, the picture area is overwritten by the resize
+    out[:top] = 114
+    out[top + new_h:] = 114
+    out[top:top + new_h, :left] = 114
+    out[top:top + new_h, left + new_w:] = 114
+
+    roi = out[top:top + new_h, left:left + new_w]
+    resized = cv2.resize(img, (new_w, new_h), dst=roi, interpolation=cv2.INTER_LINEAR)
+    if not np.shares_memory(resized, out):
+        np.copyto(roi, resized)
+
+
+class YoloBackend:
+    """
+    YOLO detector that runs on OpenVINO, ONNX Runtime or PyTorch
+
+    The runtime artifacts are exported once from the .pt weights and cached next to them,
+    so later runs only pay the load cost. If a runtime is not installed, the next one in
+    line is tried and PyTorch is always the last resort.
+    """
+
+    BACKENDS = ("auto", "openvino", "onnx", "torch")
+
+    def __init__(self, weights_path=DEFAULT_YOLO_WEIGHTS, backend="auto", num_threads=None,
+                 imgsz=640, conf=0.25, iou=0.45):
+        self.weights_path = Path(weights_path)
+        self.backend = backend
+        self.num_threads = num_threads or default_num_threads()
+        self.imgsz = imgsz
+        self.conf = conf
+        self.iou = iou
+        self.active_backend = None
+        self._model = None
+        self._run = None
+
+    def candidate_backends(self) -> list[str]:
+        """Backends to try, in order of preference"""
+        if self.backend == "auto":
+            return ["openvino", "onnx", "torch"]
+        if self.backend == "torch":
+            return ["torch"]
+        return [self.backend, "torch"]
+
+    def load(self, log=print) -> str:
+        """
+        Load the first available backend
+
+        :param log: callable receiving progress messages
+        :return: name of the backend in use
+        """
+        for name in self.candidate_backends():
+            try:
+                getattr(self, f"_load_{name}")(log)
+                self.active_backend = name
+                return name
+            except Exception as e:
+                log(f"YOLO backend '{name}' unavailable: {str(e)}")
+
+        raise RuntimeError("No YOLO backend could be loaded")
+
+    def artifact_path(self, fmt: str) -> Path:
+        """Location of the exported artifact for the given format"""
+        if fmt == "onnx":
+            return self.weights_path.with_suffix('.onnx')
+        stem = self.weights_path.stem
+        return self.weights_path.parent / f"{stem}_openvino_model" / f"{stem}.xml"
+
+    def export(self, fmt: str, log=print) -> Path:
+        """
+        Export the .pt weights to the given format, reusing a cached artifact if it is up to date
+
+        :param fmt: "onnx" or "openvino"
+        :param log: callable receiving progress messages
+        :return: path of the exported artifact
+        """
+        artifact = self.artifact_path(fmt)
+        if artifact.exists() and artifact.stat().st_mtime >= self.weights_path.stat().st_mtime:
+            return artifact
+
+        from ultralytics import YOLO
+
+        log(f"Exporting YOLO weights to {fmt.upper()} (one-time step)...")
+        YOLO(str(self.weights_path)).export(format=fmt, imgsz=self.imgsz, dynamic=True)
+        if not artifact.exists():
+            raise FileNotFoundError(f"Export did not produce {artifact}")
+        return artifact
+
+    def _load_torch(self, log):
+        import torch
+        from ultralytics import YOLO
+
+        torch.set_num_threads(self.num_threads)
+        self._model = YOLO(str(self.weights_path))
+        self._run = None
+
+    def _load_onnx(self, log):
+        import onnxruntime as ort
+
+        artifact = self.export("onnx", log)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.num_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        session = ort.InferenceSession(str(artifact), sess_options=options,
+                                       providers=["CPUExecutionProvider"])
+        input_name = session.get_inputs()[0].name
+        self._model = session
+        self._run = lambda blob: session.run(None, {input_name: blob})[0]
+
+    def _load_openvino(self, log):
+        import openvino as ov
+
+        artifact = self.export("openvino", log)
+        core = ov.Core()
+        compiled = core.compile_model(str(artifact), "CPU", {
+            "PERFORMANCE_HINT": "LATENCY",
+            "INFERENCE_NUM_THREADS": self.num_threads,
+        })
+        output = compiled.output(0)
+        self._model = compiled
+        self._run = lambda blob: compiled(blob)[output]
+
+    def warm_up(self):
+        """Run detection once on a blank frame so runtime setup does not slow down the first real batch"""
+        self.detect([np.full((self.imgsz, self.imgsz, 3), 114, dtype=np.uint8)])
+
+    def detect(self, frames: list[np.ndarray]) -> list[list[tuple[int, float]]]:
+        """
+        Run detection on a batch of BGR frames
+
+        :param frames: list of BGR images
+        :return: for every frame, a list of (class_id, confidence) tuples
+        """
+        if self.active_backend is None:
+            self.load()
+
+        if self._run is None:
+            results = self._model(frames, imgsz=self.imgsz, conf=self.conf, iou=self.iou, verbose=False)
+            return [list(zip(map(int, r.boxes.cls.tolist()), r.boxes.conf.tolist())) for r in results]
+
+        # Frames coming from the shared memory ring buffer are already letterboxed
+        blob = np.stack([frame if frame.shape[:2] == (self.imgsz, self.imgsz) else letterbox(frame, self.imgsz)
+                         for frame in frames])
+        blob = np.ascontiguousarray(blob[..., ::-1].transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+        output = self._run(blob)
+        return [self._postprocess(prediction) for prediction in output]
+
+    def _postprocess(self, prediction: np.ndarray) -> list[tuple[int, float]]:
+        """Turn one raw (4 + classes, anchors) YOLOv8 output into class/confidence pairs after NMS"""
+        prediction = prediction.T
+        scores = prediction[:, 4:]
+        class_ids = scores.argmax(axis=1)
+        confidences = scores[np.arange(len(scores)), class_ids]
+
+        keep = confidences >= self.conf
+        if not keep.any():
+            return []
+
+        boxes = prediction[keep, :4].copy()
+        boxes[:, 0] -= boxes[:, 2] / 2
+        boxes[:, 1] -= boxes[:, 3] / 2
+        class_ids = class_ids[keep]
+        confidences = confidences[keep]
+
+        indices = cv2.dnn.NMSBoxesBatched(
+            boxes.tolist(), confidences.tolist(), class_ids.tolist(), self.conf, self.iou
+        )
+        return [(int(class_ids[i]), float(confidences[i])) for i in np.array(indices).flatten()]
+
+
+def yolo_model_key(weights_path=DEFAULT_YOLO_WEIGHTS, backend="auto") -> tuple:
+    return "yolo", str(Path(weights_path).resolve()), backend
+
+
+def get_yolo_backend(weights_path=DEFAULT_YOLO_WEIGHTS, backend="auto", log=print, preload=False) -> YoloBackend:
+    """
+    Loaded and warmed up backend from the process-wide model registry
+
+    :param preload: True when loading ahead of use (warm-up scheduler)
+    """
+    def load():
+        # ONNX Runtime and OpenVINO fix their threads when the session is created; bulk jobs
+        # are paused while others run, so the session gets the whole budget
+        yolo = YoloBackend(weights_path, backend=backend, num_threads=job_scheduler.budget())
+        yolo.load(log=log)
+        yolo.warm_up()
+        return yolo
+
+    return registry.get(yolo_model_key(weights_path, backend), load, preload=preload)
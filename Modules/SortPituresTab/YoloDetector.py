@@ -0,0 +1,91 @@
+from Modules.Core.ModelRegistry import registry
+from Modules.InferenceServer.InferenceClient import RemoteYoloBackend
+from .Detector import Detection, register_detector
+from .RoutingRules import class_counts
+from .YoloBackend import DEFAULT_YOLO_WEIGHTS, get_yolo_backend, yolo_model_key
+
+
+@register_detector("yolo")
+class YoloDetector:
+    """
+    YOLO object detector on the fastest available backend
+
+    Reports every COCO class from the same inference pass, so any number of routing rules
+    costs a single detection.
+    """
+
+    label = "YOLO (Most Accurate)"
+    model_option = "weights_path"
+    batched = True
+    finds_objects = True
+
+    def __init__(self, weights_path=DEFAULT_YOLO_WEIGHTS, yolo_backend="auto", inference_client=None):
+        """
+        :param inference_client: InferenceClient to run YOLO on the shared inference server, None to run it in-process
+        """
+        self.weights_path = weights_path
+        self.backend = yolo_backend
+        self.inference_client = inference_client
+        self.remote = None
+        self.loaded = False
+        self.log = print
+
+    @property
+    def model(self):
+        """
+        Backend detections run on, None before load()
+
+        In-process models are fetched from the registry on every use instead of being kept
+        here, so a model unloaded from the Monitor tab is freed and loaded again when needed.
+        """
+        if self.remote is not None:
+            return self.remote
+        if not self.loaded:
+            return None
+        return get_yolo_backend(self.weights_path, self.backend, log=self.log)
+
+    @property
+    def frame_size(self) -> int:
+        return self.model.imgsz
+
+    @property
+    def active_backend(self) -> str | None:
+        model = self.remote or registry.peek(yolo_model_key(self.weights_path, self.backend))
+        return model.active_backend if model else None
+
+    def load(self, log=print) -> str:
+        self.log = log
+        if self.remote is not None:
+            return self.remote.active_backend
+
+        if self.inference_client is not None and not self.loaded:
+            remote = RemoteYoloBackend(self.inference_client, self.weights_path, backend=self.backend)
+            try:
+                active = remote.load(log=log)
+                self.remote = remote
+                log(f"YOLO model ready on the shared inference server ({active})")
+                return active
+            except (OSError, RuntimeError) as e:
+                log(f"Shared inference server unavailable, loading YOLO in-process: {str(e)}")
+
+        key = yolo_model_key(self.weights_path, self.backend)
+        model = registry.peek(key)
+        if model is not None and self.loaded:
+            return model.active_backend
+        if model is None:
+            log("Loading YOLO model (this may take a moment)...")
+        model = get_yolo_backend(self.weights_path, self.backend, log=log)
+        self.loaded = True
+        log(f"YOLO model loaded successfully ({model.active_backend}, {model.num_threads} threads)")
+        saved = registry.take_saved_seconds(key)
+        if saved is not None:
+            log(f"YOLO model was preloaded in the background, saved {saved:.1f} s")
+        return model.active_backend
+
+    def detect(self, frames: list) -> list[Detection]:
+        results = []
+        for detections in self.model.detect(frames):
+            # class 0 in COCO dataset = person
+            people = [conf for class_id, conf in detections if class_id == 0]
+            results.append((class_counts(detections), max(people, default=None)))
+        return results
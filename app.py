@@ -1,7 +1,20 @@
+import multiprocessing
+import os
+import sys
 import customtkinter as ctk
 from Modules.SortPituresTab.SortPicturesTab import SortPicturesTab
 from Modules.ConfigManagerTab.ConfigManagerTab import ConfigManagerTab
 from Modules.ChatBotTab.ChatBotTab import ChatBotTab
+from Modules.MonitorTab.MonitorTab import MonitorTab
+from Modules.Core.AppConfig import config_store
+from Modules.Core.ResourceMonitor import resource_monitor
+from Modules.Core.WarmupScheduler import warmup_scheduler
+from Modules.InferenceServer.InferenceClient import SHARED_MODELS_ENV
+
+# Delay before preloading models, so the window is drawn and responsive first
+WARMUP_DELAY_MS = 2000
+# How often the settings file is checked for changes
+CONFIG_POLL_MS = 2000
 
 class DailyAssistant(ctk.CTk):
     """Main application window"""
@@ -11,8 +24,9 @@ class DailyAssistant(ctk.CTk):
 
         # Keyboard shortcuts
         self.bind_all('<Alt-a>', lambda event: self.show_module("Sort Pictures"))
-        self.bind_all('<Alt-s>', lambda event: self.show_module("Placeholder"))
+        self.bind_all('<Alt-s>', lambda event: self.show_module("Settings"))
         self.bind_all('<Alt-d>', lambda event: self.show_module("Chatbot"))
+        self.bind_all('<Alt-m>', lambda event: self.show_module("Monitor"))
         self.bind_all('<Escape>', lambda event: self.show_home())
 
         # Configure window
@@ -29,6 +43,17 @@ class DailyAssistant(ctk.CTk):
         # Show home screen
         self.show_home()
 
+        # Preload recently used models in the background once the window is up
+        warmup_scheduler.register("chat", ChatBotTab.preload)
+        warmup_scheduler.register("yolo", SortPicturesTab.preload)
+        self.after(WARMUP_DELAY_MS, warmup_scheduler.start)
+
+        # Apply edits to the settings file without a restart
+        self.after(CONFIG_POLL_MS, self.poll_config)
+
+        # Sample memory, CPU, models and jobs for the monitor tab and the metrics file
+        resource_monitor.start()
+
     def create_sidebar(self):
         """Create sidebar with navigation"""
         self.sidebar_frame = ctk.CTkFrame(self, width=200, corner_radius=0)
@@ -65,8 +90,8 @@ class DailyAssistant(ctk.CTk):
 
         self.nav_btn_2 = ctk.CTkButton(
             self.sidebar_frame,
-            text="Placeholder",
-            command=lambda: self.show_module("Placeholder"),
+            text="Settings",
+            command=lambda: self.show_module("Settings"),
             fg_color="transparent",
             text_color=("gray10", "gray90"),
             hover_color=("gray70", "gray30"),
@@ -87,6 +112,18 @@ class DailyAssistant(ctk.CTk):
         )
         self.nav_btn_3.pack(fill="x", padx=10, pady=5)
 
+        self.nav_btn_4 = ctk.CTkButton(
+            self.sidebar_frame,
+            text="Monitor",
+            command=lambda: self.show_module("Monitor"),
+            fg_color="transparent",
+            text_color=("gray10", "gray90"),
+            hover_color=("gray70", "gray30"),
+            anchor="w",
+            height=40
+        )
+        self.nav_btn_4.pack(fill="x", padx=10, pady=5)
+
         # Appearance mode at bottom
         self.appearance_label = ctk.CTkLabel(
             self.sidebar_frame,
@@ -133,7 +170,7 @@ class DailyAssistant(ctk.CTk):
         # Feature buttons
         btn_frame = ctk.CTkFrame(welcome_frame, fg_color="transparent")
         btn_frame.pack(expand=True, fill="both")
-        btn_frame.columnconfigure((0, 1, 2), weight=1, uniform="column")
+        btn_frame.columnconfigure((0, 1, 2, 3), weight=1, uniform="column")
         btn_frame.rowconfigure(0, weight=1)
 
         # Sort Pictures button
@@ -148,15 +185,15 @@ class DailyAssistant(ctk.CTk):
         )
         sort_btn.grid(row=0, column=0, padx=15, pady=10, sticky="nsew")
 
-        # Placeholder button
+        # Settings button
         config_btn = ctk.CTkButton(
             btn_frame,
-            text="⚙️\n\nPlaceholder",
+            text="⚙️\n\nSettings",
             font=ctk.CTkFont(size=16, weight="bold"),
             width=100,
             height=150,
             corner_radius=10,
-            command=lambda: self.show_module("Placeholder")
+            command=lambda: self.show_module("Settings")
         )
         config_btn.grid(row=0, column=1, padx=15, pady=10, sticky="nsew")
 
@@ -172,13 +209,25 @@ class DailyAssistant(ctk.CTk):
         )
         chat_btn.grid(row=0, column=2, padx=15, pady=10, sticky="nsew")
 
+        # Monitor button
+        monitor_btn = ctk.CTkButton(
+            btn_frame,
+            text="📊\n\nMonitor",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            width=100,
+            height=150,
+            corner_radius=10,
+            command=lambda: self.show_module("Monitor")
+        )
+        monitor_btn.grid(row=0, column=3, padx=15, pady=10, sticky="nsew")
+
         # Shortcuts info
         shortcuts_frame = ctk.CTkFrame(welcome_frame, fg_color="transparent")
         shortcuts_frame.pack(side="bottom", fill="x", pady=20)
 
         shortcuts_label = ctk.CTkLabel(
             shortcuts_frame,
-            text="⌨️ Keyboard Shortcuts: Alt+A = Sort Pictures | Alt+S = Placeholder | Alt+D = Chatbot | ESC = Home",
+            text="⌨️ Keyboard Shortcuts: Alt+A = Sort Pictures | Alt+S = Settings | Alt+D = Chatbot | Alt+M = Monitor | ESC = Home",
             font=ctk.CTkFont(size=12),
             text_color=("gray40", "gray60")
         )
@@ -209,10 +258,17 @@ class DailyAssistant(ctk.CTk):
         # Load appropriate module
         if module_name == "Sort Pictures":
             SortPicturesTab(content_frame)
-        elif module_name == "Placeholder":
+        elif module_name == "Settings":
             ConfigManagerTab(content_frame)
         elif module_name == "Chatbot":
             ChatBotTab(content_frame)
+        elif module_name == "Monitor":
+            MonitorTab(content_frame)
+
+    def poll_config(self):
+        """Reload the settings file if it changed and notify its subscribers"""
+        config_store.poll()
+        self.after(CONFIG_POLL_MS, self.poll_config)
 
     @staticmethod
     def change_appearance_mode(new_mode):
@@ -222,6 +278,19 @@ class DailyAssistant(ctk.CTk):
 
 def main():
     """Main entry point"""
+    # Needed by the sorter's decode worker processes in the frozen executable
+    multiprocessing.freeze_support()
+
+    # The executable doubles as the shared inference server started by InferenceClient
+    if "--inference-server" in sys.argv:
+        from Modules.InferenceServer.InferenceServer import main as serve
+        serve([arg for arg in sys.argv[1:] if arg != "--inference-server"])
+        return
+
+    # Load models once in the shared inference server instead of in every window
+    if "--shared-models" in sys.argv:
+        os.environ[SHARED_MODELS_ENV] = "1"
+
     ctk.set_appearance_mode("System")
     ctk.set_default_color_theme("blue")
 